@@ -0,0 +1,77 @@
+'''
+Benchmark of the number of points an `ps.AdaptiveScan` needs to resolve synthetic resonance peaks,
+compared with a uniform `ps.PropertyScan` grid.
+
+The signal is a sum of Lorentzian peaks of different widths on a flat background. For each point budget
+the maximum error of the data interpolated onto a fine grid is reported for uniform and adaptive
+sampling, along with the smallest budget of each that reaches the target error.
+
+Run with
+
+    python benchmarks/benchmark_adaptive_scan.py
+'''
+import pyscan as ps
+import numpy as np
+from tempfile import TemporaryDirectory
+
+
+PEAKS = [(0.21, 0.004, 1.0), (0.5, 0.02, 0.6), (0.83, 0.008, 0.8)]
+BUDGETS = [25, 50, 100, 200, 400, 800, 1600]
+TARGET_ERROR = 0.02
+FINE = np.linspace(0, 1, 20001)
+
+
+def signal(v):
+    return sum(height / (1 + ((v - center) / width) ** 2) for center, width, height in PEAKS)
+
+
+def measure_signal(expt):
+    d = ps.ItemAttribute()
+    d.x = signal(expt.devices.v1.voltage)
+    return d
+
+
+def uniform_error(n_points):
+    values = np.linspace(0, 1, n_points)
+    return np.abs(np.interp(FINE, values, signal(values)) - signal(FINE)).max()
+
+
+def adaptive_error(n_points, data_dir, loss):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.AdaptiveScan({'v1': (0, 1)}, 'voltage', n_points=n_points, measured='x', loss=loss,
+                                    n_initial=9)
+    runinfo.measure_function = measure_signal
+    runinfo.initial_pause = 0
+
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+
+    expt = ps.Experiment(runinfo, devices, data_dir=data_dir)
+    expt.run()
+
+    grid, data = runinfo.scan0.grid(expt, 'x', len(FINE))
+    return np.abs(data - signal(grid)).max()
+
+
+def first_budget(errors):
+    for n_points, error in zip(BUDGETS, errors):
+        if error < TARGET_ERROR:
+            return n_points
+    return None
+
+
+if __name__ == '__main__':
+    with TemporaryDirectory() as data_dir:
+        uniform = [uniform_error(n) for n in BUDGETS]
+        gradient = [adaptive_error(n, data_dir, 'gradient') for n in BUDGETS]
+        curvature = [adaptive_error(n, data_dir, 'curvature') for n in BUDGETS]
+
+    print('max interpolation error')
+    print('{:>8} {:>12} {:>12} {:>12}'.format('points', 'uniform', 'gradient', 'curvature'))
+    for row in zip(BUDGETS, uniform, gradient, curvature):
+        print('{:>8} {:>12.4f} {:>12.4f} {:>12.4f}'.format(*row))
+
+    print()
+    print('points to reach an error of {}'.format(TARGET_ERROR))
+    for label, errors in [('uniform', uniform), ('gradient', gradient), ('curvature', curvature)]:
+        print('{:>12} {:>8}'.format(label, str(first_budget(errors))))
@@ -0,0 +1,54 @@
+'''
+Benchmark of the per-point save cost of a 1D scan of 1024 point spectra as the scan grows.
+
+With the default chunking policy each point is written into a chunk bounded by
+`runinfo.chunk_bytes`, so the cost per point stays flat. With one chunk spanning the whole
+dataset (the previous behaviour) every point rewrites the whole array.
+
+Run with
+
+    python benchmarks/benchmark_chunking.py
+'''
+import pyscan as ps
+import numpy as np
+from time import perf_counter
+from tempfile import TemporaryDirectory
+
+
+def measure_spectrum(expt):
+    d = ps.ItemAttribute()
+    d.spectrum = np.random.random(1024)
+    return d
+
+
+def time_per_point(n, whole_array_chunks, data_dir, n_timed=50):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.RepeatScan(n)
+    runinfo.measure_function = measure_spectrum
+    if whole_array_chunks:
+        runinfo.chunks = {'spectrum': (n, 1024)}
+
+    devices = ps.ItemAttribute()
+    expt = ps.Experiment(runinfo, devices, data_dir=data_dir)
+    expt.check_runinfo()
+
+    with expt.open_writer():
+        data = measure_spectrum(expt)
+        expt.preallocate(data)
+
+        start = perf_counter()
+        for i in range(n_timed):
+            runinfo.scan0.i = i
+            expt.save_point(data)
+        stop = perf_counter()
+
+    return (stop - start) / n_timed
+
+
+if __name__ == '__main__':
+    print('{:>8} {:>22} {:>22}'.format('points', 'default chunks (ms)', 'whole array chunk (ms)'))
+    with TemporaryDirectory() as data_dir:
+        for n in [100, 1000, 4000, 16000]:
+            default = time_per_point(n, False, data_dir)
+            whole = time_per_point(n, True, data_dir)
+            print('{:>8} {:>22.3f} {:>22.3f}'.format(n, default * 1e3, whole * 1e3))
@@ -0,0 +1,67 @@
+'''
+Benchmark of the save throughput and file size of camera-like frames under different
+`runinfo.storage_options`.
+
+Frames are 512 x 512 Poisson distributed photon counts with a background, similar to
+frames from BaslerCamera, HeliosCamera or spectra stacks from OceanOpticsQEPro.
+lzf and gzip level 1 with the shuffle filter usually keep pace with acquisition, higher
+gzip levels trade throughput for a smaller file.
+
+Run with
+
+    python benchmarks/benchmark_compression.py
+'''
+import pyscan as ps
+import numpy as np
+import os
+from time import perf_counter
+from tempfile import TemporaryDirectory
+
+
+N_FRAMES = 40
+FRAME_SHAPE = (512, 512)
+
+
+def measure_frame(expt):
+    d = ps.ItemAttribute()
+    d.frame = expt.frames[expt.runinfo.scan0.i % len(expt.frames)]
+    return d
+
+
+def benchmark(options, frames, data_dir):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.RepeatScan(N_FRAMES)
+    runinfo.measure_function = measure_frame
+    runinfo.initial_pause = 0
+    if options is not None:
+        runinfo.storage_options = {'frame': options}
+
+    expt = ps.Experiment(runinfo, ps.ItemAttribute(), data_dir=data_dir)
+    expt.frames = frames
+
+    start = perf_counter()
+    expt.run()
+    stop = perf_counter()
+
+    raw_bytes = N_FRAMES * np.array(expt.frame[0]).nbytes
+    return raw_bytes / (stop - start) / 1e6, os.path.getsize(expt.get_save_name()) / 1e6
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    frames = [rng.poisson(100, FRAME_SHAPE).astype('uint16') for _ in range(4)]
+
+    cases = [
+        ('uncompressed', None),
+        ('lzf + shuffle', {'compression': 'lzf'}),
+        ('gzip 1 + shuffle', {'compression': 'gzip'}),
+        ('gzip 4 + shuffle', {'compression': 'gzip', 'compression_opts': 4}),
+        ('gzip 1, no shuffle', {'compression': 'gzip', 'shuffle': False}),
+        ('gzip 1 + scaleoffset 0', {'compression': 'gzip', 'scaleoffset': 0}),
+    ]
+
+    print('{:>24} {:>12} {:>12}'.format('storage options', 'MB/s', 'file MB'))
+    with TemporaryDirectory() as data_dir:
+        for label, options in cases:
+            throughput, size = benchmark(options, frames, data_dir)
+            print('{:>24} {:>12.1f} {:>12.1f}'.format(label, throughput, size))
@@ -0,0 +1,78 @@
+'''
+Benchmark of the achieved points per second of a `ps.PropertyScan` sweeping several simulated supplies
+with a fixed set latency, setting them one after another or concurrently with `concurrent=True`.
+
+Supplies on separate buses overlap their sets. Supplies that share one instrument, like the ports of a
+SIM900 mainframe, are serialized by `ps.instrument_lock` and gain nothing.
+
+Run with
+
+    python benchmarks/benchmark_concurrent_set.py
+'''
+import pyscan as ps
+import numpy as np
+from time import perf_counter, sleep
+from tempfile import TemporaryDirectory
+
+
+LATENCY = 0.005
+N_POINTS = 50
+N_DEVICES = [1, 2, 3, 6]
+
+
+class SlowSupply(ps.ItemAttribute):
+    '''
+    Supply that takes `latency` seconds to set, like a serial or GPIB source that waits for its reply
+    '''
+
+    def __init__(self, latency, instrument=None):
+        self.latency = latency
+        self.instrument = instrument
+        self._voltage = 0
+
+    @property
+    def voltage(self):
+        return self._voltage
+
+    @voltage.setter
+    def voltage(self, value):
+        sleep(self.latency)
+        self._voltage = value
+
+
+def measure_fast(expt):
+    d = ps.ItemAttribute()
+    d.x = expt.devices.s0.voltage
+    return d
+
+
+def benchmark(n_devices, concurrent, shared, data_dir):
+    devices = ps.ItemAttribute()
+    mainframe = object() if shared else None
+    for j in range(n_devices):
+        devices['s{}'.format(j)] = SlowSupply(LATENCY, instrument=mainframe)
+
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'s{}'.format(j): np.linspace(0, 1, N_POINTS) for j in range(n_devices)},
+                                    'voltage', concurrent=concurrent)
+    runinfo.measure_function = measure_fast
+    runinfo.initial_pause = 0
+
+    expt = ps.Experiment(runinfo, devices, data_dir=data_dir)
+    start = perf_counter()
+    expt.run()
+    stop = perf_counter()
+
+    return N_POINTS / (stop - start)
+
+
+if __name__ == '__main__':
+    print('points/s with {} ms set latency'.format(LATENCY * 1e3))
+    print('{:>8} {:>12} {:>12} {:>18}'.format('devices', 'sequential', 'concurrent', 'shared instrument'))
+    with TemporaryDirectory() as data_dir:
+        for n_devices in N_DEVICES:
+            print('{:>8} {:>12.0f} {:>12.0f} {:>18.0f}'.format(
+                n_devices,
+                benchmark(n_devices, False, False, data_dir),
+                benchmark(n_devices, True, False, data_dir),
+                benchmark(n_devices, True, True, data_dir)))
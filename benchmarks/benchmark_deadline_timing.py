@@ -0,0 +1,84 @@
+'''
+Benchmark of the achieved sample period of `ps.ContinuousScan(dt=...)`, which waits for absolute deadlines on
+the experiment's `ps.DeadlineClock`, against waiting `time.sleep(dt)` after each sample, for measure functions
+that take part of the period.
+
+Also compares the wait error of `time.sleep(dt)` with `ps.DeadlineClock.wait(dt)` for short waits.
+
+Run with
+
+    python benchmarks/benchmark_deadline_timing.py
+'''
+import pyscan as ps
+import numpy as np
+from time import perf_counter, sleep
+from tempfile import TemporaryDirectory
+
+
+DT = 0.01
+N_SAMPLES = 200
+MEASURE_TIMES = [0, 0.002, 0.005, 0.008]
+WAITS = [0.0001, 0.0005, 0.001, 0.005]
+N_WAITS = 200
+
+
+def make_measure(measure_time):
+    def measure(expt):
+        sleep(measure_time)
+        d = ps.ItemAttribute()
+        d.x = expt.runinfo.scan0.i
+        return d
+    return measure
+
+
+def deadline_period(measure_time, data_dir):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.ContinuousScan(n_max=N_SAMPLES + 1, dt=DT)
+    runinfo.measure_function = make_measure(measure_time)
+    runinfo.initial_pause = 0
+
+    devices = ps.ItemAttribute()
+    expt = ps.Experiment(runinfo, devices, data_dir=data_dir)
+    expt.run()
+
+    timestamp = ps.load_experiment(expt.get_save_name()).timing.timestamp[:N_SAMPLES]
+    return np.mean(np.diff(timestamp)), np.std(np.diff(timestamp))
+
+
+def sleep_period(measure_time):
+    # the previous behaviour, the period is dt plus the time taken by each sample
+    timestamp = []
+    for i in range(N_SAMPLES):
+        timestamp.append(perf_counter())
+        sleep(measure_time)
+        sleep(DT)
+    return np.mean(np.diff(timestamp)), np.std(np.diff(timestamp))
+
+
+def wait_error(wait, dt):
+    errors = []
+    for i in range(N_WAITS):
+        start = perf_counter()
+        wait(dt)
+        errors.append(perf_counter() - start - dt)
+    return np.median(errors), np.max(errors)
+
+
+if __name__ == '__main__':
+    print('sample period with dt = {} ms'.format(DT * 1e3))
+    print('{:>14} {:>22} {:>22}'.format('measure (ms)', 'sleep(dt) mean/std', 'deadline mean/std'))
+    with TemporaryDirectory() as data_dir:
+        for measure_time in MEASURE_TIMES:
+            mean, std = sleep_period(measure_time)
+            deadline_mean, deadline_std = deadline_period(measure_time, data_dir)
+            print('{:>14.1f} {:>13.3f} {:>8.3f} {:>13.3f} {:>8.3f}'.format(
+                measure_time * 1e3, mean * 1e3, std * 1e3, deadline_mean * 1e3, deadline_std * 1e3))
+
+    clock = ps.DeadlineClock()
+    print('\nwait error (us)')
+    print('{:>10} {:>22} {:>22}'.format('wait (ms)', 'sleep median/max', 'clock median/max'))
+    for dt in WAITS:
+        median, worst = wait_error(sleep, dt)
+        clock_median, clock_worst = wait_error(clock.wait, dt)
+        print('{:>10.1f} {:>13.1f} {:>8.1f} {:>13.1f} {:>8.1f}'.format(
+            dt * 1e3, median * 1e6, worst * 1e6, clock_median * 1e6, clock_worst * 1e6))
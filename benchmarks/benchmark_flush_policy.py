@@ -0,0 +1,67 @@
+'''
+Benchmark of the achieved points per second of a fast measure function under different flush
+policies, set with `runinfo.flush_interval`, `runinfo.flush_time` and `runinfo.flush_on_line`.
+
+The measure function returns two scalars and a short trace without waiting on any instrument,
+so the run time is dominated by iterating, saving and flushing.
+
+Run with
+
+    python benchmarks/benchmark_flush_policy.py
+'''
+import pyscan as ps
+import numpy as np
+from time import perf_counter
+from tempfile import TemporaryDirectory
+
+
+N_INNER = 100
+N_OUTER = 20
+TRACE = np.linspace(0, 1, 64)
+
+
+def measure_fast(expt):
+    d = ps.ItemAttribute()
+    d.x = expt.devices.v1.voltage
+    d.y = expt.runinfo.scan1.i
+    d.trace = TRACE
+    return d
+
+
+def benchmark(policy, data_dir):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'v1': np.linspace(0, 1, N_INNER)}, 'voltage')
+    runinfo.scan1 = ps.RepeatScan(N_OUTER)
+    runinfo.measure_function = measure_fast
+    runinfo.initial_pause = 0
+    for key, value in policy.items():
+        runinfo[key] = value
+
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+
+    expt = ps.Experiment(runinfo, devices, data_dir=data_dir)
+    start = perf_counter()
+    expt.run()
+    stop = perf_counter()
+
+    return expt.writer.n_points / (stop - start), expt.writer.n_flushes
+
+
+if __name__ == '__main__':
+    cases = [
+        ('every point', {'flush_interval': 1}),
+        ('every 10 points', {'flush_interval': 10}),
+        ('every 100 points', {'flush_interval': 100}),
+        ('every 0.1 s', {'flush_interval': None, 'flush_time': 0.1}),
+        ('every 1 s', {'flush_interval': None, 'flush_time': 1}),
+        ('every line', {'flush_interval': None, 'flush_on_line': True}),
+        ('every line, async', {'flush_interval': None, 'flush_on_line': True, 'async_save': True}),
+        ('on close only', {'flush_interval': None}),
+    ]
+
+    print('{:>20} {:>12} {:>10}'.format('flush policy', 'points/s', 'flushes'))
+    with TemporaryDirectory() as data_dir:
+        for label, policy in cases:
+            rate, n_flushes = benchmark(policy, data_dir)
+            print('{:>20} {:>12.0f} {:>10}'.format(label, rate, n_flushes))
@@ -0,0 +1,103 @@
+'''
+Microbenchmark of the framework overhead per point, measured with a no-op `measure_function`
+that returns a single scalar without touching any instrument.
+
+Reports the time per point of whole runs, and of the pieces of the loop on their own: generating
+indicies with `ps.delta_product`, and reading the scan state from the `ps.RunInfo` properties
+compared with the precompiled `ps.RunPlan` built by `check_runinfo()`.
+
+Run with
+
+    python benchmarks/benchmark_overhead.py
+'''
+import pyscan as ps
+from time import perf_counter
+from tempfile import TemporaryDirectory
+
+
+N_POINTS = 10000
+
+
+def measure_noop(expt):
+    d = ps.ItemAttribute()
+    d.x = 0.0
+    return d
+
+
+def make_runinfo(shape, average=False):
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_noop
+    runinfo.initial_pause = 0
+    runinfo.scan0 = ps.RepeatScan(shape[0])
+    if len(shape) > 1:
+        if average:
+            runinfo.scan1 = ps.AverageScan(shape[1])
+        else:
+            runinfo.scan1 = ps.FunctionScan(lambda x: None, list(range(shape[1])))
+    return runinfo
+
+
+def time_run(shape, data_dir, average=False, **options):
+    runinfo = make_runinfo(shape, average)
+    for key, value in options.items():
+        runinfo[key] = value
+    expt = ps.Experiment(runinfo, ps.ItemAttribute(), data_dir=data_dir)
+
+    start = perf_counter()
+    expt.run()
+    return (perf_counter() - start) / expt.writer.n_points
+
+
+def time_delta_product(shape):
+    runinfo = make_runinfo(shape)
+    iterators = runinfo.iterators
+
+    start = perf_counter()
+    n = 0
+    for indicies, deltas in ps.delta_product(iterators):
+        n += 1
+    return (perf_counter() - start) / n
+
+
+def time_runinfo_properties(shape, average=False):
+    runinfo = make_runinfo(shape, average)
+
+    start = perf_counter()
+    for _ in range(N_POINTS):
+        runinfo.scans, runinfo.has_continuous_scan, runinfo.has_average_scan
+        runinfo.indicies, runinfo.average_indicies
+    return (perf_counter() - start) / N_POINTS
+
+
+def time_run_plan(shape, data_dir, average=False):
+    runinfo = make_runinfo(shape, average)
+    expt = ps.Experiment(runinfo, ps.ItemAttribute(), data_dir=data_dir)
+    expt.check_runinfo()
+    plan = expt.plan
+
+    start = perf_counter()
+    for _ in range(N_POINTS):
+        plan.reversed_scans, plan.has_continuous_scan, plan.has_average_scan
+        plan.indicies(), plan.saved_indicies()
+    return (perf_counter() - start) / N_POINTS
+
+
+if __name__ == '__main__':
+    shape = (100, N_POINTS // 100)
+
+    with TemporaryDirectory() as data_dir:
+        cases = [
+            ('run 1D', lambda: time_run((N_POINTS,), data_dir)),
+            ('run 2D', lambda: time_run(shape, data_dir)),
+            ('run 2D, no checkpoint', lambda: time_run(shape, data_dir, checkpoint=False)),
+            ('run 2D, timing', lambda: time_run(shape, data_dir, save_timing=True)),
+            ('run 2D, flush on line', lambda: time_run(shape, data_dir, flush_interval=None, flush_on_line=True)),
+            ('run 2D, average', lambda: time_run(shape, data_dir, average=True)),
+            ('delta_product', lambda: time_delta_product(shape)),
+            ('runinfo properties', lambda: time_runinfo_properties(shape, average=True)),
+            ('run plan', lambda: time_run_plan(shape, data_dir, average=True)),
+        ]
+
+        print('{:>28} {:>14}'.format('', 'us per point'))
+        for label, function in cases:
+            print('{:>28} {:>14.2f}'.format(label, function() * 1e6))
@@ -0,0 +1,73 @@
+'''
+Benchmark of the achieved points per second with `runinfo.pipeline` off and on, for a simulated supply with
+a fixed set latency and a measured frame saved with gzip compression.
+
+With pipelining, each point is averaged and saved in a background thread while the supply is set to the
+next value, so the time per point approaches the larger of the set and save times instead of their sum.
+
+Run with
+
+    python benchmarks/benchmark_pipeline.py
+'''
+import pyscan as ps
+import numpy as np
+from time import perf_counter, sleep
+from tempfile import TemporaryDirectory
+
+
+N_POINTS = 40
+LATENCIES = [0, 0.002, 0.005, 0.01]
+FRAME = np.random.default_rng(0).normal(size=(256, 256))
+
+
+class SlowSupply(ps.ItemAttribute):
+    '''
+    Supply that takes `latency` seconds to set
+    '''
+
+    def __init__(self, latency):
+        self.latency = latency
+        self._voltage = 0
+
+    @property
+    def voltage(self):
+        return self._voltage
+
+    @voltage.setter
+    def voltage(self, value):
+        sleep(self.latency)
+        self._voltage = value
+
+
+def measure_frame(expt):
+    d = ps.ItemAttribute()
+    d.frame = FRAME * expt.devices.s1.voltage
+    return d
+
+
+def benchmark(latency, pipeline, data_dir):
+    devices = ps.ItemAttribute()
+    devices.s1 = SlowSupply(latency)
+
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'s1': np.linspace(0, 1, N_POINTS)}, 'voltage')
+    runinfo.measure_function = measure_frame
+    runinfo.initial_pause = 0
+    runinfo.storage_options = {'frame': {'compression': 'gzip', 'compression_opts': 4}}
+    runinfo.pipeline = pipeline
+
+    expt = ps.Experiment(runinfo, devices, data_dir=data_dir)
+    start = perf_counter()
+    expt.run()
+    stop = perf_counter()
+
+    return N_POINTS / (stop - start)
+
+
+if __name__ == '__main__':
+    print('points/s saving a {} frame with gzip'.format(FRAME.shape))
+    print('{:>14} {:>12} {:>12}'.format('latency (ms)', 'sequential', 'pipelined'))
+    with TemporaryDirectory() as data_dir:
+        for latency in LATENCIES:
+            print('{:>14.0f} {:>12.1f} {:>12.1f}'.format(
+                latency * 1e3, benchmark(latency, False, data_dir), benchmark(latency, True, data_dir)))
@@ -15,6 +15,18 @@ class InstrumentDriver(ItemAttribute):
     instrument : string or pyvisa :class:`Resource`
         visa string or an instantiated instrument
 
+    Attributes
+    ----------
+    coalesce_writes : bool
+        If True, setting a property to the value this driver last wrote to it does not write to the instrument.
+        Values from queries or set in `__init__` were never written, so they are not coalesced. Defaults to
+        False. A property's settings dictionary can override it with the key 'coalesce'.
+    coalesce_tolerance : float
+        Largest difference between a numeric new value and the last written value for the write to be skipped,
+        defaults to 0. A property's settings dictionary can override it with the key 'coalesce_tolerance'.
+    n_skipped_writes : int
+        Number of writes skipped by write coalescing, only set on the instance once a write is skipped
+
     Methods
     -------
     query(string)
@@ -23,6 +35,8 @@ class InstrumentDriver(ItemAttribute):
     find_first_key(dictionary, machine_value)
     add_device_property(settings)
     get_instrument_property()
+    is_redundant_write(obj, new_value, settings)
+    record_write(obj, value, settings)
     set_values_property()
     set_range_property()
     set_index_values_property()
@@ -31,6 +45,11 @@ class InstrumentDriver(ItemAttribute):
     get_property_docstring(prop_name)
     '''
 
+    # write coalescing is off unless a driver class or instance turns it on
+    coalesce_writes = False
+    coalesce_tolerance = 0
+    n_skipped_writes = 0
+
     def __init__(self, instrument, debug=False):
         if isinstance(instrument, str):
             self.instrument = new_instrument(instrument)
@@ -44,6 +63,8 @@ class InstrumentDriver(ItemAttribute):
             pass
 
         self.debug = debug
+        # last value written to the instrument for each property, see `record_write`
+        self._written_values = {}
 
         self._instrument_driver_version = '0.2.0'
 
@@ -215,6 +236,67 @@ class InstrumentDriver(ItemAttribute):
 
         return value
 
+    def is_redundant_write(self, obj, new_value, settings):
+        '''
+        Checks if setting a property to `new_value` can be skipped because write coalescing is on for the
+        property and the value last written to it by `record_write` equals `new_value`, within the coalescing
+        tolerance for numbers.
+        Counts skipped writes in `obj.n_skipped_writes`.
+
+        Parameters
+        ----------
+        obj :
+            parent class object
+        new_value :
+            new value to be set on instrument
+        settings : dict
+            settings dictionary of the property
+
+        Returns
+        -------
+        bool
+        '''
+
+        if obj.debug or (not settings.get('coalesce', obj.coalesce_writes)):
+            return False
+
+        # the `_name` cache also holds defaults and query results, which may differ from the instrument state
+        written = getattr(obj, '_written_values', {})
+        if settings['name'] not in written:
+            return False
+        cached = written[settings['name']]
+
+        numbers = (int, float, np.number)
+        if isinstance(new_value, numbers) and isinstance(cached, numbers):
+            tolerance = settings.get('coalesce_tolerance', obj.coalesce_tolerance)
+            redundant = abs(new_value - cached) <= tolerance
+        else:
+            redundant = (type(new_value) is type(cached)) and (new_value == cached)
+
+        if redundant:
+            obj.n_skipped_writes += 1
+
+        return redundant
+
+    def record_write(self, obj, value, settings):
+        '''
+        Records `value` as the last value written to the instrument for a property, used by `is_redundant_write`
+
+        Parameters
+        ----------
+        obj :
+            parent class object
+        value :
+            value written to the instrument
+        settings : dict
+            settings dictionary of the property
+        '''
+        try:
+            written = obj._written_values
+        except AttributeError:
+            written = obj._written_values = {}
+        written[settings['name']] = value
+
     def set_values_property(self, obj, new_value, settings):
         '''
         Generator function for settings dictionary with 'values' item
@@ -237,9 +319,12 @@ class InstrumentDriver(ItemAttribute):
         values = settings['values']
 
         if values.count(new_value) > 0:
+            if self.is_redundant_write(obj, new_value, settings):
+                return
             if not self.debug:
                 obj.write(settings['write_string'].format(new_value))
                 setattr(obj, '_' + settings['name'], new_value)
+                self.record_write(obj, new_value, settings)
             else:
                 setattr(obj, '_' + settings['name'],
                         settings['write_string'].format(new_value))
@@ -284,9 +369,12 @@ class InstrumentDriver(ItemAttribute):
                         new_value, np.float64)), err_string
 
         if rng[0] <= new_value <= rng[1]:
+            if self.is_redundant_write(obj, new_value, settings):
+                return
             if not self.debug:
                 obj.write(settings['write_string'].format(new_value))
                 setattr(obj, '_' + settings['name'], new_value)
+                self.record_write(obj, new_value, settings)
             else:
                 setattr(obj, '_' + settings['name'],
                         settings['write_string'].format(new_value))
@@ -323,10 +411,13 @@ class InstrumentDriver(ItemAttribute):
 
         if new_value in values:
             index = values.index(new_value)
+            if self.is_redundant_write(obj, new_value, settings):
+                return
             if not self.debug:
 
                 obj.write(settings['write_string'].format(index))
                 setattr(obj, '_' + settings['name'], new_value)
+                self.record_write(obj, new_value, settings)
             else:
                 setattr(obj, '_' + settings['name'],
                         settings['write_string'].format(index))
@@ -373,6 +464,9 @@ class InstrumentDriver(ItemAttribute):
         # make sure that the input key is in the property's dictionary
         if input_key in dictionary.keys():
             machine_value = dictionary[input_key]
+            # the cached value is the first key of the machine value
+            if self.is_redundant_write(obj, self.find_first_key(dictionary, machine_value), settings):
+                return
             if not self.debug:
                 # send the machine the machine value corresponding to desired state
                 obj.write(settings['write_string'].format(machine_value))
@@ -380,6 +474,7 @@ class InstrumentDriver(ItemAttribute):
                 first_key = self.find_first_key(dictionary, machine_value)
                 # set the _ attribute to the priority key value found above
                 setattr(obj, '_' + settings['name'], first_key)
+                self.record_write(obj, first_key, settings)
             else:
                 setattr(obj, '_' + settings['name'],
                         settings['write_string'].format(machine_value))
@@ -7,3 +7,12 @@ from .is_numeric_type import is_numeric_type
 from .same_length import same_length
 from .set_difference import set_difference
 from .append_stack_or_contact import append_stack_or_contact
+from .chunk_shape import chunk_shape
+from .fill_value import fill_value
+from .instrument_lock import instrument_lock
+from .available_memory import available_memory
+
+# objects
+from .growable_array import GrowableArray
+from .scan_schedule import ScanSchedule
+from .deadline_clock import DeadlineClock
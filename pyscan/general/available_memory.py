@@ -0,0 +1,38 @@
+import os
+
+
+def available_memory(meminfo='/proc/meminfo'):
+    '''
+    Returns the physical memory available to new allocations in bytes, from `psutil` if it is installed,
+    otherwise from the 'MemAvailable' entry of `meminfo` on Linux, which counts reclaimable page cache, and
+    otherwise from the free pages reported by `os.sysconf`. Returns None if it cannot be determined on this
+    platform.
+
+    Parameters
+    ----------
+    meminfo : str, optional
+        Path of the Linux meminfo file, defaults to '/proc/meminfo'
+
+    Returns
+    -------
+    int or None
+    '''
+    try:
+        import psutil
+        return int(psutil.virtual_memory().available)
+    except ImportError:
+        pass
+
+    try:
+        with open(meminfo) as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    # values are in kiB
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        return int(os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE'))
+    except (AttributeError, ValueError, OSError):
+        return None
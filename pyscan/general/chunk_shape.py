@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def chunk_shape(scan_dims, data_shape=(), itemsize=8, target_bytes=2**20):
+    '''
+    Returns an hdf5 chunk shape for a measured dataset of shape ``(*scan_dims, *data_shape)``.
+
+    The chunk spans the innermost scan axis (scan0) and the whole per-point data shape, with all
+    outer scan axes set to 1, so that saving one point only touches one chunk. The chunk is then
+    bounded to `target_bytes` by shrinking the innermost scan axis first and then the data axes,
+    starting from the outermost data axis.
+
+    Parameters
+    ----------
+    scan_dims : tuple
+        Length of each scan axis, from scan0 outwards
+    data_shape : tuple, optional
+        Shape of a single measured point, defaults to () for a scalar
+    itemsize : int, optional
+        Number of bytes of one element, defaults to 8
+    target_bytes : int, optional
+        Maximum number of bytes in one chunk, defaults to 1 MiB
+
+    Returns
+    -------
+    tuple
+    '''
+
+    scan_chunk = [1 for _ in scan_dims]
+    if len(scan_chunk) > 0:
+        scan_chunk[0] = scan_dims[0]
+    chunk = [max(int(n), 1) for n in (*scan_chunk, *data_shape)]
+
+    target_elements = max(int(target_bytes // itemsize), 1)
+
+    # innermost scan axis first, then the data axes from the outermost inwards
+    order = list(range(min(len(scan_dims), 1))) + list(range(len(scan_dims), len(chunk)))
+    for axis in order:
+        while (np.prod(chunk) > target_elements) and (chunk[axis] > 1):
+            chunk[axis] = int(np.ceil(chunk[axis] / 2))
+
+    return tuple(chunk)
@@ -0,0 +1,120 @@
+from time import perf_counter, sleep
+
+
+class DeadlineClock(object):
+    '''
+    Waits until absolute deadlines on a monotonic clock, so that repeated waits do not accumulate the time
+    spent setting instruments, measuring and saving. Each wait sleeps until `spin` seconds before the deadline
+    and then busy-waits the remainder, which is accurate to a few microseconds where `time.sleep` can
+    overshoot by a millisecond or more.
+
+    Times are in seconds since the clock was started.
+
+    Parameters
+    ----------
+    spin : float, optional
+        Time in seconds before each deadline spent busy-waiting instead of sleeping, defaults to 0.002
+
+    Attributes
+    ----------
+    origin : float
+        `time.perf_counter()` value at which the clock reads 0
+    deadline : float or None
+        Deadline of the last wait since the last `mark()`, None if there was no wait
+
+    Methods
+    -------
+    start(elapsed)
+    now()
+    wait_until(deadline)
+    wait(dt)
+    mark()
+    '''
+
+    def __init__(self, spin=0.002):
+        '''
+        Constructor method
+        '''
+
+        assert spin >= 0, 'spin must be >= 0'
+
+        self.spin = spin
+        self.start()
+
+    def start(self, elapsed=0):
+        '''
+        Starts the clock so that it now reads `elapsed` seconds, and clears the deadline
+        '''
+        self.origin = perf_counter() - elapsed
+        self.deadline = None
+
+    def now(self):
+        '''
+        Returns the time in seconds since the clock was started
+        '''
+        return perf_counter() - self.origin
+
+    def wait_until(self, deadline):
+        '''
+        Sleeps and then busy-waits until the clock reads `deadline`. Returns immediately if the deadline
+        has passed.
+
+        Parameters
+        ----------
+        deadline : float
+            Time in seconds since the clock was started
+
+        Returns
+        -------
+        float
+            Time in seconds by which the deadline was missed when the wait returned, at least 0
+        '''
+        self.deadline = deadline
+        target = self.origin + deadline
+
+        remaining = target - perf_counter()
+        if remaining > self.spin:
+            sleep(remaining - self.spin)
+        while perf_counter() < target:
+            pass
+
+        return max(perf_counter() - target, 0)
+
+    def wait(self, dt):
+        '''
+        Waits `dt` seconds from now, does nothing if `dt` is 0
+
+        Parameters
+        ----------
+        dt : float
+            Time to wait in seconds
+
+        Returns
+        -------
+        float
+            Time in seconds by which the deadline was missed, at least 0
+        '''
+        if dt > 0:
+            return self.wait_until(self.now() + dt)
+        return 0
+
+    def mark(self):
+        '''
+        Returns the current time and its lateness relative to the deadline of the last wait, and clears the
+        deadline
+
+        Returns
+        -------
+        timestamp, jitter
+        timestamp : float
+            Time in seconds since the clock was started
+        jitter : float
+            `timestamp` minus the deadline of the last wait since the last mark, NaN if there was no wait
+        '''
+        timestamp = self.now()
+        if self.deadline is None:
+            jitter = float('nan')
+        else:
+            jitter = timestamp - self.deadline
+        self.deadline = None
+        return timestamp, jitter
@@ -1,16 +1,25 @@
-from itertools import product
-import numpy as np
+from .scan_schedule import ScanSchedule
 
 
-def delta_product(iterator_list, continuous=False):
+def delta_product(iterator_list, continuous=False, start=None):
     '''
-    Generator that yields indicies for arbitrarially long enlcosed for loops and
+    Iterator that yields indicies for arbitrarially long enlcosed for loops and
         a delta for each index relative to the previous indicies
 
     Parameters
     ----------
     length_list : list(range(int))
     continuous : bool
+        If True and the last range is range(1), the last loop never ends
+    start : tuple(int), optional
+        Indicies to start from instead of all zeros, used to resume an interrupted experiment.
+        The loops before `start` are skipped without being yielded, and the delta of the first
+        yielded indicies is -1 for every index so that every scan is set.
+
+    Returns
+    -------
+    ps.ScanSchedule
+        Iterator over the points of the loops
 
     Yields
     ------
@@ -27,38 +36,16 @@ def delta_product(iterator_list, continuous=False):
     for iterable in iterator_list:
         assert hasattr(iterable, '__iter__'), 'iterator_list contain iterable functions'
 
-    iterator_list = iterator_list[::-1]
-    last = np.zeros(len(iterator_list))
-
-    if iterator_list[0] != range(1):
-        # a fully continuous scan will have range(1), otherwise, it's range(n_max)
-        # which can be handled by the product function normally
-        continuous = False
-
-    j = 0
-    while True:
-
-        if not continuous:
-            iterator = product(*iterator_list)
-        else:
-            iterator = product(*(iterator_list[1:]))
-
-        for indicies in iterator:
+    lengths = [len(iterable) for iterable in iterator_list]
 
-            if continuous:
-                indicies = list(indicies)
-                indicies.insert(0, j)
-                indicies = tuple(indicies)
+    # a fully continuous scan will have range(1), otherwise, it's range(n_max)
+    # which can be handled as a normal loop
+    if continuous and (iterator_list[-1] == range(1)):
+        lengths[-1] = None
 
-            if indicies == tuple([0 for i in range(len(iterator_list))]):
-                yield indicies, tuple([-1 for length in iterator_list])
-            else:
-                delta = np.array(indicies) - last
-                delta[np.where(delta < 0)] = -1
-                yield indicies[::-1], tuple([int(val) for val in delta])[::-1]
-            last = indicies
+    schedule = ScanSchedule(lengths)
+    if start is not None:
+        assert len(start) == len(lengths), 'start must have one index per iterator'
+        schedule.seek(schedule.index(start))
 
-        if continuous:
-            j += 1
-        else:
-            break
+    return schedule
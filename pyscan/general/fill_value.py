@@ -0,0 +1,31 @@
+import numpy as np
+
+
+def fill_value(dtype):
+    '''
+    Returns the value used to mark points that have not been measured yet for arrays of `dtype`.
+
+    Integer types use the value furthest from zero that they can hold, so that an unmeasured point is not
+    mistaken for a measured zero. Booleans have no spare value, use the 'checkpoint/completed' dataset of the
+    save file to tell their unmeasured points apart.
+
+    Parameters
+    ----------
+    dtype : numpy.dtype or str
+        Data type of the array
+
+    Returns
+    -------
+    ``nan`` for float and complex types, the minimum of signed and the maximum of unsigned integer types,
+    otherwise 0 cast to `dtype`
+    '''
+    dtype = np.dtype(dtype)
+
+    if np.issubdtype(dtype, np.inexact):
+        return dtype.type(np.nan)
+    elif np.issubdtype(dtype, np.signedinteger):
+        return dtype.type(np.iinfo(dtype).min)
+    elif np.issubdtype(dtype, np.unsignedinteger):
+        return dtype.type(np.iinfo(dtype).max)
+    else:
+        return dtype.type(0)
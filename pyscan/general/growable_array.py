@@ -0,0 +1,98 @@
+import numpy as np
+
+
+class GrowableArray(object):
+    '''
+    Array that grows along one axis by doubling its capacity, so that appending n values
+    copies O(n) data in total instead of O(n^2).
+
+    Parameters
+    ----------
+    array : array like object
+        Initial values
+    axis : int, optional
+        Axis along which values are appended, defaults to 0
+    capacity : int, optional
+        Initial capacity along `axis`, defaults to the length of `array` along `axis`, and at least 16
+
+    Attributes
+    ----------
+    n : int
+        Logical length along `axis`
+    capacity : int
+        Allocated length along `axis`
+
+    (Properties)
+    view : np.ndarray
+        View of the first `n` values along `axis`
+    dtype : np.dtype
+        Data type of the array
+
+    Methods
+    -------
+    append(value)
+    '''
+
+    def __init__(self, array, axis=0, capacity=None):
+        '''
+        Constructor method
+        '''
+
+        array = np.asarray(array)
+
+        self.axis = axis
+        self.n = array.shape[axis]
+
+        if capacity is None:
+            capacity = 16
+        self.capacity = max(self.n, capacity, 1)
+
+        shape = list(array.shape)
+        shape[axis] = self.capacity
+        self.buffer = np.empty(shape, dtype=array.dtype)
+        self.buffer[self.index(0, self.n)] = array
+
+    def index(self, start, stop):
+        '''
+        Returns the index tuple that selects `start:stop` along `axis`
+        '''
+        return (*[slice(None) for _ in range(self.axis)], slice(start, stop))
+
+    @property
+    def view(self):
+        '''
+        Returns a view of the first `n` values along `axis`
+        '''
+        return self.buffer[self.index(0, self.n)]
+
+    @property
+    def dtype(self):
+        return self.buffer.dtype
+
+    def append(self, value):
+        '''
+        Appends one value along `axis`, doubling the capacity if the array is full
+
+        Parameters
+        ----------
+        value : scalar or array like object
+            Value broadcastable to the shape of the array without `axis`
+
+        Returns
+        -------
+        np.ndarray
+            The updated `view`
+        '''
+
+        if self.n == self.capacity:
+            self.capacity *= 2
+            shape = list(self.buffer.shape)
+            shape[self.axis] = self.capacity
+            buffer = np.empty(shape, dtype=self.buffer.dtype)
+            buffer[self.index(0, self.n)] = self.view
+            self.buffer = buffer
+
+        self.buffer[(*[slice(None) for _ in range(self.axis)], self.n)] = value
+        self.n += 1
+
+        return self.view
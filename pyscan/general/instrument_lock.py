@@ -0,0 +1,47 @@
+import weakref
+from threading import RLock, Lock
+
+
+# locks keyed by the id of the shared instrument, removed when the instrument is garbage collected
+_locks = {}
+# instruments that do not support weak references are kept, so that their id is not reused
+_kept = {}
+# reentrant, since garbage collection can remove a lock while the registry is held
+_registry_lock = RLock()
+
+
+def _forget(key):
+    with _registry_lock:
+        _locks.pop(key, None)
+
+
+def instrument_lock(device):
+    '''
+    Returns the lock of the instrument behind `device`, so that devices sharing an instrument or bus, such as
+    the ports of one SIM900 mainframe, are not accessed from several threads at once. Devices are keyed by their
+    `instrument` attribute, or by the device itself if it has none. The registry only holds weak references, so
+    drivers and their sessions can still be garbage collected.
+
+    Parameters
+    ----------
+    device : ps.InstrumentDriver or object
+        Device that is about to be accessed
+
+    Returns
+    -------
+    threading.Lock
+    '''
+    instrument = getattr(device, 'instrument', None)
+    if instrument is None:
+        instrument = device
+
+    key = id(instrument)
+    with _registry_lock:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = Lock()
+            try:
+                weakref.finalize(instrument, _forget, key)
+            except TypeError:
+                _kept[key] = instrument
+        return lock
@@ -0,0 +1,272 @@
+import numpy as np
+
+
+class ScanSchedule(object):
+    '''
+    Iterator over the points of nested scan loops, yielding the same indicies and deltas as
+    :func:`pyscan.general.delta_product.delta_product`. The state is an integer odometer and the point number,
+    so each step only increments the odometer and the delta tuples are precomputed. Any point can be
+    computed directly from its number, and `chunk` computes a block of points at once with numpy.
+
+    A loop with `snake` set runs in serpentine (boustrophedon) order: each time it restarts it runs in the
+    opposite direction, so it stays at its last index instead of returning to zero. Loop `a` runs in reverse on
+    its odd numbered passes, when ``(k // (strides[a] * lengths[a])) % 2 == 1`` for point number `k`.
+
+    Parameters
+    ----------
+    lengths : tuple
+        Length of each loop, from the innermost (scan0) outwards. The last length can be None for a loop
+        that never ends, such as a continuous scan without `n_max`.
+    start : int, optional
+        Number of the first point to yield, defaults to 0. The deltas of the first yielded point are -1 for
+        every index so that every scan is set.
+    snake : tuple, optional
+        For each loop, True if it runs in serpentine order, defaults to False for every loop. Deltas are -1
+        when a serpentine loop steps backwards and 0 when it turns around.
+
+    Attributes
+    ----------
+    k : int
+        Number of the next point to yield
+    n_points : int or None
+        Total number of points, None if the last loop never ends
+
+    Methods
+    -------
+    point(k)
+    index(indicies)
+    seek(k)
+    skip(a)
+    chunk(k, n)
+    first_missing(done)
+    '''
+
+    def __init__(self, lengths, start=0, snake=None):
+        '''
+        Constructor method
+        '''
+
+        self.lengths = tuple(lengths)
+        assert len(self.lengths) > 0, 'ScanSchedule needs at least one loop'
+        for n in self.lengths[:-1]:
+            assert (n is not None) and (n >= 1), 'Only the last loop length can be None, the others must be >= 1'
+
+        if snake is None:
+            self.snake = tuple(False for _ in self.lengths)
+        else:
+            self.snake = tuple(bool(s) for s in snake)
+        assert len(self.snake) == len(self.lengths), 'snake must have one value per loop'
+
+        # number of points in one step of each loop
+        self.strides = tuple(int(np.prod(self.lengths[:a])) for a in range(len(self.lengths)))
+
+        if self.lengths[-1] is None:
+            self.n_points = None
+        else:
+            self.n_points = self.strides[-1] * self.lengths[-1]
+
+        # deltas of a step that carries into loop c moving forwards or backwards, inner serpentine loops
+        # turn around and loops of length 1 never change
+        self.first_deltas = tuple(-1 for _ in self.lengths)
+        self.carry_deltas = {}
+        for c in range(len(self.lengths)):
+            for direction in [1, -1]:
+                self.carry_deltas[c, direction] = tuple(
+                    direction if a == c else -1 if (a < c) and (self.lengths[a] != 1) and (not self.snake[a]) else 0
+                    for a in range(len(self.lengths)))
+
+        self.seek(start)
+
+    def __iter__(self):
+        return self
+
+    def __len__(self):
+        if self.n_points is None:
+            raise TypeError('ScanSchedule with an endless loop has no length')
+        return self.n_points
+
+    def __next__(self):
+        if (self.n_points is not None) and (self.k >= self.n_points):
+            raise StopIteration
+
+        if self.started:
+            indicies = self.indicies
+            directions = self.directions
+            lengths = self.lengths
+            a = 0
+            while True:
+                i = indicies[a] + directions[a]
+                if (lengths[a] is None) or (0 <= i < lengths[a]):
+                    indicies[a] = i
+                    break
+                if self.snake[a]:
+                    directions[a] = -directions[a]
+                else:
+                    indicies[a] = 0
+                a += 1
+            deltas = self.carry_deltas[a, directions[a]]
+        else:
+            self.started = True
+            deltas = self.first_deltas
+
+        self.k += 1
+
+        return tuple(self.indicies), deltas
+
+    def point(self, k):
+        '''
+        Returns the indicies of point number `k`
+
+        Parameters
+        ----------
+        k : int
+            Point number
+
+        Returns
+        -------
+        tuple
+        '''
+        assert (k >= 0) and ((self.n_points is None) or (k < self.n_points)), 'Point {} is out of range'.format(k)
+
+        indicies = []
+        for stride, n, snake in zip(self.strides, self.lengths, self.snake):
+            if n is None:
+                indicies.append(k // stride)
+            elif snake and (k // (stride * n)) % 2 == 1:
+                indicies.append(n - 1 - (k // stride) % n)
+            else:
+                indicies.append((k // stride) % n)
+        return tuple(indicies)
+
+    def index(self, indicies):
+        '''
+        Returns the point number of `indicies`, the inverse of `point`
+
+        Parameters
+        ----------
+        indicies : tuple
+            Index of each loop, from the innermost outwards
+
+        Returns
+        -------
+        int
+        '''
+        # the direction of each loop depends on the outer loops, so accumulate from the outermost loop
+        k = 0
+        for a in range(len(self.lengths) - 1, -1, -1):
+            n = self.lengths[a]
+            i = indicies[a]
+            if self.snake[a] and (n is not None) and (k // (self.strides[a] * n)) % 2 == 1:
+                i = n - 1 - i
+            k += i * self.strides[a]
+        return int(k)
+
+    def seek(self, k):
+        '''
+        Moves the schedule to point number `k`, the next yielded point is `k` with deltas of -1
+        '''
+        self.k = k
+        self.started = False
+        if (self.n_points is None) or (k < self.n_points):
+            self.indicies = list(self.point(k))
+        else:
+            self.indicies = [0 for _ in self.lengths]
+        self.directions = [
+            -1 if snake and (n is not None) and (k // (stride * n)) % 2 == 1 else 1
+            for stride, n, snake in zip(self.strides, self.lengths, self.snake)]
+
+    def skip(self, a=0):
+        '''
+        Ends the current pass of loop `a` after the last yielded point, so the next point starts the next pass,
+        as if the remaining points of the pass had been yielded. Used to stop averaging early.
+
+        Parameters
+        ----------
+        a : int, optional
+            Loop to end, defaults to 0 (the innermost loop)
+        '''
+        assert self.started, 'skip can only end a pass after a point has been yielded'
+        assert self.lengths[a] is not None, 'An endless loop has no end to skip to'
+
+        if self.directions[a] == 1:
+            self.indicies[a] = self.lengths[a] - 1
+        else:
+            self.indicies[a] = 0
+        self.k = self.index(self.indicies) + 1
+
+    def chunk(self, k, n):
+        '''
+        Computes the indicies and deltas of `n` consecutive points starting at point number `k`,
+        without changing the position of the iterator. The deltas of point `k` are computed relative to
+        point `k - 1`, and are all -1 if `k` is 0.
+
+        Parameters
+        ----------
+        k : int
+            Number of the first point
+        n : int
+            Number of points, shortened if the schedule ends first
+
+        Returns
+        -------
+        indicies, deltas
+        indicies : np.ndarray
+            Integer array of shape (n, number of loops)
+        deltas : np.ndarray
+            Integer array of shape (n, number of loops)
+        '''
+        if self.n_points is not None:
+            n = max(min(n, self.n_points - k), 0)
+
+        points = np.arange(k - 1, k + n, dtype='int64')
+        strides = np.array(self.strides, dtype='int64')
+        indicies = points[:, np.newaxis] // strides
+        for a, length in enumerate(self.lengths):
+            if length is not None:
+                if self.snake[a]:
+                    reverse = (indicies[:, a] // length) % 2 == 1
+                    indicies[:, a] %= length
+                    indicies[reverse, a] = length - 1 - indicies[reverse, a]
+                else:
+                    indicies[:, a] %= length
+
+        deltas = np.sign(np.diff(indicies, axis=0))
+        indicies = indicies[1:]
+        if (k == 0) and (n > 0):
+            deltas[0] = -1
+
+        return indicies, deltas
+
+    def first_missing(self, done, block=2**16):
+        '''
+        Returns the number of the first point, in schedule order, whose flag in `done` is False. Points beyond
+        the extent of `done` along the last loop count as missing, so a schedule whose last loop never ends
+        stops at the end of `done`. The points are checked `block` at a time with `chunk`.
+
+        Parameters
+        ----------
+        done : np.ndarray
+            Boolean array indexed by the indicies of each point, such as a completed-point bitmap
+        block : int, optional
+            Number of points checked at once, defaults to 65536
+
+        Returns
+        -------
+        int
+            Number of the first missing point, the number of points in `done` if none is missing
+        '''
+        done = np.asarray(done, dtype=bool)
+        assert done.ndim == len(self.lengths), 'done must have one axis per loop'
+
+        n_done = self.strides[-1] * done.shape[-1]
+        if self.n_points is not None:
+            n_done = min(n_done, self.n_points)
+
+        k = 0
+        while k < n_done:
+            indicies, deltas = self.chunk(k, min(block, n_done - k))
+            missing = np.flatnonzero(~done[tuple(indicies.T)])
+            if len(missing) > 0:
+                return int(k + missing[0])
+            k += len(indicies)
+        return int(n_done)
@@ -1,10 +1,17 @@
 # Functions
-from .load_experiment import load_experiment
+from .load_experiment import load_experiment, FollowedExperiment
 from .get_pyscan_version import get_pyscan_version
+from .timing_summary import timing_summary, format_timing_summary
 
 # Scans/Experiments
 from .experiment import Experiment
-from .scans import PropertyScan, RepeatScan, ContinuousScan, FunctionScan, AverageScan
+from .scans import PropertyScan, RepeatScan, ContinuousScan, FunctionScan, AverageScan, AdaptiveScan
 
 # Other objects
 from .run_info import RunInfo
+from .run_plan import RunPlan
+from .run_writer import RunWriter, AsyncRunWriter
+from .dataset_view import DatasetView
+from .settle import Settle
+from .progress import Progress
+from .reduce_pool import ReducePool
@@ -0,0 +1,78 @@
+class DatasetView(object):
+    '''
+    Lazy, sliceable view of a measured hdf5 dataset, used in place of an in-memory array when
+    `runinfo.out_of_core` is True. Indexing reads only the requested slice from the save file and
+    assigning to a slice writes it straight through, so measured data is never held in memory. Once the run has
+    ended, reads open the save file read-only.
+
+    Parameters
+    ----------
+    expt : ps.Experiment
+        Experiment that owns the save file
+    name : str
+        Name of the measured dataset
+
+    Attributes
+    ----------
+    (Properties)
+    shape : tuple
+        Shape of the dataset
+    dtype : np.dtype
+        Data type of the dataset
+    ndim : int
+        Number of dimensions of the dataset
+
+    Methods
+    -------
+    resize(n, axis)
+    '''
+
+    def __init__(self, expt, name):
+        '''
+        Constructor method
+        '''
+        self.expt = expt
+        self.name = name
+
+    def __getitem__(self, index):
+        with self.expt.open_reader() as f:
+            return f[self.name][index]
+
+    def __setitem__(self, index, value):
+        with self.expt.open_writer() as f:
+            f[self.name][index] = value
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[()]
+        if dtype is not None:
+            array = array.astype(dtype)
+        return array
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return 'DatasetView({}, shape={}, dtype={})'.format(self.name, self.shape, self.dtype)
+
+    @property
+    def shape(self):
+        with self.expt.open_reader() as f:
+            return f[self.name].shape
+
+    @property
+    def dtype(self):
+        with self.expt.open_reader() as f:
+            return f[self.name].dtype
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def resize(self, n, axis=0):
+        '''
+        Resizes the dataset to length `n` along `axis`
+        '''
+        with self.expt.open_writer() as f:
+            shape = list(f[self.name].shape)
+            shape[axis] = n
+            f[self.name].resize(shape)
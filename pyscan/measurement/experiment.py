@@ -1,19 +1,35 @@
-import h5py
+import os
 import json
+import h5py
+import warnings
 import numpy as np
 
-from time import sleep
+from time import sleep, time, perf_counter
 from pathlib import Path
+from contextlib import nullcontext
 from threading import Thread as thread
+from concurrent.futures import ThreadPoolExecutor
 from time import strftime
 
-from .scans import PropertyScan
+from .scans import PropertyScan, AdaptiveScan
+from .run_plan import RunPlan
+from .run_writer import RunWriter, AsyncRunWriter
+from .dataset_view import DatasetView
+from .progress import Progress
+from .reduce_pool import ReducePool
 from .pyscan_json_encoder import PyscanJSONEncoder
 from itemattribute import ItemAttribute
 
 from ..general.is_list_type import is_list_type
-from ..general.append_stack_or_contact import append_stack_or_contact
-from ..general.delta_product import delta_product
+from ..general.scan_schedule import ScanSchedule
+from ..general.deadline_clock import DeadlineClock
+from ..general.chunk_shape import chunk_shape
+from ..general.fill_value import fill_value
+from ..general.growable_array import GrowableArray
+from ..general.available_memory import available_memory
+
+
+HOOKS = ['before_iterate', 'after_measure', 'after_save', 'on_line_complete', 'on_stop']
 
 
 class Experiment(ItemAttribute):
@@ -35,24 +51,80 @@ class Experiment(ItemAttribute):
         Contains all information about the experiment
     devices : ItemAttribute
         ItemAttribute instance containing all experiment devices
+    plan : ps.RunPlan
+        Precompiled scan loop built by `check_runinfo()`, None before the first run
+    writer : ps.RunWriter
+        Writer holding the hdf5 file open while the experiment is running, None before the first run
+    buffers : dict
+        Growable buffers backing the measured arrays of continuous scans, keyed by measured name
+    clock : ps.DeadlineClock
+        Monotonic clock started with each run, used by scans to wait for their `dt` deadlines
+    point_time : tuple
+        (timestamp, jitter) of the current point, taken after the scans are set and before measuring
+    start_time : float
+        Wall clock time (seconds since the epoch) at which the run started, None before the first run
+    settle_time : float
+        Time in seconds spent by the scans' settle conditions at the current point, NaN if there was none
+    iterate_time : list
+        Time in seconds spent iterating each scan at the current point, from scan0 outwards, NaN for scans
+        that did not move
+    measure_time : float
+        Time in seconds spent in `runinfo.measure_function` at the current point
+    line_direction : int
+        Direction of scan0 at the current point, -1 on the reversed lines of a serpentine scan0 and 1 otherwise
+    timing : ItemAttribute
+        Per point timing of the last run loaded from the 'timing' group of the save file when the run ends,
+        None if `runinfo.save_timing` is False or before the first run. See `ps.timing_summary`.
+    executor : concurrent.futures.ThreadPoolExecutor
+        Thread pool used by concurrent scans, None until it is first used by a run
+    skipped_writes : dict
+        Number of instrument writes skipped by write coalescing during the last run, keyed by device name.
+        Also saved as the 'skipped_writes' attribute of the save file, unless it is in swmr mode.
+    hooks : dict
+        Functions called at each phase of the run, keyed by event, see `add_hook()`
+    progress : ps.Progress
+        Completed points, points per second, estimated time remaining and time per phase of the current or last
+        run, readable from other threads and mirrored in the 'progress' attribute of the save file
+    convergence : ItemAttribute
+        With an average scan that stops early, the arrays count and stderr holding the number of repeats
+        and the standard error of each saved point, None otherwise
 
     Methods
     -------
     # Setup methods
     setup_data_dir(data_dir)
     check_runinfo()
+    estimate(n_trials, point_time, data)
+    get_n_points()
     save_metadata(metadata_name)
+    get_save_name()
+    get_executor()
+    get_skipped_writes()
+    open_writer()
+    open_reader()
+    add_hook(event, function)
+    remove_hook(event, function)
 
     # Data methods
     preallocate(data)
+    get_dtype(name, value)
+    get_storage_options(name)
+    get_chunks(name, scan_dims, data_shape, itemsize)
     reallocate(data)
-    rolling_average(data)
-    save_point(data)
+    get_point_state()
+    process_point(data, state)
+    rolling_average(data, state)
+    save_point(data, state)
+    get_point_keys()
+    load_timing()
 
     # Running experiment methods
     start_thread()
     stop()
     run()
+    resume(file_name)
+    execute(resume)
+    load_checkpoint()
     '''
 
     def __init__(self, runinfo, devices, data_dir=None):
@@ -63,41 +135,239 @@ class Experiment(ItemAttribute):
 
         self.runinfo = runinfo
         self.devices = devices
+        self.plan = None
+        self.writer = None
+        self.buffers = {}
+        self.clock = DeadlineClock()
+        self.point_time = (np.nan, np.nan)
+        self.start_time = None
+        self.settle_time = np.nan
+        self.iterate_time = []
+        self.measure_time = np.nan
+        self.line_direction = 1
+        self.last_save = None
+        self.timing = None
+        self.executor = None
+        self.skipped_writes = {}
+        self.convergence = None
+        self.hooks = {event: [] for event in HOOKS}
+        self.progress = Progress()
         self.setup_data_dir(data_dir)
 
     def run(self):
 
         self.check_runinfo()
 
-        self.save_metadata('runinfo')
-        self.save_metadata('devices')
+        self.execute()
 
-        sleep(self.runinfo.initial_pause)
+    def resume(self, file_name):
+        '''
+        Resumes an interrupted run saved in `file_name`, for example after an instrument error or a crash.
+        The experiment must be created with the same runinfo and devices as the interrupted run. The measured
+        data, measured names and scan positions are restored from the save file, and the run continues from the
+        first point missing from the file's completed-point bitmap, writing into the same file.
 
-        self.runinfo.running = True
+        Parameters
+        ----------
+        file_name : str
+            Path to the hdf5 save file of the interrupted run
+        '''
+
+        self.check_runinfo()
+
+        save_path = Path(file_name)
+        if save_path.suffix != '.hdf5':
+            save_path = save_path.with_suffix('.hdf5')
+        assert save_path.is_file(), 'Cannot locate {}'.format(save_path)
 
-        for indicies, deltas in delta_product(self.runinfo.iterators, self.runinfo.has_continuous_scan):
-            for scan, i, d in zip(self.runinfo.scans[::-1], indicies[::-1], deltas[::-1]):
-                scan.iterate(self, i, d)
+        self.runinfo.data_path = save_path.parent
+        self.runinfo.file_name = save_path.stem
+
+        self.execute(resume=True)
 
-            data = self.runinfo.measure_function(self)
+    def execute(self, resume=False):
+        '''
+        Opens the run writer and runs the experiment loop, used by `run()` and `resume()`
 
-            if np.all(np.array(indicies) == 0):
-                self.preallocate(data)
-            elif (self.runinfo.has_continuous_scan) and (deltas[-1] == 1):
-                self.reallocate(data)
-                # early terminate here
-                if not self.runinfo.running:
-                    break
-                continue  # saving is handled here
-            elif self.runinfo.has_average_scan:
-                self.rolling_average(data)
+        Parameters
+        ----------
+        resume : bool, optional
+            If True, the run is restored from the save file with `load_checkpoint()`
+            and continues from the first unmeasured point, defaults to False
+        '''
+
+        # the file stays open until the run completes, is stopped, or raises an exception
+        # buffered points are flushed when the writer closes, including after stop() or an exception
+        flush_policy = {'flush_interval': self.runinfo.flush_interval, 'flush_time': self.runinfo.flush_time,
+                        'flush_on_line': self.runinfo.flush_on_line}
+        if self.runinfo.async_save:
+            self.writer = AsyncRunWriter(self.get_save_name(), **flush_policy, swmr=self.runinfo.swmr,
+                                         queue_size=self.runinfo.save_queue_size)
+        else:
+            self.writer = RunWriter(self.get_save_name(), **flush_policy, swmr=self.runinfo.swmr)
+        self.writer.progress = self.progress
+        self.writer.open()
+
+        start_skipped_writes = self.get_skipped_writes()
+        self.last_save = None
+
+        try:
+            if resume:
+                start = self.load_checkpoint()
+            else:
+                start = 0
+                self.start_time = None
+                self.save_metadata('runinfo')
+                self.save_metadata('devices')
+
+            # start is None when a resumed run was already complete
+            if start is not None:
+                sleep(self.runinfo.initial_pause)
+
+                # timestamps continue from the start of an interrupted run
+                if self.start_time is None:
+                    self.start_time = time()
+                self.clock.start(time() - self.start_time)
+
+                self.runinfo.running = True
+
+                plan = self.plan
+                clock = self.clock
+                progress = self.progress
+                progress.start(self.get_n_points(), start)
+                self.writer.attrs['progress_fields'] = list(Progress.FIELDS)
+                measure_function = self.runinfo.measure_function
+                before_iterate = self.hooks['before_iterate']
+                after_measure = self.hooks['after_measure']
+
+                # with pipelining, each point is averaged and saved while the scans set the next point
+                if self.runinfo.pipeline:
+                    pipeline = ThreadPoolExecutor(max_workers=1)
+                else:
+                    pipeline = None
+                saving = None
+
+                # with a reduce function, each point is reduced in a worker process while the next ones are acquired
+                if self.runinfo.reduce_function is not None:
+                    pool = ReducePool(self.runinfo.reduce_function, max_workers=self.runinfo.reduce_workers,
+                                      max_in_flight=self.runinfo.reduce_in_flight,
+                                      shared_bytes=self.runinfo.shared_memory_bytes)
+                else:
+                    pool = None
 
-            self.save_point(data)
+                try:
+                    schedule = ScanSchedule(plan.lengths, start=start, snake=plan.snake)
+                    for indicies, deltas in schedule:
+                        # hooks cost one check per point when none are registered
+                        if before_iterate:
+                            for hook in before_iterate:
+                                hook(self, indicies, deltas)
 
-            # early terminate here
-            if not self.runinfo.running:
-                break
+                        self.settle_time = np.nan
+                        iterate_time = []
+                        iterate_start = previous = clock.now()
+                        for scan, i, d in zip(plan.reversed_scans, indicies[::-1], deltas[::-1]):
+                            scan.iterate(self, i, d)
+                            # scans that do not move do nothing and are not timed
+                            if d != 0:
+                                now = clock.now()
+                                iterate_time.append(now - previous)
+                                previous = now
+                            else:
+                                iterate_time.append(np.nan)
+                        self.iterate_time = iterate_time[::-1]
+                        self.line_direction = schedule.directions[0]
+
+                        self.point_time = clock.mark()
+
+                        # the previous point is saved before the next one is measured
+                        if saving is not None:
+                            saving.result()
+                            saving = None
+
+                        measure_start = clock.now()
+                        data = measure_function(self)
+                        self.measure_time = clock.now() - measure_start
+
+                        if after_measure:
+                            for hook in after_measure:
+                                hook(self, data)
+
+                        if pool is not None:
+                            pool.submit(data, self.get_point_state())
+                            # the datasets are allocated from the reduced data of the first point
+                            reduced = pool.completed(wait=not any(indicies))
+                            if not any(indicies):
+                                self.preallocate(reduced[0][0])
+                            elif plan.has_continuous_scan and (deltas[-1] == 1):
+                                self.reallocate(data)
+                        elif not any(indicies):
+                            self.preallocate(data)
+                        elif plan.has_continuous_scan and (deltas[-1] == 1):
+                            self.reallocate(data)
+
+                        if plan.has_early_stop:
+                            average_scan = plan.scans[plan.average_index]
+                            assert average_scan.measured in data, \
+                                'Average scan target {} is not measured'.format(average_scan.measured)
+                            converged = average_scan.update(data[average_scan.measured])
+                        else:
+                            converged = False
+
+                        # the remaining repeats of a converged point are skipped
+                        if converged:
+                            schedule.skip(plan.average_index)
+
+                        # counted before saving, so that the progress saved with the point includes it
+                        progress.point_completed(schedule.k, self.point_time[0] - iterate_start, self.measure_time)
+
+                        if pool is not None:
+                            for reduced_data, state in reduced:
+                                self.process_point(reduced_data, state)
+                        elif pipeline is None:
+                            self.process_point(data)
+                        else:
+                            saving = pipeline.submit(self.process_point, data, self.get_point_state())
+
+                        # early terminate here
+                        if not self.runinfo.running:
+                            break
+
+                    if saving is not None:
+                        saving.result()
+                    if pool is not None:
+                        for reduced_data, state in pool.completed(wait=True):
+                            self.process_point(reduced_data, state)
+                finally:
+                    if pipeline is not None:
+                        pipeline.shutdown()
+                    if pool is not None:
+                        pool.close()
+        finally:
+            self.progress.stop()
+            # the save time of the last point is written after it is saved
+            if (self.last_save is not None) and self.writer.is_open:
+                self.writer.buffer_values([self.last_save])
+                self.last_save = None
+            end_skipped_writes = self.get_skipped_writes()
+            self.skipped_writes = {name: n - start_skipped_writes.get(name, 0)
+                                   for name, n in end_skipped_writes.items()}
+            # attributes cannot be created once the file is in swmr mode
+            if self.writer.is_open and (not self.writer.file.swmr_mode):
+                self.writer.attrs['skipped_writes'] = json.dumps(self.skipped_writes)
+            self.writer.close()
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+            self.runinfo.cache_properties()
+
+            for hook in self.hooks['on_stop']:
+                hook(self)
+
+        if self.runinfo.save_timing:
+            self.timing = self.load_timing()
+        else:
+            self.timing = None
 
         self.runinfo.complete = True
         self.runinfo.running = False
@@ -125,16 +395,19 @@ class Experiment(ItemAttribute):
     def check_runinfo(self):
         '''
         Function that is run at the beginning of experiment to ensure runinfo is
-        property formatted.
+        property formatted, then compiles `self.plan` from runinfo.
         '''
 
         scanned_properties = []
         for scan in self.runinfo.scans:
             scan.check_same_length()
-            if isinstance(scan, PropertyScan):
+            if isinstance(scan, (PropertyScan, AdaptiveScan)):
                 for dev in scan.device_names:
                     prop = scan.prop
                     assert hasattr(self.devices[dev], prop), 'Device {} does not have property {}'.format(dev, prop)
+                    if (scan.settle is not None) and isinstance(scan.settle.readback, str):
+                        assert hasattr(self.devices[dev], scan.settle.readback), \
+                            'Device {} does not have readback property {}'.format(dev, scan.settle.readback)
                     assert f'{dev}_{prop}' not in scanned_properties, \
                         'Property {} is duplicated in the scans'.format(f'{dev}_{prop}')
                     scanned_properties.append(f'{dev}_{prop}')
@@ -150,8 +423,299 @@ class Experiment(ItemAttribute):
         self.runinfo.file_name = save_path.stem
         self.runinfo.check()
 
+        self.plan = RunPlan(self.runinfo)
+
         return 1
 
+    def estimate(self, n_trials=1, point_time=None, data=None):
+        '''
+        Estimates the wall time, memory and disk space of a run before starting it, and warns if the measured
+        arrays held in memory would not fit in the available memory. The measure function is called `n_trials`
+        times at the devices' current settings, the scans are not iterated, to time it and find the shape of the
+        measured data. Each trial point is then saved to an in-memory hdf5 file with the dataset types, chunks and
+        storage options of the run, to time saving and to find the compression ratio of array data.
+
+        The wall time is the initial pause, the `dt` of each scan each time it moves, and the measure and save time
+        of every point. Saving overlaps measuring when `runinfo.pipeline` or `runinfo.async_save` is True. Settle
+        conditions, disk writes, flushes and instrument sets are not included. An average scan with a target
+        standard error is counted with every repeat. With `runinfo.reduce_function`, the trial data is reduced
+        once, the memory and disk space are those of the reduced data, and the reduction overlaps measuring
+        across `runinfo.reduce_workers` processes. Sending the acquired data to the workers is not included.
+
+        Parameters
+        ----------
+        n_trials : int, optional
+            Number of trial calls of the measure function, defaults to 1
+        point_time : float, optional
+            Time in seconds to measure a point, used instead of timing the trial calls
+        data : ItemAttribute, optional
+            Data of one point as returned by the measure function, used instead of calling it when `point_time`
+            is also given
+
+        Returns
+        -------
+        ItemAttribute
+            with the items n_points, point_time, reduce_time, save_time, wait_time and wall_time in seconds,
+            memory (peak bytes of the in-memory data arrays), disk (bytes of the save file) and available_memory
+            (bytes, None if unknown)
+        '''
+
+        assert n_trials >= 1, 'n_trials must be >= 1'
+        assert (point_time is None) or (point_time >= 0), 'point_time must be >= 0'
+
+        self.check_runinfo()
+        plan = self.plan
+
+        if plan.has_continuous_scan:
+            n_max = plan.scans[plan.continuous_index].n_max
+            assert n_max is not None, 'A continuous scan needs n_max to estimate the run'
+
+        # a continuous scan stops after the first point of its n_max-th iteration
+        lengths = tuple(plan.lengths)
+        dims = tuple(n_max if a == plan.continuous_index else n for a, n in enumerate(plan.dims))
+        saved_dims = tuple(dims[a] for a in plan.saved_axes)
+        schedule = ScanSchedule(lengths, snake=plan.snake)
+        n_points = self.get_n_points()
+
+        # each scan waits its dt every time it moves, serpentine scans do not move when they turn around
+        wait_time = 0
+        for a, scan in enumerate(plan.scans):
+            if lengths[a] == 1:
+                moves = 1
+            else:
+                moves = -(-n_points // schedule.strides[a])
+                if plan.snake[a]:
+                    moves -= -(-n_points // (schedule.strides[a] * lengths[a])) - 1
+            wait_time += moves * getattr(scan, 'dt', 0)
+
+        trials = []
+        if (data is None) or (point_time is None):
+            for _ in range(n_trials if point_time is None else 1):
+                start = perf_counter()
+                data = self.runinfo.measure_function(self)
+                trials.append(perf_counter() - start)
+        if point_time is None:
+            point_time = float(np.mean(trials))
+
+        # the acquired data is reduced before it is saved
+        reduce_time = 0
+        if self.runinfo.reduce_function is not None:
+            start = perf_counter()
+            data = self.runinfo.reduce_function(data)
+            reduce_time = perf_counter() - start
+
+        memory = 0
+        disk = 0
+        save_time = 0
+        with h5py.File('estimate.hdf5', 'w', driver='core', backing_store=False) as f:
+            for name, value in data.items():
+                dtype = self.get_dtype(name, value)
+                data_shape = np.shape(value)
+                nbytes = int(np.prod(saved_dims)) * int(np.prod(data_shape)) * dtype.itemsize
+
+                chunks = self.get_chunks(name, saved_dims, data_shape, dtype.itemsize)
+                shape = (*saved_dims, *data_shape) if len(saved_dims) + len(data_shape) > 0 else (1,)
+                chunks = tuple(min(c, n) for c, n in zip(chunks, shape)) if len(chunks) == len(shape) else None
+                dataset = f.create_dataset(name, shape=shape, chunks=chunks, fillvalue=fill_value(dtype),
+                                           dtype=dtype, **self.get_storage_options(name))
+                point = np.asarray(value, dtype=dtype)
+
+                start = perf_counter()
+                for k in range(n_trials):
+                    if len(saved_dims) > 0:
+                        index = np.unravel_index(k % int(np.prod(saved_dims)), saved_dims)
+                        dataset[(*index, ...)] = point
+                    else:
+                        dataset[...] = point
+                save_time += (perf_counter() - start) / n_trials
+
+                # compression ratio of a single point stored on its own
+                ratio = 1
+                if (dataset.compression is not None) and (len(data_shape) > 0):
+                    single = f.create_dataset(name + '_point', data=point, chunks=data_shape,
+                                              **self.get_storage_options(name))
+                    ratio = single.id.get_storage_size() / max(point.nbytes, 1)
+
+                disk += int(nbytes * ratio)
+                if not self.runinfo.out_of_core:
+                    # continuous scans grow their arrays by doubling
+                    memory += 2 * nbytes if plan.has_continuous_scan else nbytes
+
+        n_all = int(np.prod(dims))
+        for scan in plan.scans:
+            for key, values in scan.scan_dict.items():
+                disk += np.asarray(values).nbytes
+        if self.runinfo.checkpoint:
+            disk += n_all
+        if self.runinfo.save_timing:
+            # timestamp, jitter and settle time, then measure, average, save and one iterate time per scan
+            timing_bytes = n_all * (3 * 8 + (3 + len(plan.scans)) * 4)
+            disk += timing_bytes
+            if not self.runinfo.out_of_core:
+                memory += timing_bytes
+        if plan.has_early_stop:
+            disk += int(np.prod(saved_dims)) * 16
+            memory += int(np.prod(saved_dims)) * 16
+
+        if self.runinfo.pipeline or self.runinfo.async_save:
+            time_per_point = max(point_time, save_time)
+        else:
+            time_per_point = point_time + save_time
+        if self.runinfo.reduce_function is not None:
+            n_workers = self.runinfo.reduce_workers or os.cpu_count() or 1
+            time_per_point = max(time_per_point, reduce_time / n_workers)
+        wall_time = wait_time + n_points * time_per_point + self.runinfo.initial_pause
+
+        estimate = ItemAttribute()
+        estimate.n_points = n_points
+        estimate.point_time = point_time
+        estimate.reduce_time = reduce_time
+        estimate.save_time = save_time
+        estimate.wait_time = wait_time
+        estimate.wall_time = wall_time
+        estimate.memory = memory
+        estimate.disk = disk
+        estimate.available_memory = available_memory()
+
+        if (estimate.available_memory is not None) and (memory > estimate.available_memory):
+            warnings.warn('The run needs {:.3g} GB of memory but {:.3g} GB is available, '
+                          'set runinfo.out_of_core = True to keep measured data on disk'.format(
+                              memory / 1e9, estimate.available_memory / 1e9), RuntimeWarning)
+
+        return estimate
+
+    def get_n_points(self):
+        '''
+        Returns the number of points of a run in `ps.ScanSchedule` order, a run with a continuous scan stops after
+        the first point of its n_max-th iteration
+
+        Returns
+        -------
+        int or None
+            None if the run has a continuous scan without n_max
+        '''
+        plan = self.plan
+        schedule = ScanSchedule(plan.lengths, snake=plan.snake)
+        if plan.has_continuous_scan:
+            n_max = plan.scans[plan.continuous_index].n_max
+            if n_max is None:
+                return None
+            return schedule.strides[-1] * (n_max - 1) + 1
+        else:
+            return len(schedule)
+
+    def get_skipped_writes(self):
+        '''
+        Returns the number of writes skipped by write coalescing so far by each device that counts them,
+        see `ps.InstrumentDriver.coalesce_writes`
+
+        Returns
+        -------
+        dict
+        '''
+        return {name: device.n_skipped_writes for name, device in self.devices.items()
+                if hasattr(device, 'n_skipped_writes')}
+
+    def add_hook(self, event, function):
+        '''
+        Registers a function called at a phase of every run, for example to profile, export or analyse data, or
+        to stop the run, without adding work to the measure function. Hooks of an event are called in the order
+        they were added, and an exception raised by a hook ends the run like an exception of the measure function.
+
+        Events and the arguments of their hooks are:
+
+        - 'before_iterate' (expt, indicies, deltas): before the scans are set to each point, indicies and deltas
+          are tuples from scan0 outwards
+        - 'after_measure' (expt, data): after each point is measured
+        - 'after_save' (expt, data, state): after each point is averaged and saved, state is the point state from
+          `get_point_state()`. Called from the saving thread when `runinfo.pipeline` is True.
+        - 'on_line_complete' (expt, state): after the last point of each line of scan0 is saved, from the same
+          thread as 'after_save'
+        - 'on_stop' (expt): when the run ends because it completed, was stopped, or raised an exception, after the
+          save file is closed
+
+        Parameters
+        ----------
+        event : str
+            One of 'before_iterate', 'after_measure', 'after_save', 'on_line_complete' or 'on_stop'
+        function : func
+            Function called with the event's arguments
+
+        Returns
+        -------
+        func
+            `function`
+        '''
+        assert event in HOOKS, 'event must be one of {}'.format(HOOKS)
+        assert callable(function), 'hook must be callable'
+
+        self.hooks[event].append(function)
+        return function
+
+    def remove_hook(self, event, function):
+        '''
+        Removes a function registered with `add_hook()`
+
+        Parameters
+        ----------
+        event : str
+            Event the function was registered for
+        function : func
+            The registered function
+        '''
+        assert event in HOOKS, 'event must be one of {}'.format(HOOKS)
+        assert function in self.hooks[event], 'function is not a {} hook'.format(event)
+
+        self.hooks[event].remove(function)
+
+    def get_executor(self):
+        '''
+        Returns the thread pool used by concurrent scans, created on first use with
+        `self.runinfo.max_workers` threads and shut down at the end of the run
+
+        Returns
+        -------
+        concurrent.futures.ThreadPoolExecutor
+        '''
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.runinfo.max_workers)
+        return self.executor
+
+    def get_save_name(self):
+        '''
+        Returns the absolute path of the hdf5 save file as a string
+        '''
+        save_path = self.runinfo.data_path / '{}.hdf5'.format(self.runinfo.file_name)
+        return str(save_path.absolute())
+
+    def open_writer(self):
+        '''
+        Returns a context manager for writing to the save file. While the experiment is running this is
+        the open run writer, otherwise the file is opened and then closed when the context exits.
+
+        Returns
+        -------
+        context manager yielding a ps.RunWriter
+        '''
+        if (self.writer is not None) and self.writer.is_open:
+            return nullcontext(self.writer)
+        else:
+            return RunWriter(self.get_save_name())
+
+    def open_reader(self):
+        '''
+        Returns a context manager for reading the save file. While the experiment is running this is the open
+        run writer, otherwise the file is opened read-only and then closed when the context exits.
+
+        Returns
+        -------
+        context manager yielding a ps.RunWriter or h5py.File
+        '''
+        if (self.writer is not None) and self.writer.is_open:
+            return nullcontext(self.writer)
+        else:
+            return h5py.File(self.get_save_name(), 'r')
+
     # Data methods
     def preallocate(self, data):
         '''
@@ -168,88 +732,320 @@ class Experiment(ItemAttribute):
         for key, value in data.items():
             self.runinfo.measured.append(key)
 
-        # get the file save path name
-        save_path = self.runinfo.data_path / '{}.hdf5'.format(self.runinfo.file_name)
-        save_name = str(save_path.absolute())
-
         # Create and save scan arrays
-        with h5py.File(save_name, 'a') as f:
-            for s in self.runinfo.scans:
+        with self.open_writer() as f:
+            for s in self.plan.scans:
                 for key, values in s.scan_dict.items():
                     self[key] = values
+                    values = np.asarray(values)
                     if key == 'iteration':
-                        f.create_dataset(key, shape=values.shape, maxshape=(None,), chunks=(100, ),)
+                        f.create_dataset(key, shape=values.shape, maxshape=(None,), chunks=(100, ), dtype=values.dtype)
                     else:
-                        f.create_dataset(key, shape=values.shape, maxshape=values.shape, chunks=values.shape,)
+                        f.create_dataset(key, shape=values.shape, maxshape=values.shape, chunks=values.shape,
+                                         dtype=values.dtype)
                     f[key][:] = values
 
+            # completed-point bitmap over every scan axis, including the average scan, used by resume()
+            if self.runinfo.checkpoint:
+                dims = self.plan.dims
+                f.create_dataset('checkpoint/completed', shape=dims, maxshape=tuple(None for _ in dims),
+                                 chunks=chunk_shape(dims, itemsize=1, target_bytes=self.runinfo.chunk_bytes),
+                                 dtype='bool')
+
+            # time of each point in seconds since start_time, its lateness relative to the scans' dt deadlines,
+            # and the time spent waiting for the scans' settle conditions
+            if self.runinfo.save_timing:
+                dims = self.plan.dims
+                for key in ['timing/timestamp', 'timing/jitter', 'timing/settle_time']:
+                    f.create_dataset(key, shape=dims, maxshape=tuple(None for _ in dims),
+                                     chunks=chunk_shape(dims, itemsize=8, target_bytes=self.runinfo.chunk_bytes),
+                                     fillvalue=np.nan, dtype='float64')
+                # durations of the phases of each point, iterate has one value per scan level and is NaN for
+                # the levels that did not move
+                for key in ['timing/iterate', 'timing/measure', 'timing/average', 'timing/save']:
+                    if key == 'timing/iterate':
+                        data_shape = (len(self.plan.scans),)
+                    else:
+                        data_shape = ()
+                    shape = (*dims, *data_shape)
+                    f.create_dataset(key, shape=shape, maxshape=tuple(None for _ in shape),
+                                     chunks=chunk_shape(dims, data_shape, itemsize=4,
+                                                        target_bytes=self.runinfo.chunk_bytes),
+                                     fillvalue=np.nan, dtype='float32')
+                if self.start_time is not None:
+                    f['timing'].attrs['start_time'] = self.start_time
+
+            # number of repeats and standard error of each saved point of an early stopping average scan
+            if self.plan.has_early_stop:
+                self.convergence = ItemAttribute()
+                saved_dims = self.plan.saved_dims
+                for key, dtype, fill in [('count', 'int64', 0), ('stderr', 'float64', np.nan)]:
+                    self.convergence[key] = np.full(saved_dims, fill, dtype=dtype)
+                    f.create_dataset('convergence/' + key, shape=saved_dims, maxshape=tuple(None for _ in saved_dims),
+                                     chunks=chunk_shape(saved_dims, itemsize=8, target_bytes=self.runinfo.chunk_bytes),
+                                     fillvalue=fill, dtype=dtype)
+
         # Get dimensions based off of averaging or not
-        if self.runinfo.average_index == -1:
-            scan_dims = self.runinfo.dims
-            ndim = self.runinfo.ndim
-        else:
-            scan_dims = self.runinfo.average_dims
-            ndim = self.runinfo.n_average_dim
+        scan_dims = self.plan.saved_dims
+        ndim = self.plan.n_saved_dim
 
         # Initialize the data arrays
-        with h5py.File(save_name, 'a') as f:
+        with self.open_writer() as f:
             for name in self.runinfo.measured:
+                dtype = self.get_dtype(name, data[name])
+                fill = fill_value(dtype)
                 # array of data, at least one non average scan
                 if is_list_type(data[name]) and ndim > 0:
-                    dims = (*scan_dims, * np.array(data[name]).shape)
-                    self[name] = np.zeros(dims) * np.nan
-                    maxshape = tuple(None for _ in dims)
-                    f.create_dataset(name, shape=dims, maxshape=maxshape, chunks=dims,
-                                     fillvalue=np.nan, dtype='float64')
+                    saved_scan_dims, data_shape = scan_dims, np.array(data[name]).shape
                 # single data point, at least on non average scan
                 elif (not is_list_type(data[name])) and (ndim > 0):
-                    dims = scan_dims
-                    self[name] = np.zeros(dims) * np.nan
-                    maxshape = tuple(None for _ in dims)
-                    f.create_dataset(name, shape=dims, maxshape=maxshape, chunks=dims,
-                                     fillvalue=np.nan, dtype='float64')
+                    saved_scan_dims, data_shape = scan_dims, ()
                 # data is an array, but there are no scan dimension other than average
                 elif is_list_type(data[name]) and (ndim == 0):
-                    dims = np.array(data[name]).shape
-                    self[name] = np.zeros(dims) * np.nan
-                    maxshape = tuple(None for _ in dims)
-                    f.create_dataset(name, shape=dims, maxshape=maxshape, chunks=dims,
-                                     fillvalue=np.nan, dtype='float64')
+                    saved_scan_dims, data_shape = (), np.array(data[name]).shape
                 # data is a single point, but there are no scan dimensions other than average
                 else:
-                    self[name] = np.nan
+                    self[name] = fill
                     f.create_dataset(name, shape=[1, ], maxshape=(None,), chunks=(1,),
-                                     fillvalue=np.nan, dtype='float64')
+                                     fillvalue=fill, dtype=dtype, **self.get_storage_options(name))
+                    continue
+
+                dims = (*saved_scan_dims, *data_shape)
+                maxshape = tuple(None for _ in dims)
+                chunks = self.get_chunks(name, saved_scan_dims, data_shape, dtype.itemsize)
+                f.create_dataset(name, shape=dims, maxshape=maxshape, chunks=chunks,
+                                 fillvalue=fill, dtype=dtype, **self.get_storage_options(name))
+
+                if self.runinfo.out_of_core:
+                    self[name] = DatasetView(self, name)
+                else:
+                    self[name] = np.full(dims, fill, dtype=dtype)
+
+        # continuous scans grow along the last saved scan axis
+        self.buffers = {}
+        if self.plan.has_continuous_scan and (not self.runinfo.out_of_core):
+            for name in self.runinfo.measured:
+                self.buffers[name] = GrowableArray(self[name], axis=self.plan.continuous_axis)
+                self[name] = self.buffers[name].view
+
+    def get_dtype(self, name, value):
+        '''
+        Returns the data type used to store measured data `name`, either from `self.runinfo.dtypes`
+        or inferred from its first measured `value`.
+
+        numpy arrays and numpy scalars keep their dtype, so uint16 camera frames or integer counts are
+        not upcast. Python numbers and lists are stored as float64, or complex128 if complex. Integer
+        data is stored as float64 when there is an average scan.
+
+        Parameters
+        ----------
+        name : str
+            Name of the measured data
+        value :
+            First value of the measured data returned by `self.runinfo.measure_function`
+
+        Returns
+        -------
+        numpy.dtype
+        '''
+        if name in self.runinfo.dtypes:
+            return np.dtype(self.runinfo.dtypes[name])
+
+        if isinstance(value, (np.ndarray, np.generic)):
+            dtype = value.dtype
+        elif np.iscomplexobj(value):
+            dtype = np.dtype('complex128')
+        else:
+            dtype = np.dtype('float64')
+
+        # averages of integer or boolean data are not integers
+        if self.plan.has_average_scan and (dtype.kind in 'iub'):
+            dtype = np.dtype('float64')
+
+        return dtype
+
+    def get_storage_options(self, name):
+        '''
+        Returns the hdf5 filter and chunk cache keyword arguments for measured dataset `name`, combining
+        `self.runinfo.storage_options['default']` with `self.runinfo.storage_options[name]`.
+
+        If a compression is chosen without options, gzip defaults to level 1 and the shuffle filter is
+        turned on, which keeps pace with acquisition for most detectors.
+
+        Parameters
+        ----------
+        name : str
+            Name of the measured data
+
+        Returns
+        -------
+        dict
+            keyword arguments for `h5py.File.create_dataset`
+        '''
+        options = dict(self.runinfo.storage_options.get('default', {}))
+        options.update(self.runinfo.storage_options.get(name, {}))
+
+        if options.get('compression', None) is not None:
+            options.setdefault('shuffle', True)
+            if options['compression'] == 'gzip':
+                options.setdefault('compression_opts', 1)
+        if 'chunk_cache' in options:
+            options['rdcc_nbytes'] = options.pop('chunk_cache')
+
+        return options
+
+    def get_chunks(self, name, scan_dims, data_shape=(), itemsize=8):
+        '''
+        Returns the hdf5 chunk shape for measured dataset `name`, either from `self.runinfo.chunks`
+        or from :func:`pyscan.general.chunk_shape.chunk_shape` bounded to `self.runinfo.chunk_bytes`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the measured data
+        scan_dims : tuple
+            Length of each saved scan axis
+        data_shape : tuple, optional
+            Shape of a single measured point, defaults to ()
+        itemsize : int, optional
+            Number of bytes of one element, defaults to 8
+
+        Returns
+        -------
+        tuple
+        '''
+        if name in self.runinfo.chunks:
+            return tuple(self.runinfo.chunks[name])
+
+        scan_dims = list(scan_dims)
+        # a continuous scan is always the last scan, if it is the only saved axis it is also the innermost
+        # and grows, so chunk it as if it held n_max (or 100) points
+        if self.plan.has_continuous_scan and (len(scan_dims) == 1):
+            n_max = self.plan.scans[self.plan.continuous_index].n_max
+            scan_dims[0] = 100 if n_max is None else n_max
+
+        return chunk_shape(scan_dims, data_shape, itemsize=itemsize, target_bytes=self.runinfo.chunk_bytes)
 
     def reallocate(self, data):
         '''
         Reallocates memory for continuous experiments save files and measurement attribute arrays.
+        Each measured array grows by one fill value row along the continuous scan axis, using
+        amortized in-memory buffers and hdf5 datasets that grow by doubling and are trimmed at the end of the run.
 
         Parameters
         ----------
         data : ItemAttribute
             ItemAttribute instance containing data from self.runinfo.measure_function
         '''
-        save_path = self.runinfo.data_path / '{}.hdf5'.format(self.runinfo.file_name)
-        save_name = str(save_path.absolute())
 
-        with h5py.File(save_name, 'a') as f:
-            continuous_n = self.runinfo.scans[-1].n
-            f['iteration'].resize((continuous_n,))
-            self['iteration'] = self.runinfo.scans[-1].scan_dict['iteration']
-            f['iteration'][-1] = self.runinfo.scans[-1].scan_dict['iteration'][-1]
+        continuous_scan = self.plan.scans[self.plan.continuous_index]
+        continuous_n = continuous_scan.n
+
+        with self.open_writer() as f:
+            f.resize('iteration', continuous_n)
+            self['iteration'] = continuous_scan.scan_dict['iteration']
+            f['iteration'][continuous_n - 1] = self['iteration'][-1]
+
+            for key in self.get_point_keys():
+                f.resize(key, continuous_n, axis=self.plan.continuous_index)
+
+            axis = self.plan.continuous_axis
 
             for name in self.runinfo.measured:
-                if is_list_type(data[name]):
-                    f[name].resize(tuple((*self.runinfo.dims, *np.array(data[name]).shape)))
-                    f[name][-1] = data[name]
-                    self[name] = append_stack_or_contact(self[name], data[name])
+                if isinstance(self[name], DatasetView):
+                    self[name].resize(continuous_n, axis=axis)
                 else:
-                    f[name].resize(self.runinfo.dims)
-                    f[name][-1] = data[name]
-                    self[name] = append_stack_or_contact(self[name], data[name])
+                    buffer = self.buffers[name]
+                    self[name] = buffer.append(fill_value(buffer.dtype))
+                    f.resize(name, continuous_n, axis=axis)
+
+    def get_point_state(self):
+        '''
+        Returns the scan indicies and timing of the current point, used to average and save it after the
+        scans have moved on to the next point
+
+        Returns
+        -------
+        ItemAttribute
+            with the items indicies, saved_indicies, average_i (number of points already averaged, 0 without an
+            average scan), end_of_line, point_time and settle_time, and with an early stopping average scan
+            average_count, average_stderr and converged. With `runinfo.save_timing` it also has the phase
+            durations iterate_time, measure_time and average_time, which is set by `process_point()`.
+        '''
+        plan = self.plan
+        scan0 = plan.scans[0]
+
+        state = ItemAttribute()
+        state.indicies = plan.indicies()
+        state.saved_indicies = plan.saved_indicies()
+        if plan.has_average_scan:
+            state.average_i = plan.scans[plan.average_index].i
+        else:
+            state.average_i = 0
+        # a serpentine scan0 ends its reversed lines at index 0
+        if self.line_direction == 1:
+            state.end_of_line = scan0.i == scan0.n - 1
+        else:
+            state.end_of_line = scan0.i == 0
+        state.point_time = self.point_time
+        state.settle_time = self.settle_time
+        if self.runinfo.save_timing:
+            # points saved outside of a run have no iterate times
+            if len(self.iterate_time) == len(plan.scans):
+                state.iterate_time = self.iterate_time
+            else:
+                state.iterate_time = [np.nan for _ in plan.scans]
+            state.measure_time = self.measure_time
+            state.average_time = np.nan
+        if plan.has_early_stop:
+            average_scan = plan.scans[plan.average_index]
+            state.average_count = average_scan.count
+            state.average_stderr = average_scan.stderr
+            state.converged = average_scan.converged
+            # the average scan is scan0, so a converged point ends the line before its last repeat
+            if average_scan.converged:
+                state.end_of_line = True
+        return state
+
+    def process_point(self, data, state=None):
+        '''
+        Averages and saves a measured point, and switches the save file to swmr mode after the first point
+        if `runinfo.swmr` is True. Runs in a background thread when `runinfo.pipeline` is True.
+
+        Parameters
+        ----------
+        data : ItemAttribute
+            ItemAttribute instance containing data from self.runinfo.measure_function
+        state : ItemAttribute, optional
+            Point state from `get_point_state()`, defaults to the state of the current point
+        '''
+        if state is None:
+            state = self.get_point_state()
+
+        if self.plan.has_average_scan:
+            average_start = self.clock.now()
+            self.rolling_average(data, state)
+            average_time = self.clock.now() - average_start
+            self.progress.add_time('average', average_time)
+            if self.runinfo.save_timing:
+                state.average_time = average_time
+
+        self.save_point(data, state)
+
+        if self.hooks['after_save']:
+            for hook in self.hooks['after_save']:
+                hook(self, data, state)
+        if state.end_of_line and self.hooks['on_line_complete']:
+            for hook in self.hooks['on_line_complete']:
+                hook(self, state)
+
+        # all datasets and attributes exist once the first point is saved
+        if self.runinfo.swmr and (not self.writer.file.swmr_mode):
+            if isinstance(self.writer, AsyncRunWriter):
+                self.writer.join()
+            self.writer.start_swmr()
 
-    def rolling_average(self, data):
+    def rolling_average(self, data, state=None):
         '''
         Does a rolling average of newly measured data
 
@@ -257,56 +1053,277 @@ class Experiment(ItemAttribute):
         ----------
         data :
             ItemAttribute instance of newly measured data point
+        state : ItemAttribute, optional
+            Point state from `get_point_state()`, defaults to the state of the current point
         '''
+        if state is None:
+            state = self.get_point_state()
+
+        # number of points already averaged at the current indicies
+        n = state.average_i
+        indicies = state.saved_indicies
+
         for key, value in data.items():
 
-            # two cases: 1. self[key] is a list 2. self[key] is not a list
-            if is_list_type(self[key]):
+            # two cases: 1. self[key] is an array or dataset view 2. self[key] is not a list
+            if isinstance(self[key], (np.ndarray, DatasetView)):
                 if is_list_type(value):
-                    value = np.array(value).astype(float)
+                    value = np.asarray(value)
 
-                if self.runinfo.average_index == 0:
-                    self[key][self.runinfo.average_indicies] = value
+                if n == 0:
+                    self[key][indicies] = value
                 else:
-                    self[key][self.runinfo.average_indicies] *= (
-                        self.runinfo.average_index / (self.runinfo.average_index + 1))
-                    self[key][self.runinfo.average_indicies] += (
-                        value / (self.runinfo.average_index + 1))
+                    self[key][indicies] *= (n / (n + 1))
+                    self[key][indicies] += (value / (n + 1))
             else:
-                if self.runinfo.average_index == 0:
+                if n == 0:
                     self[key] = value
 
                 else:
-                    self[key] *= (
-                        self.runinfo.average_index / (self.runinfo.average_index + 1))
-                    self[key] += (
-                        value / (self.runinfo.average_index + 1))
+                    self[key] *= (n / (n + 1))
+                    self[key] += (value / (n + 1))
 
-    def save_point(self, data):
+    def save_point(self, data, state=None):
         '''
         Saves single point of data for current scan indicies. Does not return anything.
+
+        Parameters
+        ----------
+        data : ItemAttribute
+            ItemAttribute instance containing data from self.runinfo.measure_function
+        state : ItemAttribute, optional
+            Point state from `get_point_state()`, defaults to the state of the current point
         '''
 
-        save_path = self.runinfo.data_path / '{}.hdf5'.format(self.runinfo.file_name)
-        save_name = str(save_path.absolute())
+        if state is None:
+            state = self.get_point_state()
+
+        save_start = self.clock.now()
+
+        plan = self.plan
+        indicies = state.saved_indicies
+        point_indicies = state.indicies
+
+        # with an average scan, the in memory data is already updated by rolling_average
+        if not plan.has_average_scan:
+            for key, value in data.items():
+                if isinstance(self[key], (np.ndarray, DatasetView)):
+                    self[key][indicies] = value
+                else:
+                    self[key] = value
+
+        point = []
+        for key in self.runinfo.measured:
+            # dataset views are written straight through
+            if isinstance(self[key], DatasetView):
+                continue
+            elif is_list_type(self[key]):
+                point.append((key, (*indicies, ...), self[key][*indicies, ...]))
+            else:
+                point.append((key, slice(None), self[key]))
+
+        # values chosen by adaptive scans are saved with each point
+        for key in plan.adaptive_keys:
+            point.append((key, point_indicies, self[key][point_indicies]))
+
+        if plan.has_early_stop:
+            self.convergence.count[indicies] = state.average_count
+            self.convergence.stderr[indicies] = state.average_stderr
+            point.append(('convergence/count', indicies, state.average_count))
+            point.append(('convergence/stderr', indicies, state.average_stderr))
+
+        # the completed-point bitmap is written a line of scan0 at a time, and at each flush so that it is on
+        # disk with the points it marks
+        if self.runinfo.checkpoint and plan.has_early_stop and state.converged:
+            # the skipped repeats of a converged point are completed too, the average scan is scan0
+            completed = [('checkpoint/completed', (i, *point_indicies[1:]), True)
+                         for i in range(point_indicies[0], plan.dims[0])]
+        elif self.runinfo.checkpoint:
+            completed = [('checkpoint/completed', point_indicies, True)]
+
+        # timing is written a line of scan0 at a time instead of with each point
+        if self.runinfo.save_timing:
+            timestamp, jitter = state.point_time
+            timing = [('timing/timestamp', point_indicies, timestamp),
+                      ('timing/jitter', point_indicies, jitter),
+                      ('timing/settle_time', point_indicies, state.settle_time),
+                      ('timing/iterate', point_indicies, state.iterate_time),
+                      ('timing/measure', point_indicies, state.measure_time),
+                      ('timing/average', point_indicies, state.average_time)]
+            # the save time of a point is only known once it is saved, so it is buffered with the next point
+            if self.last_save is not None:
+                timing.append(self.last_save)
+
+        with self.open_writer() as f:
+            if self.runinfo.checkpoint:
+                f.buffer_values(completed, on_flush=True)
+            f.write_point(point, indicies, state.end_of_line)
+            if self.runinfo.save_timing:
+                f.buffer_values(timing)
+
+        save_time = self.clock.now() - save_start
+        self.progress.add_time('save', save_time)
+        if self.runinfo.save_timing:
+            self.last_save = ('timing/save', point_indicies, save_time)
+
+    def load_checkpoint(self):
+        '''
+        Restores an interrupted run from the open save file. The run continues from the first point, in
+        `ps.ScanSchedule` order, that is not set in the completed-point bitmap, so points missing after other
+        saved points are measured again rather than skipped. The measured
+        names, measured data, and continuous scan iterations are loaded, and continuous scan arrays are sized to
+        include the next iteration.
 
-        if self.runinfo.has_average_scan:
-            indicies = self.runinfo.average_indicies
+        Returns
+        -------
+        int or None
+            Number of the first unmeasured point in the schedule, None if the run was already complete
+        '''
+
+        f = self.writer
+
+        assert 'checkpoint' in f, 'The save file has no checkpoint, it cannot be resumed'
+        completed = f['checkpoint/completed']
+
+        plan = self.plan
+        schedule = ScanSchedule(plan.lengths, snake=plan.snake)
+        if plan.has_continuous_scan:
+            assert completed.shape[:-1] == plan.dims[:-1], 'Save file scan dimensions do not match runinfo'
         else:
-            indicies = self.runinfo.indicies
+            assert completed.shape == plan.dims, 'Save file scan dimensions do not match runinfo'
 
-        for key, value in data.items():
-            if is_list_type(self[key]):
-                self[key][indicies] = value
+        # points can be saved out of schedule order, so count up to the first point that is not completed
+        done = completed[()]
+        n_completed = schedule.first_missing(done)
+        assert n_completed > 0, 'No points were saved before the run was interrupted, start a new run instead'
+
+        if plan.has_continuous_scan:
+            # a continuous scan stops after the first point of its n_max-th iteration
+            n_max = plan.scans[plan.continuous_index].n_max
+            is_complete = (n_max is not None) and (n_completed > schedule.strides[-1] * (n_max - 1))
+        else:
+            is_complete = n_completed >= len(schedule)
+
+        f.n_points = int(np.count_nonzero(done))
+
+        if self.runinfo.save_timing:
+            assert 'timing' in f, 'The save file has no timing datasets, resume with runinfo.save_timing = False'
+            self.start_time = f['timing'].attrs.get('start_time', None)
+        else:
+            self.start_time = None
+
+        scan_names = []
+        for scan in plan.scans:
+            for key, values in scan.scan_dict.items():
+                if key in plan.adaptive_keys:
+                    scan.scan_dict[key] = f[key][()]
+                    values = scan.scan_dict[key]
+                self[key] = values
+                scan_names.append(key)
+
+        self.runinfo.measured = [key for key, value in f.file.items()
+                                 if isinstance(value, h5py.Dataset) and (key not in scan_names)]
+
+        ndim = plan.n_saved_dim
+
+        if plan.has_continuous_scan:
+            # number of continuous iterations held in memory, including the one about to be measured,
+            # which is appended when the continuous scan iterates
+            if is_complete:
+                n = n_max
+                n_iterated = n_max
+            else:
+                n = schedule.point(n_completed)[-1] + 1
+                n_iterated = n - 1
+            axis = plan.continuous_axis
+
+            scan = plan.scans[plan.continuous_index]
+            scan._iterations = GrowableArray(f['iteration'][:n_iterated])
+            scan.scan_dict['iteration'] = scan._iterations.view
+            self['iteration'] = scan._iterations.view
+            f.resize('iteration', n)
+            f['iteration'][n - 1] = n - 1
+            for key in self.get_point_keys():
+                f.resize(key, n, axis=plan.continuous_index)
+
+        self.buffers = {}
+        for name in self.runinfo.measured:
+            dataset = f[name]
+            # single data point with no scan dimensions other than average
+            if (ndim == 0) and (dataset.shape == (1,)):
+                self[name] = dataset[0]
+            elif self.runinfo.out_of_core:
+                self[name] = DatasetView(self, name)
+                if plan.has_continuous_scan:
+                    self[name].resize(n, axis=axis)
+            elif plan.has_continuous_scan:
+                index = (*[slice(None) for _ in range(axis)], slice(0, n))
+                self.buffers[name] = GrowableArray(dataset[index], axis=axis)
+                while self.buffers[name].n < n:
+                    self.buffers[name].append(fill_value(dataset.dtype))
+                self[name] = self.buffers[name].view
+                f.resize(name, n, axis=axis)
             else:
-                self[key] = value
+                self[name] = dataset[()]
+
+        if plan.has_early_stop:
+            self.convergence = ItemAttribute()
+            self.convergence.count = f['convergence/count'][()]
+            self.convergence.stderr = f['convergence/stderr'][()]
+
+            # a point interrupted between repeats continues from its saved mean and standard error
+            if not is_complete:
+                indicies = schedule.point(n_completed)
+                if indicies[0] > 0:
+                    average_scan = plan.scans[plan.average_index]
+                    saved_indicies = indicies[1:]
+                    mean = np.asarray(self[average_scan.measured])[saved_indicies]
+                    average_scan.restore(self.convergence.count[saved_indicies], mean,
+                                         self.convergence.stderr[saved_indicies])
+
+        if is_complete:
+            return None
+        else:
+            return n_completed
+
+    def get_point_keys(self):
+        '''
+        Returns the names of the datasets saved with every point over all scan axes, including the average scan
 
-        with h5py.File(save_name, 'a') as f:
-            for key in self.runinfo.measured:
-                if is_list_type(self[key]):
-                    f[key][*indicies, ...] = self[key][*indicies, ...]
+        Returns
+        -------
+        list
+        '''
+        keys = []
+        if self.runinfo.checkpoint:
+            keys.append('checkpoint/completed')
+        if self.runinfo.save_timing:
+            keys += ['timing/timestamp', 'timing/jitter', 'timing/settle_time',
+                     'timing/iterate', 'timing/measure', 'timing/average', 'timing/save']
+        return keys
+
+    def load_timing(self):
+        '''
+        Loads the datasets and attributes of the 'timing' group of the save file, as dataset views if
+        `runinfo.out_of_core` is True
+
+        Returns
+        -------
+        ItemAttribute or None
+            None if no point was saved
+        '''
+        timing = ItemAttribute()
+        with self.open_reader() as f:
+            if 'timing' not in f:
+                return None
+            for key, value in f['timing'].attrs.items():
+                timing[key] = value
+            for key in f['timing'].keys():
+                if self.runinfo.out_of_core:
+                    timing[key] = DatasetView(self, 'timing/' + key)
                 else:
-                    f[key][:] = self[key]
+                    timing[key] = f['timing/' + key][()]
+        return timing
 
     def save_metadata(self, metadata_name):
         '''
@@ -317,10 +1334,7 @@ class Experiment(ItemAttribute):
         metadata_name : str
             Name of the metadata to be saved, ex. "runinfo", "devices"
         '''
-        save_path = self.runinfo.data_path / '{}.hdf5'.format(self.runinfo.file_name)
-        save_name = str(save_path.absolute())
-
-        with h5py.File(save_name, 'a') as f:
+        with self.open_writer() as f:
             f.attrs[metadata_name] = json.dumps(self[metadata_name], cls=PyscanJSONEncoder)
 
     def start_thread(self):
@@ -1,12 +1,14 @@
 import h5py
 import pickle
 import json
+import numpy as np
 from pathlib import Path
 from itemattribute import ItemAttribute
 from .pyscan_json_decoder import PyscanJSONDecoder
+from .progress import Progress
 
 
-def load_experiment(file_name):
+def load_experiment(file_name, follow=False):
     '''
     Function to load experimental data created by pyscan
 
@@ -14,6 +16,10 @@ def load_experiment(file_name):
     ----------
     file_name : str
         Path to file that is to be loaded
+    follow : bool, optional
+        If True, the file is opened in hdf5 single-writer/multiple-reader mode and kept open, and a
+        `FollowedExperiment` is returned whose `refresh()` method reads only the newly written region
+        of a running experiment saved with `runinfo.swmr = True`. Defaults to False.
 
     '''
     if '.pkl' in file_name:
@@ -47,10 +53,13 @@ def load_experiment(file_name):
         data = h5py.File('{}.hdf5'.format(file_name), 'r')
         with h5py.File('{}.hdf5'.format(file_name), 'r') as f:
             for key, value in data.items():
-                expt[key] = (f[key][:]).astype('float64')
+                expt[key] = f[key][:]
 
         return expt
 
+    elif (data_version == 0.2) and follow:
+        return FollowedExperiment(file_name)
+
     elif data_version == 0.2:
         expt = ItemAttribute()
         expt.runinfo = ItemAttribute()
@@ -61,15 +70,53 @@ def load_experiment(file_name):
 
         expt.devices = json.loads(f.attrs['devices'], cls=PyscanJSONDecoder)
 
+        if 'skipped_writes' in f.attrs:
+            expt.skipped_writes = json.loads(f.attrs['skipped_writes'])
+
+        if 'progress' in f.attrs:
+            expt.progress = load_progress(f.attrs)
+
         for key, value in f.items():
-            expt[key] = (f[key][:]).astype('float64')
-        all_datasets = [key for key in f.keys()]
+            if isinstance(value, h5py.Dataset):
+                expt[key] = value[:]
+        all_datasets = [key for key, value in f.items() if isinstance(value, h5py.Dataset)]
         expt.runinfo.measured = find_measured_datasets(expt.runinfo, all_datasets)
+
+        # per point timing saved when runinfo.save_timing is True, and per point repeats and standard errors
+        # of an average scan with target_stderr
+        for group in ['timing', 'convergence']:
+            if group in f:
+                expt[group] = ItemAttribute()
+                for key, value in f[group].items():
+                    expt[group][key] = value[()]
+                for key, value in f[group].attrs.items():
+                    expt[group][key] = value
         f.close()
 
         return expt
 
 
+def load_progress(attrs):
+    '''
+    Returns the progress mirrored in the 'progress' attribute of a save file by the run writer, see `ps.Progress`
+
+    Parameters
+    ----------
+    attrs : h5py.AttributeManager
+        Attributes of the save file
+
+    Returns
+    -------
+    ItemAttribute
+        with the items of `ps.Progress.FIELDS`
+    '''
+    fields = attrs.get('progress_fields', Progress.FIELDS)
+    progress = ItemAttribute()
+    for field, value in zip(fields, attrs['progress']):
+        progress[str(field)] = float(value)
+    return progress
+
+
 def find_measured_datasets(runinfo, all_datasets):
     """
     HDF5 files contain two types of datasets.  Measured datasets are data from
@@ -111,3 +158,114 @@ def find_measured_datasets(runinfo, all_datasets):
     measured = set(all_datasets).symmetric_difference(generated)
 
     return list(measured)
+
+
+class FollowedExperiment(ItemAttribute):
+    '''
+    Experiment data loaded from a file that is still being written in hdf5 single-writer/multiple-reader
+    mode. Returned by `load_experiment(file_name, follow=True)`.
+
+    Parameters
+    ----------
+    file_name : str
+        Path to the hdf5 file
+
+    Attributes
+    ----------
+    runinfo : ItemAttribute
+        The saved runinfo
+    devices : ItemAttribute
+        The saved devices
+    n_points : int
+        Number of saved points as of the last refresh
+    last_index : tuple
+        Saved indicies of the last point as of the last refresh
+    progress : ItemAttribute
+        Progress of the run as of the last refresh, see `ps.Progress`, None if no point was saved
+
+    Methods
+    -------
+    refresh()
+    close()
+    '''
+
+    def __init__(self, file_name):
+        '''
+        Constructor method
+        '''
+
+        self._file = h5py.File(file_name, 'r', libver='latest', swmr=True)
+
+        self.runinfo = json.loads(self._file.attrs['runinfo'], cls=PyscanJSONDecoder)
+        self.devices = json.loads(self._file.attrs['devices'], cls=PyscanJSONDecoder)
+
+        # read the progress before the data, so that the next refresh covers anything written in between
+        self.n_points = int(self._file.attrs.get('n_points', 0))
+        self.last_index = tuple(int(i) for i in self._file.attrs.get('last_index', ()))
+        self.progress = load_progress(self._file.attrs) if 'progress' in self._file.attrs else None
+        if len(self.last_index) > 0:
+            self._outer_index = self.last_index[-1]
+        else:
+            self._outer_index = 0
+
+        for key, value in self._file.items():
+            if isinstance(value, h5py.Dataset):
+                self[key] = value[:]
+        all_datasets = [key for key, value in self._file.items() if isinstance(value, h5py.Dataset)]
+        self.runinfo.measured = find_measured_datasets(self.runinfo, all_datasets)
+
+    def refresh(self):
+        '''
+        Reads the points saved since the last refresh. Only the slab of the outermost saved scan axis
+        between the previous and the current last index is read from measured datasets. Other datasets
+        are only read if their shape changed.
+
+        Returns
+        -------
+        bool
+            True if new points were read
+        '''
+
+        if 'n_points' not in self._file.attrs:
+            return False
+
+        n_points = int(self._file.attrs['n_points'])
+        if n_points == self.n_points:
+            return False
+
+        last_index = tuple(int(i) for i in self._file.attrs['last_index'])
+        if 'progress' in self._file.attrs:
+            self.progress = load_progress(self._file.attrs)
+
+        for key, dataset in self._file.items():
+            if not isinstance(dataset, h5py.Dataset):
+                continue
+            dataset.refresh()
+
+            if (key not in self.runinfo.measured) or (len(last_index) == 0):
+                if dataset.shape != np.shape(self[key]) or (key in self.runinfo.measured):
+                    self[key] = dataset[:]
+                continue
+
+            if dataset.shape != self[key].shape:
+                array = np.full(dataset.shape, dataset.fillvalue, dtype=dataset.dtype)
+                overlap = tuple(slice(0, min(n, m)) for n, m in zip(dataset.shape, self[key].shape))
+                array[overlap] = self[key][overlap]
+                self[key] = array
+
+            axis = len(last_index) - 1
+            index = (*[slice(None) for _ in range(axis)], slice(self._outer_index, last_index[-1] + 1))
+            self[key][index] = dataset[index]
+
+        self.n_points = n_points
+        self.last_index = last_index
+        if len(last_index) > 0:
+            self._outer_index = last_index[-1]
+
+        return True
+
+    def close(self):
+        '''
+        Closes the hdf5 file
+        '''
+        self._file.close()
@@ -0,0 +1,187 @@
+import numpy as np
+from collections import deque
+from threading import Lock
+from time import perf_counter
+from itemattribute import ItemAttribute
+
+
+class Progress(object):
+    '''
+    Progress of a running experiment: the number of completed points, a moving average of the points per
+    second, the estimated time remaining, and the total time spent in each phase of the run loop. Updated by
+    the experiment thread and by the saving thread when `runinfo.pipeline` is True, and safe to read from any
+    other thread with `snapshot()` or `str()`.
+
+    Points are counted in the order of `ps.ScanSchedule`, so the repeats skipped by an average scan with a target
+    standard error count as completed.
+
+    The run writer mirrors the progress in the array attribute 'progress' of the save file at each flush, with
+    the values of `FIELDS` in order, so that other programs can poll it from the file. Unknown values are NaN.
+
+    Parameters
+    ----------
+    window : int, optional
+        Number of most recent points used for the moving average rate, defaults to 100
+
+    Attributes
+    ----------
+    FIELDS : tuple
+        Names of the values of `to_array()`: n_completed, n_points, elapsed, rate, eta, and the total time in
+        seconds spent in the phases iterate, measure, average and save
+    n_completed : int
+        Number of completed points
+    n_points : int or None
+        Total number of points, None if the run has no end
+    running : bool
+        True between `start()` and `stop()`
+
+    Methods
+    -------
+    start(n_points, n_completed)
+    point_completed(n_completed, iterate_time, measure_time)
+    add_time(phase, dt)
+    stop()
+    snapshot()
+    to_array()
+    '''
+
+    FIELDS = ('n_completed', 'n_points', 'elapsed', 'rate', 'eta', 'iterate', 'measure', 'average', 'save')
+    PHASES = ('iterate', 'measure', 'average', 'save')
+
+    def __init__(self, window=100):
+        '''
+        Constructor method
+        '''
+
+        assert window >= 2, 'window must be >= 2'
+
+        self.window = window
+        self.lock = Lock()
+        self.start()
+        self.running = False
+
+    def __str__(self):
+        state = self.snapshot()
+        if state.n_points is None:
+            text = '{} points'.format(state.n_completed)
+        else:
+            text = '{}/{} points'.format(state.n_completed, state.n_points)
+        if not np.isnan(state.rate):
+            text += ', {:.3g} points/s'.format(state.rate)
+        if not np.isnan(state.eta):
+            minutes, seconds = divmod(int(round(state.eta)), 60)
+            hours, minutes = divmod(minutes, 60)
+            text += ', ETA {}:{:02d}:{:02d}'.format(hours, minutes, seconds)
+        return text
+
+    def start(self, n_points=None, n_completed=0):
+        '''
+        Resets the progress at the start of a run
+
+        Parameters
+        ----------
+        n_points : int, optional
+            Total number of points, defaults to None for a run without an end
+        n_completed : int, optional
+            Number of points completed before the run started, such as the points of a resumed run, defaults to 0
+        '''
+        with self.lock:
+            self.n_points = n_points
+            self.n_completed = n_completed
+            self.origin = perf_counter()
+            self.end = None
+            self.times = deque(maxlen=self.window)
+            self.counts = deque(maxlen=self.window)
+            self.phase_time = {phase: 0.0 for phase in self.PHASES}
+            self.running = True
+
+    def point_completed(self, n_completed, iterate_time=0, measure_time=0):
+        '''
+        Records a completed point from the experiment thread
+
+        Parameters
+        ----------
+        n_completed : int
+            Number of completed points, including this one
+        iterate_time : float, optional
+            Time in seconds spent iterating the scans for this point
+        measure_time : float, optional
+            Time in seconds spent measuring this point
+        '''
+        now = perf_counter()
+        with self.lock:
+            self.n_completed = n_completed
+            self.times.append(now)
+            self.counts.append(n_completed)
+            self.phase_time['iterate'] += iterate_time
+            self.phase_time['measure'] += measure_time
+
+    def add_time(self, phase, dt):
+        '''
+        Adds `dt` seconds to the total time of `phase`, one of 'iterate', 'measure', 'average' or 'save'
+        '''
+        with self.lock:
+            self.phase_time[phase] += dt
+
+    def stop(self):
+        '''
+        Stops the elapsed time at the end of a run
+        '''
+        with self.lock:
+            self.end = perf_counter()
+            self.running = False
+
+    def snapshot(self):
+        '''
+        Returns a consistent copy of the progress
+
+        Returns
+        -------
+        ItemAttribute
+            with the items n_completed, n_points (None without an end), fraction, elapsed (seconds), rate (points
+            per second over the last `window` points), eta (seconds), and phase_time, an ItemAttribute of the total
+            seconds spent in each phase. Values that are not known yet are NaN.
+        '''
+        with self.lock:
+            state = ItemAttribute()
+            state.n_completed = self.n_completed
+            state.n_points = self.n_points
+            if self.end is None:
+                state.elapsed = perf_counter() - self.origin
+            else:
+                state.elapsed = self.end - self.origin
+
+            if len(self.times) >= 2 and (self.times[-1] > self.times[0]):
+                state.rate = (self.counts[-1] - self.counts[0]) / (self.times[-1] - self.times[0])
+            else:
+                state.rate = np.nan
+
+            if self.n_points is None:
+                state.fraction = np.nan
+                state.eta = np.nan
+            else:
+                state.fraction = self.n_completed / self.n_points
+                if self.n_completed >= self.n_points:
+                    state.eta = 0.0
+                elif state.rate > 0:
+                    state.eta = (self.n_points - self.n_completed) / state.rate
+                else:
+                    state.eta = np.nan
+
+            state.phase_time = ItemAttribute()
+            for phase in self.PHASES:
+                state.phase_time[phase] = self.phase_time[phase]
+        return state
+
+    def to_array(self):
+        '''
+        Returns the values of `FIELDS` as a float64 array, mirrored by the run writer in the save file
+
+        Returns
+        -------
+        np.ndarray
+        '''
+        state = self.snapshot()
+        n_points = np.nan if state.n_points is None else state.n_points
+        return np.array([state.n_completed, n_points, state.elapsed, state.rate, state.eta,
+                         *[state.phase_time[phase] for phase in self.PHASES]], dtype='float64')
@@ -2,6 +2,7 @@ import json
 import numpy as np
 from itemattribute import ItemAttribute
 from ..drivers.instrument_driver import InstrumentDriver
+from ..general.growable_array import GrowableArray
 from pyvisa.resources import (
     # FirewireInstrument,
     GPIBInstrument,
@@ -46,7 +47,10 @@ class PyscanJSONEncoder(json.JSONEncoder):
 
         if type(obj) is type:
             return obj.__name__
-        elif isinstance(obj, (InstrumentDriver, ItemAttribute)):
+        elif isinstance(obj, InstrumentDriver):
+            # the values last written to the instrument are run state, not device metadata
+            return {key: value for key, value in obj.__dict__.items() if key != '_written_values'}
+        elif isinstance(obj, ItemAttribute):
             return obj.__dict__
         elif isinstance(obj, (range, tuple)):
             return list(obj)
@@ -56,6 +60,8 @@ class PyscanJSONEncoder(json.JSONEncoder):
             return float(obj)
         elif isinstance(obj, np.ndarray):
             return obj.tolist()
+        elif isinstance(obj, GrowableArray):
+            return obj.view.tolist()
         elif callable(obj):
             return inspect.getsource(obj)
         elif isinstance(obj, (WindowsPath, Path)):
@@ -0,0 +1,212 @@
+import os
+import numpy as np
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from itemattribute import ItemAttribute
+
+
+def reduce_point(reduce_function, values, shared):
+    '''
+    Worker process target of `ReducePool`. Rebuilds the acquired data from plain values and arrays in shared
+    memory, calls `reduce_function` and returns its result as a dict. Arrays of the result that are views of the
+    shared memory are copied, so the shared memory can be reused as soon as the result is returned.
+
+    Parameters
+    ----------
+    reduce_function : func
+        Module level function that takes the acquired data as an ItemAttribute and returns an ItemAttribute
+    values : dict
+        Acquired values sent by pickling
+    shared : dict
+        (shared memory name, shape, dtype) of each acquired array sent through shared memory
+
+    Returns
+    -------
+    dict
+    '''
+    blocks = []
+    data = ItemAttribute()
+    try:
+        for key, value in values.items():
+            data[key] = value
+        for key, (name, shape, dtype) in shared.items():
+            block = shared_memory.SharedMemory(name=name)
+            blocks.append(block)
+            data[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+        reduced = reduce_function(data)
+        result = {}
+        for key, value in reduced.items():
+            if isinstance(value, np.ndarray) and any(np.shares_memory(value, data[k]) for k in shared):
+                value = value.copy()
+            result[key] = value
+        return result
+    finally:
+        # a block cannot be closed while arrays still use its memory
+        data = reduced = value = None
+        for block in blocks:
+            block.close()
+
+
+class ReducePool(object):
+    '''
+    Process pool that runs the reduce step of a split measurement, such as FFTs, fits or image reductions, in
+    worker processes so that it runs in parallel with setting the devices and acquiring the next points. Arrays
+    of at least `shared_bytes` bytes are copied into shared memory blocks that are reused from point to point,
+    other values are pickled. At most `max_in_flight` points are reduced at once, `submit` blocks until the
+    oldest point is reduced when the limit is reached, and results are returned in the order the points were
+    submitted together with the state of their point.
+
+    Parameters
+    ----------
+    reduce_function : func
+        Module level function that takes the acquired data as an ItemAttribute and returns the reduced data as
+        an ItemAttribute. It must be picklable, so it cannot be a lambda or a nested function.
+    max_workers : int, optional
+        Number of worker processes, defaults to None for the number of CPUs
+    max_in_flight : int, optional
+        Maximum number of points submitted and not yet returned by `completed`, defaults to twice the number of
+        worker processes
+    shared_bytes : int, optional
+        Smallest array in bytes sent through shared memory, defaults to 65536
+    start_method : str, optional
+        Start method of the worker processes, 'spawn' or 'forkserver', defaults to None for 'forkserver' where it
+        is available and 'spawn' otherwise. Workers are not forked from the experiment process, which holds open
+        files, instrument connections and threads. The forkserver imports pyscan once, so new workers start quickly.
+
+    Attributes
+    ----------
+    executor : concurrent.futures.ProcessPoolExecutor
+        The worker processes
+    in_flight : collections.deque
+        (future, state, blocks) of each submitted point, oldest first, where blocks is a list of
+        (size in bytes, shared memory block)
+
+    Methods
+    -------
+    submit(data, state)
+    completed(wait)
+    close()
+    '''
+
+    def __init__(self, reduce_function, max_workers=None, max_in_flight=None, shared_bytes=2**16,
+                 start_method=None):
+        '''
+        Constructor method
+        '''
+
+        assert callable(reduce_function), 'reduce_function must be callable'
+        assert (max_in_flight is None) or (max_in_flight >= 1), 'max_in_flight must be >= 1 or None'
+        assert shared_bytes >= 0, 'shared_bytes must be >= 0'
+        assert start_method in [None, 'spawn', 'forkserver'], "start_method must be 'spawn', 'forkserver' or None"
+
+        self.reduce_function = reduce_function
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if start_method is None:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        context = multiprocessing.get_context(start_method)
+        if start_method == 'forkserver':
+            context.set_forkserver_preload([__name__])
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        if max_in_flight is None:
+            max_in_flight = 2 * max_workers
+        self.max_in_flight = max_in_flight
+        self.shared_bytes = shared_bytes
+
+        self.in_flight = deque()
+        # unused shared memory blocks, keyed by size in bytes
+        self.free_blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_block(self, nbytes):
+        '''
+        Returns an unused shared memory block of `nbytes` bytes, created if there is none to reuse
+        '''
+        blocks = self.free_blocks.get(nbytes, [])
+        if len(blocks) > 0:
+            return blocks.pop()
+        return shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+
+    def submit(self, data, state=None):
+        '''
+        Sends acquired data to a worker process to be reduced
+
+        Parameters
+        ----------
+        data : ItemAttribute
+            Data returned by the acquire step
+        state : optional
+            State of the point, returned with its result by `completed`
+        '''
+        values = {}
+        shared = {}
+        blocks = []
+        for key, value in data.items():
+            if isinstance(value, np.ndarray) and (value.nbytes >= self.shared_bytes) and (value.dtype.kind != 'O'):
+                block = self.get_block(value.nbytes)
+                blocks.append((value.nbytes, block))
+                np.ndarray(value.shape, dtype=value.dtype, buffer=block.buf)[...] = value
+                shared[key] = (block.name, value.shape, value.dtype.str)
+            else:
+                values[key] = value
+
+        future = self.executor.submit(reduce_point, self.reduce_function, values, shared)
+        self.in_flight.append((future, state, blocks))
+
+    def completed(self, wait=False):
+        '''
+        Returns the reduced points ready to be saved, in the order they were submitted. Waits for the oldest point
+        while `max_in_flight` points are in flight, and for every point if `wait` is True. Errors raised by the
+        reduce function are raised here.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            If True, waits until every submitted point is reduced, defaults to False
+
+        Returns
+        -------
+        list
+            (reduced data, state) of each point, reduced data is an ItemAttribute
+        '''
+        results = []
+        while len(self.in_flight) > 0:
+            future, state, blocks = self.in_flight[0]
+            if not (wait or future.done() or (len(self.in_flight) >= self.max_in_flight)):
+                break
+            result = future.result()
+            self.in_flight.popleft()
+            for nbytes, block in blocks:
+                self.free_blocks.setdefault(nbytes, []).append(block)
+
+            data = ItemAttribute()
+            for key, value in result.items():
+                data[key] = value
+            results.append((data, state))
+        return results
+
+    def close(self):
+        '''
+        Cancels the points in flight, stops the worker processes and frees the shared memory
+        '''
+        for future, state, blocks in self.in_flight:
+            future.cancel()
+        self.executor.shutdown(wait=True)
+        for future, state, blocks in self.in_flight:
+            for nbytes, block in blocks:
+                self.free_blocks.setdefault(nbytes, []).append(block)
+        self.in_flight.clear()
+
+        for blocks in self.free_blocks.values():
+            for block in blocks:
+                block.close()
+                block.unlink()
+        self.free_blocks = {}
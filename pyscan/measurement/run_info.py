@@ -1,6 +1,6 @@
 from itemattribute import ItemAttribute
 from .get_pyscan_version import get_pyscan_version
-from .scans import PropertyScan, AverageScan, ContinuousScan
+from .scans import PropertyScan, AverageScan, ContinuousScan, AdaptiveScan
 import pyscan as ps
 import re
 import numpy as np
@@ -22,8 +22,71 @@ class RunInfo(ItemAttribute):
         It should accept a ps.Experiment object as its only parameter,
         and returns an ItemAttribute object containing the measured data. The names of the measured data,
         each being an attribute of the return object, will appear as keys of the experiment after it is run.
+    reduce_function : func or None
+        Optional module level function that splits the measurement into an acquire step and a reduce step,
+        defaults to None. `measure_function` then only acquires the raw data on the experiment thread, and
+        `reduce_function` takes the acquired ItemAttribute and returns the ItemAttribute of data to save. It runs
+        in a `ps.ReducePool` of worker processes while the next points are set and acquired, and each point is
+        averaged and saved at its own indicies as its reduction completes, in the order of the points.
+        The reduce function must be picklable, so it cannot be a lambda or a nested function.
+    reduce_workers : int or None
+        Number of worker processes running `reduce_function`, defaults to None for the number of CPUs.
+    reduce_in_flight : int or None
+        Maximum number of acquired points waiting to be reduced and saved. Acquisition waits for the oldest point
+        once the limit is reached. Defaults to None for twice `reduce_workers`.
+    shared_memory_bytes : int
+        Acquired arrays of at least this many bytes are sent to the reduce workers through shared memory instead of
+        being pickled, defaults to 65536.
     initial_pause : float
         Pause before first setting instruments in seconds, defaults to 0.1.
+    flush_interval : int or None
+        Number of saved points between flushes of the save file to disk, defaults to 1.
+        If None, the save file is not flushed based on the number of points.
+    flush_time : float or None
+        Minimum time in seconds between flushes of the save file to disk, checked as each point is saved,
+        defaults to None. Fast measurements can set `flush_interval` to None and flush every few seconds instead.
+    flush_on_line : bool
+        If True, the save file is flushed at the end of each line of the innermost scan (scan0), defaults to False.
+        Whatever the policy, saved points are always flushed when the run completes, is stopped, or raises.
+    chunks : dict
+        Optional hdf5 chunk shape for each measured name, overriding the default chunking policy.
+    chunk_bytes : int
+        Target maximum size in bytes of a default hdf5 chunk, defaults to 1 MiB.
+    dtypes : dict
+        Optional data type for each measured name, overriding the type inferred from the first measurement.
+        With an average scan, the overrides must be float or complex types.
+    storage_options : dict
+        Optional hdf5 storage options for each measured name, with the key 'default' applying to all names.
+        Each value is a dict with any of the keys 'compression' ('gzip', 'lzf', or None), 'compression_opts',
+        'shuffle', 'scaleoffset', and 'chunk_cache' (chunk cache size in bytes). Defaults to no compression.
+    out_of_core : bool
+        If True, measured arrays are not held in memory. Each `expt[name]` is a `ps.DatasetView` that reads
+        slices from and writes points straight through to the save file, defaults to False.
+    swmr : bool
+        If True, the save file is switched to hdf5 single-writer/multiple-reader mode after the first point,
+        so other processes can follow the run with `ps.load_experiment(file_name, follow=True)`, defaults to False.
+    checkpoint : bool
+        If True, a completed-point bitmap is saved with every point so that an interrupted run can be
+        continued with `ps.Experiment.resume(file_name)`, defaults to True.
+    save_timing : bool
+        If True, the timestamp of every point in seconds since the start of the run, its jitter relative to
+        the deadline set by the scans' `dt`, and the time spent waiting for the scans' `ps.Settle` conditions
+        are saved in the datasets 'timing/timestamp', 'timing/jitter' and 'timing/settle_time', defaults to False.
+        The start of the run is saved as the attribute 'start_time' of the 'timing' group. The time spent in each
+        phase of every point is saved in 'timing/iterate' (one value per scan level), 'timing/measure',
+        'timing/average' and 'timing/save', and summarized by `ps.timing_summary`. Timing is written a line of
+        scan0 at a time and when the run ends, so the timing of the current line is lost if the process is killed.
+    pipeline : bool
+        If True, the averaging and saving of each point run in a background thread while the scans set the
+        devices of the next point, including their `dt` and settle waits. The next point is measured once the
+        previous one is saved, so the data is the same as without pipelining. Defaults to False.
+    max_workers : int or None
+        Number of threads used to set the devices of concurrent property scans, defaults to None for the
+        `concurrent.futures.ThreadPoolExecutor` default.
+    async_save : bool
+        If True, points are written to the save file by a background thread, defaults to False.
+    save_queue_size : int
+        Maximum number of points waiting to be written when `async_save` is True, defaults to 1000.
     _pyscan_version : str
         Current version of pyscan to be saved as metadata.
 
@@ -53,6 +116,11 @@ class RunInfo(ItemAttribute):
     check_repeat_scan()
     check_average_scan()
     check_continuous_scan()
+    check_adaptive_scan()
+    check_reduce_function()
+    check_dtypes()
+    check_storage_options()
+    cache_properties()
     '''
 
     def __init__(self):
@@ -62,9 +130,29 @@ class RunInfo(ItemAttribute):
 
         self.measured = []
         self.measure_function = None
+        self.reduce_function = None
+        self.reduce_workers = None
+        self.reduce_in_flight = None
+        self.shared_memory_bytes = 2**16
 
         self.initial_pause = 0.1
 
+        self.flush_interval = 1
+        self.flush_time = None
+        self.flush_on_line = False
+        self.chunks = {}
+        self.chunk_bytes = 2**20
+        self.dtypes = {}
+        self.storage_options = {}
+        self.out_of_core = False
+        self.swmr = False
+        self.checkpoint = True
+        self.save_timing = False
+        self.max_workers = None
+        self.pipeline = False
+        self.async_save = False
+        self.save_queue_size = 1000
+
         self._pyscan_version = get_pyscan_version()
 
     def check(self):
@@ -85,6 +173,14 @@ class RunInfo(ItemAttribute):
 
         self.check_continuous_scan()
 
+        self.check_adaptive_scan()
+
+        self.check_reduce_function()
+
+        self.check_dtypes()
+
+        self.check_storage_options()
+
     def check_sequential_scans(self):
 
         scan_indicies = []
@@ -104,7 +200,7 @@ class RunInfo(ItemAttribute):
 
         scanned_properties = []
         for scan in self.scans:
-            if isinstance(scan, PropertyScan):
+            if isinstance(scan, (PropertyScan, AdaptiveScan)):
                 for dev in scan.device_names:
                     assert f'{dev}_{scan.prop}' not in scanned_properties, \
                         'Property {} is duplicated in the scans'.format(f'{dev}_{scan.prop}')
@@ -127,6 +223,13 @@ class RunInfo(ItemAttribute):
         if num_av_scans > 1:
             assert False, "More than one average scan is not allowed"
 
+        # averaging stops early by skipping to the next point, so the repeats of a point must be consecutive
+        for i, scan in enumerate(self.scans):
+            if isinstance(scan, AverageScan) and (scan.target_stderr is not None):
+                assert i == 0, 'An average scan with target_stderr must be scan0'
+                assert not self.has_continuous_scan, \
+                    'An average scan with target_stderr cannot be combined with a continuous scan'
+
     def check_repeat_scan(self):
         '''
         Checks to see if there a repeat scan present and if there are more the one repeat scans
@@ -152,6 +255,73 @@ class RunInfo(ItemAttribute):
         if self.has_continuous_scan:
             assert self.continuous_index == (self.ndim - 1), 'Error, continuous scan must be the last scan'
 
+    def check_adaptive_scan(self):
+        '''
+        Checks that an adaptive scan is scan0 and is not combined with an average or continuous scan, whose
+        passes would choose different values for the same saved index
+        '''
+
+        for i, scan in enumerate(self.scans):
+            if isinstance(scan, AdaptiveScan):
+                assert i == 0, 'An adaptive scan must be scan0'
+                assert not self.has_average_scan, 'An adaptive scan cannot be combined with an average scan'
+                assert not self.has_continuous_scan, 'An adaptive scan cannot be combined with a continuous scan'
+                # the next value is chosen from the data of the previous point
+                assert not self.pipeline, 'An adaptive scan cannot run with pipeline = True'
+
+    def check_reduce_function(self):
+        '''
+        Checks that a reduce function is callable and only runs with scans that do not need the reduced data of a
+        point before the next point is acquired
+        '''
+
+        if self.reduce_function is None:
+            return
+
+        assert callable(self.reduce_function), 'reduce_function must be callable'
+        assert (self.reduce_in_flight is None) or (self.reduce_in_flight >= 1), 'reduce_in_flight must be >= 1 or None'
+        assert not self.pipeline, 'A reduce_function cannot run with pipeline = True'
+        for scan in self.scans:
+            assert not isinstance(scan, AdaptiveScan), 'A reduce_function cannot be combined with an adaptive scan'
+            assert not (isinstance(scan, AverageScan) and (scan.target_stderr is not None)), \
+                'A reduce_function cannot be combined with an average scan with target_stderr'
+
+    def check_dtypes(self):
+        '''
+        Checks that data averaged by an average scan is not stored with an integer or boolean type, which cannot
+        hold the running average
+        '''
+
+        if not self.has_average_scan:
+            return
+
+        for name, dtype in self.dtypes.items():
+            assert np.dtype(dtype).kind in 'fc', \
+                'Data {} is averaged, its dtype {} must be a float or complex type'.format(name, dtype)
+
+    def check_storage_options(self):
+        '''
+        Checks that the storage options use known keys and compression filters
+        '''
+
+        allowed = ['compression', 'compression_opts', 'shuffle', 'scaleoffset', 'chunk_cache']
+
+        for name, options in self.storage_options.items():
+            for key in options.keys():
+                assert key in allowed, 'Storage option {} for {} must be one of {}'.format(key, name, allowed)
+            assert options.get('compression', None) in [None, 'gzip', 'lzf'], \
+                "Compression for {} must be 'gzip', 'lzf' or None".format(name)
+
+    def cache_properties(self):
+        '''
+        Evaluates the properties that store their last value as an underscore attribute (`_dims`, `_ndim`,
+        `_indicies`, ...) so that these attributes record the current scan state. Called at the end of a run,
+        since the experiment loop reads the precompiled `ps.RunPlan` instead of these properties.
+        '''
+        for name in ['dims', 'ndim', 'indicies', 'has_average_scan', 'average_dims', 'average_indicies',
+                     'n_average_dim', 'has_continuous_scan', 'continuous_index']:
+            getattr(self, name)
+
     def stop_continuous(self, plus_one=False):
         stop = False
         if self.has_continuous_scan:
@@ -0,0 +1,134 @@
+from .scans import AverageScan, ContinuousScan, AdaptiveScan
+
+
+class RunPlan(object):
+    '''
+    Immutable, precompiled description of the scan loop of a `ps.RunInfo`, built once by
+    `ps.Experiment.check_runinfo()`. The experiment loop and data methods read the scans, indicies,
+    dimensions and save-index mapping from the plan instead of recomputing the `ps.RunInfo` properties
+    at every point.
+
+    Parameters
+    ----------
+    runinfo : ps.RunInfo
+        Checked runinfo to compile
+
+    Attributes
+    ----------
+    scans : tuple
+        Scans in order from scan0 (innermost) outwards
+    reversed_scans : tuple
+        Scans in the order they are iterated at each point, from the outermost scan inwards
+    iterators : tuple
+        Index iterator of each scan
+    lengths : tuple
+        Number of iterations of each scan, None for a continuous scan without `n_max`, used by `ps.ScanSchedule`
+    snake : tuple
+        For each scan, True if it runs in serpentine order, used by `ps.ScanSchedule`
+    dims : tuple
+        Length of each scan when the run starts, a continuous scan has length 1 and grows during the run
+    ndim : int
+        Number of scans
+    has_average_scan : bool
+        True if an average scan is present
+    average_index : int
+        Position of the average scan in `scans`, -1 if there is no average scan
+    has_continuous_scan : bool
+        True if a continuous scan is present
+    continuous_index : int
+        Position of the continuous scan in `scans`, -1 if there is no continuous scan
+    has_early_stop : bool
+        True if the average scan stops averaging early at a target standard error
+    saved_axes : tuple
+        Positions in `scans` of the scans that are saved as axes of the measured data, every scan but the
+        average scan
+    saved_dims : tuple
+        Length of each saved axis when the run starts
+    n_saved_dim : int
+        Number of saved axes
+    continuous_axis : int
+        Saved axis of the continuous scan, -1 if there is no continuous scan
+    adaptive_keys : tuple
+        Names of the scan values chosen by an adaptive scan while running, saved with every point
+
+    Methods
+    -------
+    indicies()
+    saved_indicies()
+    '''
+
+    __slots__ = ('scans', 'reversed_scans', 'iterators', 'lengths', 'snake', 'dims', 'ndim',
+                 'has_average_scan', 'average_index', 'has_continuous_scan', 'continuous_index', 'has_early_stop',
+                 'saved_axes', 'saved_dims', 'n_saved_dim', 'continuous_axis', 'adaptive_keys')
+
+    def __init__(self, runinfo):
+        '''
+        Constructor method
+        '''
+
+        scans = tuple(runinfo.scans)
+
+        average_index = -1
+        continuous_index = -1
+        for i, scan in enumerate(scans):
+            if isinstance(scan, AverageScan):
+                average_index = i
+            elif isinstance(scan, ContinuousScan):
+                continuous_index = i
+
+        iterators = tuple(scan.iterator() for scan in scans)
+        lengths = tuple(None if isinstance(scan, ContinuousScan) and (scan.n_max is None) else len(iterator)
+                        for scan, iterator in zip(scans, iterators))
+
+        dims = tuple(1 if isinstance(scan, ContinuousScan) else scan.n for scan in scans)
+        saved_axes = tuple(i for i in range(len(scans)) if i != average_index)
+
+        if continuous_index == -1:
+            continuous_axis = -1
+        else:
+            continuous_axis = saved_axes.index(continuous_index)
+
+        values = {
+            'scans': scans,
+            'reversed_scans': scans[::-1],
+            'iterators': iterators,
+            'lengths': lengths,
+            'snake': tuple(bool(getattr(scan, 'snake', False)) for scan in scans),
+            'dims': dims,
+            'ndim': len(scans),
+            'has_average_scan': average_index != -1,
+            'average_index': average_index,
+            'has_continuous_scan': continuous_index != -1,
+            'continuous_index': continuous_index,
+            'has_early_stop': (average_index != -1) and (scans[average_index].target_stderr is not None),
+            'saved_axes': saved_axes,
+            'saved_dims': tuple(dims[i] for i in saved_axes),
+            'n_saved_dim': len(saved_axes),
+            'continuous_axis': continuous_axis,
+            'adaptive_keys': tuple(key for scan in scans if isinstance(scan, AdaptiveScan) for key in scan.scan_dict)}
+
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('RunPlan is immutable, recompile it with ps.Experiment.check_runinfo()')
+
+    def __delattr__(self, name):
+        raise AttributeError('RunPlan is immutable, recompile it with ps.Experiment.check_runinfo()')
+
+    def __repr__(self):
+        return 'RunPlan(dims={}, average_index={}, continuous_index={})'.format(
+            self.dims, self.average_index, self.continuous_index)
+
+    def indicies(self):
+        '''
+        Returns the current index of every scan, from scan0 outwards
+        '''
+        return tuple(scan.i for scan in self.scans)
+
+    def saved_indicies(self):
+        '''
+        Returns the current index of every saved axis, the indicies without the average scan
+        '''
+        scans = self.scans
+        return tuple(scans[i].i for i in self.saved_axes)
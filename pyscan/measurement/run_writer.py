@@ -0,0 +1,490 @@
+import h5py
+import numpy as np
+from queue import Queue
+from time import monotonic
+from threading import Thread as thread
+
+
+class RunWriter(object):
+    '''
+    Keeps a single hdf5 file handle open for the life of an experiment run. Dataset
+    handles are cached by name so that saving a point is only a dataset slice assignment.
+
+    Parameters
+    ----------
+    file_name : str
+        Path to the hdf5 save file
+    flush_interval : int or None, optional
+        Number of saved points between flushes of the file to disk, defaults to 1. If None, the file is
+        not flushed based on the number of points. The file is always flushed when the writer is closed.
+    flush_time : float or None, optional
+        Flush the file when a point is saved at least `flush_time` seconds after the last flush,
+        defaults to None.
+    flush_on_line : bool, optional
+        If True, flush the file when the last point of a line of the innermost scan is saved, defaults to False.
+    swmr : bool, optional
+        If True, the file is created with the latest hdf5 file format so that `start_swmr` can switch
+        it to single-writer/multiple-reader mode, defaults to False.
+    buffer_size : int, optional
+        Maximum number of values of one dataset held by `buffer_values` before they are written, defaults to 1000.
+
+    Attributes
+    ----------
+    file : h5py.File
+        The open hdf5 file, None if the writer is closed
+    datasets : dict
+        Cached dataset handles, keyed by dataset name
+    lengths : dict
+        Logical (axis, length) of datasets resized with `resize`, keyed by dataset name
+    n_points : int
+        Number of points saved since the writer was opened
+    last_index : tuple
+        Saved indicies of the last saved point, None if no point has been saved
+    n_flushes : int
+        Number of flushes since the writer was opened
+    buffers : dict
+        Values held by `buffer_values`, keyed by dataset name
+    flushed_buffers : set
+        Names of the datasets whose buffered values are written at each flush
+    progress : ps.Progress
+        Progress of the run, mirrored in the attribute 'progress' at each flush, None to not mirror it
+
+    Methods
+    -------
+    open()
+    create_dataset(name, **kwargs)
+    write_point(point, index, end_of_line)
+    write_values(point)
+    buffer_values(point, on_flush)
+    write_buffers()
+    resize(name, n, axis)
+    trim()
+    point_saved(index, end_of_line)
+    start_swmr()
+    flush()
+    close()
+    '''
+
+    def __init__(self, file_name, flush_interval=1, flush_time=None, flush_on_line=False, swmr=False,
+                 buffer_size=1000):
+        '''
+        Constructor method
+        '''
+
+        assert (flush_interval is None) or (flush_interval >= 1), 'flush_interval must be >= 1 or None'
+        assert (flush_time is None) or (flush_time >= 0), 'flush_time must be >= 0 or None'
+        assert buffer_size >= 1, 'buffer_size must be >= 1'
+
+        self.file_name = file_name
+        self.flush_interval = flush_interval
+        self.flush_time = flush_time
+        self.flush_on_line = flush_on_line
+        self.swmr = swmr
+        self.buffer_size = buffer_size
+
+        self.file = None
+        self.datasets = {}
+        self.lengths = {}
+        self.n_points = 0
+        self.n_unflushed = 0
+        self.last_index = None
+        self.n_flushes = 0
+        self.last_flush = monotonic()
+        self.buffers = {}
+        self.flushed_buffers = set()
+        self.progress = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getitem__(self, name):
+        '''
+        Returns the cached handle of dataset `name`, fetching it from the file on first use
+        '''
+        try:
+            return self.datasets[name]
+        except KeyError:
+            self.datasets[name] = self.file[name]
+            return self.datasets[name]
+
+    def __contains__(self, name):
+        return name in self.file
+
+    @property
+    def is_open(self):
+        '''
+        Returns True if the hdf5 file is open
+        '''
+        return self.file is not None
+
+    @property
+    def attrs(self):
+        '''
+        Returns the attributes of the open hdf5 file
+        '''
+        return self.file.attrs
+
+    def open(self):
+        '''
+        Opens the hdf5 file in append mode if it is not already open
+
+        Returns
+        -------
+        RunWriter
+        '''
+        if self.file is None:
+            if self.swmr:
+                self.file = h5py.File(self.file_name, 'a', libver='latest')
+            else:
+                self.file = h5py.File(self.file_name, 'a')
+            self.last_flush = monotonic()
+        return self
+
+    def create_dataset(self, name, **kwargs):
+        '''
+        Creates a dataset and caches its handle. Keyword arguments are passed to `h5py.File.create_dataset`.
+
+        Returns
+        -------
+        h5py.Dataset
+        '''
+        self.datasets[name] = self.file.create_dataset(name, **kwargs)
+        return self.datasets[name]
+
+    def write_point(self, point, index=(), end_of_line=False):
+        '''
+        Writes one saved point to the file
+
+        Parameters
+        ----------
+        point : list
+            list of (name, index, value) tuples, each written as `self[name][index] = value`
+        index : tuple, optional
+            Saved indicies of the point, recorded as the last completed index
+        end_of_line : bool, optional
+            True if the point is the last point of a line of the innermost scan
+        '''
+        for name, i, value in point:
+            self[name][i] = value
+        self.point_saved(index, end_of_line)
+
+    def write_values(self, point):
+        '''
+        Writes values to the file without counting a saved point, used for values recorded after their point
+
+        Parameters
+        ----------
+        point : list
+            list of (name, index, value) tuples, each written as `self[name][index] = value`
+        '''
+        for name, i, value in point:
+            self[name][i] = value
+
+    def buffer_values(self, point, on_flush=False):
+        '''
+        Holds values of datasets over the scan axes and writes each dataset's values along scan0 in one slice
+        assignment, when a value of another line of scan0 arrives, when `buffer_size` values are held, or
+        when `write_buffers` is called. Used for per point values that do not need to be on disk at each flush,
+        each separate write costs much more than writing one value.
+
+        Parameters
+        ----------
+        point : list
+            list of (name, index, value) tuples, where index is the point's indicies over every scan axis
+            starting with scan0, and value is a scalar or the values at that index
+        on_flush : bool, optional
+            If True, the held values are also written at each flush, so that they reach the disk together with
+            the points saved before them, defaults to False
+        '''
+        for name, index, value in point:
+            if on_flush:
+                self.flushed_buffers.add(name)
+            buffer = self.buffers.get(name)
+            if (buffer is not None) and ((buffer[0] != index[1:]) or (len(buffer[1]) >= self.buffer_size)):
+                self.write_buffer(name)
+                buffer = None
+            if buffer is None:
+                buffer = (tuple(index[1:]), {})
+                self.buffers[name] = buffer
+            buffer[1][index[0]] = value
+
+    def write_buffer(self, name):
+        '''
+        Writes the values of dataset `name` held by `buffer_values`, one slice assignment per run of
+        consecutive scan0 indicies
+        '''
+        outer, values = self.buffers.pop(name)
+        i0 = sorted(values.keys())
+        start = 0
+        for k in range(1, len(i0) + 1):
+            if (k == len(i0)) or (i0[k] != i0[k - 1] + 1):
+                block = np.array([values[i] for i in i0[start:k]])
+                self[name][(slice(i0[start], i0[k - 1] + 1), *outer)] = block
+                start = k
+
+    def write_buffers(self):
+        '''
+        Writes all values held by `buffer_values`
+        '''
+        for name in list(self.buffers.keys()):
+            self.write_buffer(name)
+
+    def resize(self, name, n, axis=0):
+        '''
+        Sets the logical length of dataset `name` along `axis` to `n`. The dataset grows by doubling
+        and is trimmed to its logical length when the writer is closed.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset
+        n : int
+            New logical length along `axis`
+        axis : int, optional
+            Axis to resize, defaults to 0
+        '''
+        dataset = self[name]
+        if dataset.shape[axis] < n:
+            shape = list(dataset.shape)
+            shape[axis] = max(n, 2 * shape[axis])
+            dataset.resize(shape)
+        self.lengths[name] = (axis, n)
+
+    def trim(self):
+        '''
+        Trims datasets resized with `resize` to their logical length
+        '''
+        for name, (axis, n) in self.lengths.items():
+            dataset = self[name]
+            shape = list(dataset.shape)
+            shape[axis] = n
+            dataset.resize(shape)
+        self.lengths = {}
+
+    def point_saved(self, index=(), end_of_line=False):
+        '''
+        Counts a saved point and flushes the file every `flush_interval` points, after `flush_time` seconds,
+        or at the end of a line if `flush_on_line` is True, whichever comes first
+
+        Parameters
+        ----------
+        index : tuple, optional
+            Saved indicies of the point, recorded as the last completed index
+        end_of_line : bool, optional
+            True if the point is the last point of a line of the innermost scan
+        '''
+        self.last_index = tuple(index)
+        self.n_points += 1
+        self.n_unflushed += 1
+        if (self.flush_interval is not None) and (self.n_unflushed >= self.flush_interval):
+            self.flush()
+        elif self.flush_on_line and end_of_line:
+            self.flush()
+        elif (self.flush_time is not None) and (monotonic() - self.last_flush >= self.flush_time):
+            self.flush()
+
+    def start_swmr(self):
+        '''
+        Switches the open file to single-writer/multiple-reader mode. No datasets or attributes can
+        be created afterwards, existing datasets can still be written and resized.
+        '''
+        assert self.swmr, 'RunWriter must be created with swmr=True to start swmr mode'
+        self.flush()
+        self.file.swmr_mode = True
+
+    def flush(self):
+        '''
+        Writes the values buffered with `on_flush`, records the progress attributes 'n_points', 'last_index'
+        and 'progress' and flushes buffered data and metadata to disk
+        '''
+        if self.file is not None:
+            for name in self.flushed_buffers.intersection(self.buffers):
+                self.write_buffer(name)
+            if self.last_index is not None:
+                self.file.attrs['n_points'] = self.n_points
+                self.file.attrs['last_index'] = np.array(self.last_index, dtype='int64')
+                if self.progress is not None:
+                    self.file.attrs['progress'] = self.progress.to_array()
+            self.file.flush()
+            self.n_flushes += 1
+        self.n_unflushed = 0
+        self.last_flush = monotonic()
+
+    def close(self):
+        '''
+        Writes the buffered values, trims, flushes and closes the hdf5 file and drops the cached dataset handles
+        '''
+        if self.file is not None:
+            self.write_buffers()
+            self.trim()
+            if self.n_unflushed > 0:
+                self.flush()
+            self.file.close()
+        self.file = None
+        self.datasets = {}
+        self.n_unflushed = 0
+
+
+class AsyncRunWriter(RunWriter):
+    '''
+    Run writer that saves points from a background thread so that disk writes overlap with
+    setting instruments and measuring. Points are pushed onto a bounded queue, `write_point` blocks
+    when the queue is full, and errors raised by the writer thread are re-raised in the experiment thread.
+    Inherits from `RunWriter`.
+
+    Parameters
+    ----------
+    file_name : str
+        Path to the hdf5 save file
+    flush_interval : int or None, optional
+        Number of saved points between flushes of the file to disk, defaults to 1.
+    flush_time : float or None, optional
+        Seconds between flushes of the file to disk, defaults to None.
+    flush_on_line : bool, optional
+        If True, flush the file at the end of each line of the innermost scan, defaults to False.
+    swmr : bool, optional
+        If True, the file is created so that it can be switched to swmr mode, defaults to False.
+    queue_size : int, optional
+        Maximum number of points waiting to be written before the experiment thread blocks, defaults to 1000.
+    buffer_size : int, optional
+        Maximum number of values of one dataset held by `buffer_values` before they are written, defaults to 1000.
+
+    Attributes
+    ----------
+    queue : queue.Queue
+        Queue of points waiting to be written
+    error : Exception
+        First exception raised by the writer thread, None if no error has occurred
+
+    Methods
+    -------
+    write_point(point, index, end_of_line)
+    write_values(point)
+    buffer_values(point, on_flush)
+    check_error()
+    join()
+    close()
+    '''
+
+    def __init__(self, file_name, flush_interval=1, flush_time=None, flush_on_line=False, swmr=False,
+                 queue_size=1000, buffer_size=1000):
+        '''
+        Constructor method
+        '''
+
+        assert queue_size >= 1, 'queue_size must be >= 1'
+
+        super().__init__(file_name, flush_interval=flush_interval, flush_time=flush_time,
+                         flush_on_line=flush_on_line, swmr=swmr, buffer_size=buffer_size)
+
+        self.queue = Queue(maxsize=queue_size)
+        self.error = None
+        self.error_raised = False
+        self.writer_thread = None
+
+    def open(self):
+        '''
+        Opens the hdf5 file and starts the writer thread
+
+        Returns
+        -------
+        AsyncRunWriter
+        '''
+        super().open()
+        if self.writer_thread is None:
+            self.writer_thread = thread(target=self.drain, daemon=True)
+            self.writer_thread.start()
+        return self
+
+    def drain(self):
+        '''
+        Writer thread target, writes queued points and values until it receives None
+        '''
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    break
+                # after an error keep emptying the queue so the experiment thread never blocks
+                if self.error is None:
+                    write, args = item
+                    write(self, *args)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def check_error(self):
+        '''
+        Raises the first exception from the writer thread in the calling thread
+        '''
+        if (self.error is not None) and (not self.error_raised):
+            self.error_raised = True
+            raise self.error
+
+    def write_point(self, point, index=(), end_of_line=False):
+        '''
+        Queues one point to be written, blocks if the queue is full
+
+        Parameters
+        ----------
+        point : list
+            list of (name, index, value) tuples, values are copied before queueing
+        index : tuple, optional
+            Saved indicies of the point, recorded as the last completed index
+        end_of_line : bool, optional
+            True if the point is the last point of a line of the innermost scan
+        '''
+        self.check_error()
+        point = [(name, i, np.array(value)) for name, i, value in point]
+        self.queue.put((RunWriter.write_point, (point, index, end_of_line)))
+
+    def write_values(self, point):
+        '''
+        Queues values to be written without counting a saved point. Does not raise errors from the writer
+        thread, so it can be used while the writer is closing.
+
+        Parameters
+        ----------
+        point : list
+            list of (name, index, value) tuples, values are copied before queueing
+        '''
+        point = [(name, i, np.array(value)) for name, i, value in point]
+        self.queue.put((RunWriter.write_values, (point,)))
+
+    def buffer_values(self, point, on_flush=False):
+        '''
+        Queues values to be buffered by the writer thread, see `RunWriter.buffer_values`. Does not raise errors
+        from the writer thread, so it can be used while the writer is closing.
+
+        Parameters
+        ----------
+        point : list
+            list of (name, index, value) tuples, values are copied before queueing
+        on_flush : bool, optional
+            If True, the held values are also written at each flush, defaults to False
+        '''
+        point = [(name, i, np.array(value)) for name, i, value in point]
+        self.queue.put((RunWriter.buffer_values, (point, on_flush)))
+
+    def join(self):
+        '''
+        Blocks until all queued points have been written
+        '''
+        if self.writer_thread is not None:
+            self.queue.join()
+        self.check_error()
+
+    def close(self):
+        '''
+        Writes the remaining queued points, stops the writer thread and closes the file
+        '''
+        if self.writer_thread is not None:
+            self.queue.put(None)
+            self.writer_thread.join()
+            self.writer_thread = None
+        super().close()
+        self.check_error()
@@ -1,7 +1,8 @@
 import numpy as np
-from time import sleep
 from itemattribute import ItemAttribute
 from ..general.same_length import same_length
+from ..general.growable_array import GrowableArray
+from ..general.instrument_lock import instrument_lock
 
 
 class AbstractScan(ItemAttribute):
@@ -37,9 +38,21 @@ class PropertyScan(AbstractScan):
     dt : float
         Wait time in seconds after changing a single property value, and before the measure_function
         is called. Used by experiment classes, defaults to 0.
+    snake : bool
+        If True, the scan runs in serpentine order: every other pass of the scan runs from the last value
+        back to the first, so slow ramped or swept devices never fly back between passes. Data is saved at
+        the index of the value that was set. Defaults to False.
+    settle : ps.Settle, optional
+        Condition polled after setting the devices and before waiting `dt`, for example
+        ``ps.Settle('field', tolerance=1e-4, window=0.5)``. Defaults to None for no settling.
+    concurrent : bool
+        If True, the devices are set at the same time from the experiment's thread pool, and the scan waits
+        for every set to finish before settling and waiting `dt`. Devices sharing an instrument, as returned by
+        `ps.instrument_lock`, are still set one at a time. Use for sources on separate buses with slow sets.
+        Defaults to False.
     '''
 
-    def __init__(self, input_dict, prop, dt=0):
+    def __init__(self, input_dict, prop, dt=0, snake=False, settle=None, concurrent=False):
         '''
         Constructor method
         '''
@@ -51,6 +64,9 @@ class PropertyScan(AbstractScan):
         self.device_names = list(input_dict.keys())
 
         self.dt = dt
+        self.snake = snake
+        self.settle = settle
+        self.concurrent = concurrent
         self.i = 0
 
         self.check_same_length()
@@ -69,10 +85,30 @@ class PropertyScan(AbstractScan):
         if d == 0:
             return 0
 
-        for dev in self.device_names:
-            expt.devices[dev][self.prop] = self.scan_dict[dev + '_' + self.prop][i]
+        targets = [self.scan_dict[dev + '_' + self.prop][i] for dev in self.device_names]
+        if self.concurrent and (len(self.device_names) > 1):
+            executor = expt.get_executor()
+            futures = [executor.submit(self.set_device, expt, dev, value)
+                       for dev, value in zip(self.device_names, targets)]
+            # every set finishes before dt starts, errors are raised in the experiment thread
+            for future in futures:
+                future.result()
+        else:
+            for dev, value in zip(self.device_names, targets):
+                expt.devices[dev][self.prop] = value
 
-        sleep(self.dt)
+        if self.settle is not None:
+            self.settle.wait(expt, self.device_names, targets)
+
+        expt.clock.wait(self.dt)
+
+    def set_device(self, expt, dev, value):
+        '''
+        Sets `prop` of device `dev` to `value` while holding the lock of its instrument, used by concurrent scans
+        '''
+        device = expt.devices[dev]
+        with instrument_lock(device):
+            device[self.prop] = value
 
     def check_same_length(self):
         '''
@@ -109,16 +145,26 @@ class FunctionScan(AbstractScan):
     dt: float
         Wait time in seconds after running `function` once, and before the ``runinfo.measure_function``
         is called. Used by experiment classes, defaults to 0.
+    snake : bool
+        If True, the scan runs in serpentine order: every other pass of the scan runs from the last value
+        back to the first. Data is saved at the index of the value that was used. Defaults to False.
+    settle : ps.Settle, optional
+        Condition polled after running `function` and before waiting `dt`, with a readback function compared
+        to the value passed to `function`. Defaults to None for no settling.
     '''
 
-    def __init__(self, function, values, dt=0):
+    def __init__(self, function, values, dt=0, snake=False, settle=None):
 
         self.scan_dict = {}
 
         self.scan_dict[function.__name__] = np.array(values)
 
+        assert (settle is None) or callable(settle.readback), 'The settle readback of a FunctionScan must be a function'
+
         self.function = function
         self.dt = dt
+        self.snake = snake
+        self.settle = settle
         self.i = 0
         self.n = len(values)
 
@@ -140,8 +186,13 @@ class FunctionScan(AbstractScan):
         if d == 0:
             return 0
 
-        self.function(self.scan_dict[self.function.__name__][i])
-        sleep(self.dt)
+        value = self.scan_dict[self.function.__name__][i]
+        self.function(value)
+
+        if self.settle is not None:
+            self.settle.wait(expt, [], [value])
+
+        expt.clock.wait(self.dt)
 
     def check_same_length(self):
         pass
@@ -162,19 +213,24 @@ class RepeatScan(AbstractScan):
         Number of times to repeat inner loops.
     dt : float
         Wait time in seconds after repeat. Used by experiment classes, defaults to 0.
+    settle : ps.Settle, optional
+        Condition polled before each repeat and before waiting `dt`, with a readback function that settles
+        once it varies by no more than the tolerance over the window. Defaults to None for no settling.
     '''
 
-    def __init__(self, nrepeat, dt=0):
+    def __init__(self, nrepeat, dt=0, settle=None):
         '''
         Constructor method.
         '''
         assert nrepeat > 0, "nrepeat must be > 0"
         assert nrepeat != np.inf, "nrepeat is np.inf, make a continuous scan instead."
+        assert (settle is None) or callable(settle.readback), 'The settle readback of a RepeatScan must be a function'
         self.scan_dict = {}
         self.scan_dict['repeat'] = np.array(range(nrepeat))
 
         self.device_names = ['repeat']
         self.dt = dt
+        self.settle = settle
 
         self.n = nrepeat
 
@@ -190,7 +246,10 @@ class RepeatScan(AbstractScan):
         if d == 0:
             return 0
 
-        sleep(self.dt)
+        if self.settle is not None:
+            self.settle.wait(expt, [])
+
+        expt.clock.wait(self.dt)
 
     def check_same_length(self):
         '''
@@ -213,7 +272,10 @@ class ContinuousScan(AbstractScan):
     Parameters
     ----------
     dt : float, optional
-        Wait time in seconds after each iteration. Used by experiment classes, defaults to 0.
+        Sample period in seconds. Iteration i starts `i * dt` after the first iteration on the experiment's
+        `ps.DeadlineClock`, so the period does not drift with the time spent measuring and saving. If an iteration
+        overruns by more than a period, the following iterations are timed from the late one. Defaults to 0,
+        for iterations as fast as possible.
     n_max : int, optional
         Maximum number of iterations to run. If not specified, the scan will run indefinitely.
     '''
@@ -225,12 +287,14 @@ class ContinuousScan(AbstractScan):
 
         self.scan_dict = {}
         self.scan_dict['iteration'] = np.ndarray((0))
+        self._iterations = GrowableArray(self.scan_dict['iteration'])
 
         self.device_names = ['iteration']
         self.dt = dt
 
         self.i = 0
         self.n = 1
+        self.origin = 0
 
         self.n_max = n_max
 
@@ -242,10 +306,17 @@ class ContinuousScan(AbstractScan):
         if d == 0:
             return 0
 
-        self.scan_dict['iteration'] = np.append(self.scan_dict['iteration'], i)
+        self.scan_dict['iteration'] = self._iterations.append(i)
         expt.iteration = self.scan_dict['iteration']
 
-        sleep(self.dt)
+        # iteration i starts at origin + i * dt on the experiment clock, whatever the time taken by each iteration
+        if self.dt > 0:
+            if d == -1:
+                self.origin = expt.clock.now() - i * self.dt
+            late = expt.clock.wait_until(self.origin + i * self.dt)
+            # after an iteration overruns by more than a period, keep the period from now instead of catching up
+            if late > self.dt:
+                self.origin += late
 
         if self.n == self.n_max:
             expt.stop()
@@ -264,18 +335,48 @@ class AverageScan(AbstractScan):
     '''
     Class for averaging inner loops.
 
+    With `target_stderr`, the average scan stops early at each point: the running mean and variance of the
+    `measured` data are tracked with Welford's algorithm, and the remaining repeats of the point are skipped once
+    the standard error of the mean is at most `target_stderr`. `n_average` is then the maximum number of repeats.
+    The number of repeats and the standard error of each point are saved in the datasets 'convergence/count'
+    and 'convergence/stderr'. Early stopping requires the average scan to be scan0 and no continuous scan.
+
     Parameters
     ----------
     n_average : int
-        Number of times to average data from inner loops
+        Number of times to average data from inner loops, the maximum number with `target_stderr`
     dt : float
         Wait time in seconds before each measurement. Used by Experiment classes, defaults to 0.
+    target_stderr : float, optional
+        Standard error of the mean of `measured` at which averaging stops, defaults to None to always
+        average `n_average` times. For array data the largest standard error of its elements is used.
+    measured : str, optional
+        Name of the measured data whose standard error is tracked, required with `target_stderr`
+    n_min : int, optional
+        Minimum number of repeats before stopping, defaults to 2
+
+    Attributes
+    ----------
+    count : int
+        Number of repeats averaged at the current point
+    mean : float or np.ndarray
+        Running mean of `measured` at the current point
+    m2 : float or np.ndarray
+        Running sum of squared differences from the mean of `measured` at the current point
+    stderr : float
+        Standard error of the mean at the current point, NaN before the second repeat
+    converged : bool
+        True once the current point has reached `target_stderr`
     '''
 
-    def __init__(self, n_average, dt=0):
+    def __init__(self, n_average, dt=0, target_stderr=None, measured=None, n_min=2):
         assert isinstance(n_average, int), "n_average input for average scan must be an int"
         assert n_average >= 1, "average scan's n_average must be 1 or more"
         assert n_average != np.inf, "average scan's n_average must not be np.inf"
+        assert (target_stderr is None) or (target_stderr > 0), "average scan's target_stderr must be > 0"
+        assert (target_stderr is None) or isinstance(measured, str), \
+            "average scan needs the name of the measured data to reach target_stderr"
+        assert n_min >= 2, "average scan's n_min must be 2 or more"
 
         self.scan_dict = {}
         self.n = n_average
@@ -284,6 +385,11 @@ class AverageScan(AbstractScan):
         self.i = 0
         self.dt = dt
 
+        self.target_stderr = target_stderr
+        self.measured = measured
+        self.n_min = n_min
+        self.restore(0)
+
     def iterate(self, expt, i, d):
         '''
         Place holder, does nothing
@@ -294,7 +400,65 @@ class AverageScan(AbstractScan):
         if d == 0:
             return 0
 
-        sleep(self.dt)
+        expt.clock.wait(self.dt)
+
+    def update(self, value):
+        '''
+        Adds a measured value of `measured` to the running mean and variance of the current point with
+        Welford's algorithm, starting a new point at the first repeat
+
+        Parameters
+        ----------
+        value : float or array
+            Measured value of the current repeat
+
+        Returns
+        -------
+        bool
+            True if the point has converged and the remaining repeats can be skipped
+        '''
+        if self.i == 0:
+            self.restore(0)
+
+        value = np.asarray(value, dtype='float64')
+        self.count += 1
+        delta = value - self.mean
+        self.mean = self.mean + delta / self.count
+        self.m2 = self.m2 + delta * (value - self.mean)
+
+        if self.count > 1:
+            # an unmeasured (NaN) element never converges
+            self.stderr = float(np.max(np.sqrt(self.m2 / (self.count - 1) / self.count)))
+        else:
+            self.stderr = np.nan
+
+        self.converged = (self.count >= self.n_min) and (self.stderr <= self.target_stderr)
+
+        return self.converged
+
+    def restore(self, count, mean=0, stderr=np.nan):
+        '''
+        Sets the running mean and variance of the current point, used to start a point or to resume it
+        from its saved count, mean and standard error
+
+        Parameters
+        ----------
+        count : int
+            Number of repeats already averaged
+        mean : float or array, optional
+            Mean of the repeats, defaults to 0
+        stderr : float, optional
+            Standard error of the mean of the repeats, defaults to NaN. For array data every element is restored
+            with this (largest) standard error.
+        '''
+        self.count = int(count)
+        self.mean = np.asarray(mean, dtype='float64')
+        if count > 1:
+            self.m2 = stderr ** 2 * count * (count - 1) + np.zeros_like(self.mean)
+        else:
+            self.m2 = np.zeros_like(self.mean)
+        self.stderr = stderr
+        self.converged = False
 
     def check_same_length(self):
         '''
@@ -307,3 +471,246 @@ class AverageScan(AbstractScan):
         The following iterates over n
         '''
         return range(self.n)
+
+
+class AdaptiveScan(AbstractScan):
+    '''
+    Class for scanning a property of one or more instruments between bounds, choosing each new value from the
+    data measured so far so that points concentrate where the measured signal changes fastest. Must be scan0,
+    and can run under outer PropertyScans, FunctionScans or a RepeatScan, each pass choosing its own values.
+    Inherits from `pyscan.measurement.scans.AbstractScan`.
+
+    The first `n_initial` values of each pass are evenly spaced between the bounds. Every following value
+    bisects the interval between neighbouring measured values with the largest loss. Data is saved in the
+    order it is measured, a sparse list along scan0, and the values that were set are saved with the same
+    shape under the usual '<device>_<prop>' names. `grid(expt, name)` interpolates the data onto an even grid
+    for plotting.
+
+    Parameters
+    ----------
+    input_dict : dict{string:tuple}
+        key:value pairs of device name strings and (start, stop) bounds of `prop`. With several devices, every
+        device is set to the same fraction of its bounds.
+    prop : str
+        String that indicates the property of the device(s) to be changed
+    n_points : int
+        Number of points measured in each pass of the scan
+    measured : str
+        Name of the measured data the loss is computed from. Array data is reduced to its mean.
+    loss : str or func, optional
+        'gradient' for the length of each interval in the plane of the normalized value and measured data,
+        'curvature' for the error of linear interpolation across each interval estimated from the change in
+        slope to the neighbouring intervals, which resolves the tips of peaks, or a function of the sorted
+        fractions of the bounds `t` and measured data `y` returning the loss of each of the len(t) - 1 intervals.
+        Defaults to 'curvature'.
+    n_initial : int, optional
+        Number of evenly spaced values measured before refining, defaults to 5
+    n_grid : int, optional
+        Number of values of the interpolated grid, defaults to `n_points`
+    dt : float, optional
+        Wait time in seconds after changing a single property value, and before the measure_function
+        is called. Used by experiment classes, defaults to 0.
+    settle : ps.Settle, optional
+        Condition polled after setting the devices and before waiting `dt`, for example
+        ``ps.Settle('field', tolerance=1e-4, window=0.5)``. Defaults to None for no settling.
+    '''
+
+    def __init__(self, input_dict, prop, n_points, measured, loss='curvature', n_initial=5, n_grid=None, dt=0,
+                 settle=None):
+        '''
+        Constructor method
+        '''
+
+        assert n_points >= 2, 'n_points must be >= 2'
+        assert (loss in ['gradient', 'curvature']) or callable(loss), \
+            "loss must be 'gradient', 'curvature' or a function"
+
+        self.prop = prop
+        self.bounds = {}
+        self.scan_dict = {}
+        for device, bounds in input_dict.items():
+            assert len(bounds) == 2, 'Bounds of {} must be (start, stop)'.format(device)
+            self.bounds[device] = tuple(bounds)
+            self.scan_dict['{}_{}'.format(device, prop)] = np.full(n_points, np.nan)
+
+        self.device_names = list(input_dict.keys())
+
+        self.n = n_points
+        self.measured = measured
+        self.loss = loss
+        self.n_initial = max(min(n_initial, n_points), 2)
+        if n_grid is None:
+            self.n_grid = n_points
+        else:
+            self.n_grid = n_grid
+
+        self.dt = dt
+        self.settle = settle
+        self.i = 0
+
+    def iterate(self, expt, i, d):
+        '''
+        Chooses the next value from the data measured so far in this pass and sets `prop` of the listed devices
+        '''
+
+        self.i = i
+
+        if d == 0:
+            return 0
+
+        # one value per point of the run, allocated once the shape of the run is known
+        index = expt.plan.indicies()
+        for key, values in self.scan_dict.items():
+            if values.shape != expt.plan.dims:
+                self.scan_dict[key] = np.full(expt.plan.dims, np.nan)
+
+        t = self.next_fraction(expt, index)
+
+        targets = []
+        for dev in self.device_names:
+            start, stop = self.bounds[dev]
+            value = start + t * (stop - start)
+            self.scan_dict[dev + '_' + self.prop][index] = value
+            expt.devices[dev][self.prop] = value
+            targets.append(value)
+
+        if self.settle is not None:
+            self.settle.wait(expt, self.device_names, targets)
+
+        expt.clock.wait(self.dt)
+
+    def next_fraction(self, expt, index):
+        '''
+        Returns the fraction of the bounds of the next value of the pass at `index`
+
+        Parameters
+        ----------
+        expt : ps.Experiment
+            Experiment being run
+        index : tuple
+            Indicies of the next point, from scan0 outwards
+
+        Returns
+        -------
+        float
+        '''
+
+        i = index[0]
+        if i < self.n_initial:
+            return i / (self.n_initial - 1)
+
+        line = (slice(0, i), *index[1:])
+        dev = self.device_names[0]
+        start, stop = self.bounds[dev]
+        t = (np.asarray(self.scan_dict[dev + '_' + self.prop][line]) - start) / (stop - start)
+        y = np.asarray(expt[self.measured][line], dtype='float64').reshape(i, -1).mean(axis=1)
+
+        return self.refine(t, y)
+
+    def refine(self, t, y):
+        '''
+        Returns the midpoint of the interval with the largest loss
+
+        Parameters
+        ----------
+        t : np.ndarray
+            Fractions of the bounds measured so far
+        y : np.ndarray
+            Measured data at `t`
+
+        Returns
+        -------
+        float
+        '''
+
+        finite = np.isfinite(t) & np.isfinite(y)
+        t, y = t[finite], y[finite]
+        order = np.argsort(t)
+        t, y = t[order], y[order]
+
+        if len(t) < 2:
+            return 0.5
+
+        dt = np.diff(t)
+        scale = np.ptp(y)
+        if scale == 0:
+            scale = 1
+        dy = np.diff(y) / scale
+
+        if callable(self.loss):
+            losses = np.asarray(self.loss(t, y), dtype='float64')
+        elif self.loss == 'gradient':
+            losses = np.hypot(dt, dy)
+        else:
+            # error at the midpoint of each interval of extending the slope of either neighbouring interval,
+            # plus a small gradient term so that flat regions are still sampled
+            slopes = dy / np.where(dt > 0, dt, np.inf)
+            change = np.abs(np.diff(slopes))
+            errors = np.zeros(len(dt))
+            errors[1:] = change * dt[1:] / 2
+            errors[:-1] = np.maximum(errors[:-1], change * dt[:-1] / 2)
+            losses = errors + 0.05 * np.hypot(dt, dy)
+
+        # intervals narrower than the float resolution of the bounds cannot be split further
+        losses[dt < 1e-9] = -np.inf
+        if np.all(losses == -np.inf):
+            losses = dt
+
+        j = int(np.argmax(losses))
+        return (t[j] + t[j + 1]) / 2
+
+    def grid(self, expt, name, n_grid=None):
+        '''
+        Interpolates measured data `name` onto evenly spaced values between the bounds of the first device,
+        separately for each pass of the scan
+
+        Parameters
+        ----------
+        expt : ps.Experiment or ItemAttribute
+            Experiment holding the measured data and scan values
+        name : str
+            Name of the scalar measured data
+        n_grid : int, optional
+            Number of grid values, defaults to `self.n_grid`
+
+        Returns
+        -------
+        grid, data
+        grid : np.ndarray
+            Grid values of the first device
+        data : np.ndarray
+            Interpolated data of shape (n_grid, *outer scan dims)
+        '''
+
+        if n_grid is None:
+            n_grid = self.n_grid
+
+        dev = self.device_names[0]
+        start, stop = self.bounds[dev]
+        grid = np.linspace(start, stop, n_grid)
+
+        values = np.asarray(expt[dev + '_' + self.prop], dtype='float64')
+        data = np.asarray(expt[name], dtype='float64')
+        values = values.reshape(values.shape[0], -1)
+        passes = data.reshape(values.shape)
+
+        gridded = np.full((n_grid, values.shape[1]), np.nan)
+        for j in range(values.shape[1]):
+            finite = np.isfinite(values[:, j]) & np.isfinite(passes[:, j])
+            if np.any(finite):
+                order = np.argsort(values[finite, j])
+                gridded[:, j] = np.interp(grid, values[finite, j][order], passes[finite, j][order])
+
+        return grid, gridded.reshape((n_grid, *np.shape(expt[name])[1:]))
+
+    def check_same_length(self):
+        '''
+        Not used, the values are chosen while the scan runs
+        '''
+        return 1
+
+    def iterator(self):
+        '''
+        The following iterates over n
+        '''
+        return range(self.n)
@@ -0,0 +1,147 @@
+import numpy as np
+from itemattribute import ItemAttribute
+
+
+class Settle(ItemAttribute):
+    '''
+    Settle condition of a scan, used in place of a fixed wait sized for the slowest step. After setting its
+    devices, the scan polls a readback until it has stayed within `tolerance` for `window` seconds, or until
+    `timeout` seconds have passed. Inherits from `.ItemAttribute`.
+
+    The time spent settling at each point is saved in the dataset 'timing/settle_time' when
+    `runinfo.save_timing` is True.
+
+    Parameters
+    ----------
+    readback : str or func
+        Name of a property read from each device of the scan and compared to the value set on that device, or a
+        function of the experiment returning the readback, either one value or one value per device of the scan,
+        compared to the set values. For scans that do not set a value, such as `ps.RepeatScan`, the readback is
+        settled once it varies by no more than `tolerance` over the window.
+    tolerance : float
+        Largest accepted difference between the readback and the set value
+    window : float, optional
+        Time in seconds the readback must stay within tolerance, defaults to 0 for the first reading within
+        tolerance
+    timeout : float, optional
+        Time in seconds after which the scan continues even if the readback has not settled, defaults to 60
+    poll : float, optional
+        Time in seconds between readings, defaults to 0.01
+
+    Attributes
+    ----------
+    n_timeouts : int
+        Number of waits that reached the timeout
+
+    Methods
+    -------
+    read(expt, device_names)
+    wait(expt, device_names, targets)
+    '''
+
+    def __init__(self, readback, tolerance, window=0, timeout=60, poll=0.01):
+        '''
+        Constructor method
+        '''
+
+        assert isinstance(readback, str) or callable(readback), 'readback must be a property name or a function'
+        assert tolerance >= 0, 'tolerance must be >= 0'
+        assert window >= 0, 'window must be >= 0'
+        assert timeout >= window, 'timeout must be >= window'
+        assert poll > 0, 'poll must be > 0'
+
+        self.readback = readback
+        self.tolerance = tolerance
+        self.window = window
+        self.timeout = timeout
+        self.poll = poll
+
+        self.n_timeouts = 0
+
+    def read(self, expt, device_names):
+        '''
+        Returns the readback as an array
+
+        Parameters
+        ----------
+        expt : ps.Experiment
+            The running experiment
+        device_names : list
+            Names of the devices of the scan, read when `readback` is a property name
+
+        Returns
+        -------
+        np.ndarray
+        '''
+        if callable(self.readback):
+            return np.asarray(self.readback(expt), dtype='float64')
+        else:
+            return np.array([expt.devices[dev][self.readback] for dev in device_names], dtype='float64')
+
+    def wait(self, expt, device_names, targets=None):
+        '''
+        Polls the readback on the experiment's clock until it is settled or the timeout is reached. The time
+        spent is added to `expt.settle_time`.
+
+        Parameters
+        ----------
+        expt : ps.Experiment
+            The running experiment
+        device_names : list
+            Names of the devices of the scan
+        targets : list, optional
+            Values set on each device, None if the scan does not set a value
+
+        Returns
+        -------
+        float
+            Time in seconds spent settling
+        '''
+
+        clock = expt.clock
+        # polling deadlines are not the deadlines of the scan's dt, they do not count towards the jitter
+        deadline = clock.deadline
+
+        start = clock.now()
+        window_start = None
+        low, high = None, None
+        k = 0
+        while True:
+            now = clock.now()
+            value = self.read(expt, device_names)
+
+            if targets is not None:
+                within = np.all(np.abs(value - np.asarray(targets, dtype='float64')) <= self.tolerance)
+                if not within:
+                    window_start = None
+                elif window_start is None:
+                    window_start = now
+            else:
+                if low is not None:
+                    low, high = np.minimum(low, value), np.maximum(high, value)
+                    within = np.all(high - low <= self.tolerance)
+                else:
+                    within = False
+                # the window restarts from any reading outside the range of the window
+                if not within:
+                    low, high = value, value
+                    window_start = now
+
+            if (window_start is not None) and (now - window_start >= self.window):
+                break
+            if now - start >= self.timeout:
+                self.n_timeouts += 1
+                break
+
+            k += 1
+            clock.wait_until(start + k * self.poll)
+
+        clock.deadline = deadline
+
+        elapsed = clock.now() - start
+        if np.isnan(expt.settle_time):
+            expt.settle_time = elapsed
+        else:
+            expt.settle_time += elapsed
+
+        return elapsed
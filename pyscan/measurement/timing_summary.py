@@ -0,0 +1,89 @@
+import numpy as np
+from itemattribute import ItemAttribute
+
+
+PHASES = ['iterate', 'measure', 'average', 'save', 'settle_time']
+
+
+def timing_summary(expt, percentiles=(50, 90, 99)):
+    '''
+    Summarizes the per point timing of a run saved with `runinfo.save_timing = True`. For each phase of
+    the experiment loop, and for the iteration of each scan level, returns the number of timed points, the
+    total and mean time, and the requested percentiles of the time per point. Points without a time, such
+    as the averaging of an experiment without an average scan or points that were not measured, are ignored.
+
+    The phases are 'iterate' (setting the scans and waiting their `dt`, summed over the scan levels),
+    'measure' (`runinfo.measure_function`), 'average' (`Experiment.rolling_average`), 'save'
+    (`Experiment.save_point`, including queueing or writing the point to the file) and 'settle_time'
+    (waiting for `ps.Settle` conditions, included in 'iterate'). The scan levels 'scan0', 'scan1', ... only
+    include the points where the scan moved.
+
+    Parameters
+    ----------
+    expt : ps.Experiment or ItemAttribute
+        A run experiment, or an experiment loaded with `ps.load_experiment`
+    percentiles : tuple, optional
+        Percentiles of the time per point to report, defaults to (50, 90, 99)
+
+    Returns
+    -------
+    ItemAttribute
+        keyed by phase and scan level, each an ItemAttribute with the items n, total, mean and
+        p<percentile> in seconds
+    '''
+
+    assert ('timing' in expt.keys()) and (expt.timing is not None), \
+        'The experiment has no timing, run it with runinfo.save_timing = True'
+    timing = expt.timing
+
+    phases = {}
+    for key in PHASES:
+        if key in timing.keys():
+            phases[key] = np.asarray(timing[key], dtype='float64')
+
+    # scan levels that did not move at a point have no iterate time
+    if 'iterate' in phases:
+        iterate = phases['iterate']
+        for level in range(iterate.shape[-1]):
+            phases['scan{}'.format(level)] = iterate[..., level]
+        timed = np.any(np.isfinite(iterate), axis=-1)
+        phases['iterate'] = np.where(timed, np.nansum(iterate, axis=-1), np.nan)
+
+    summary = ItemAttribute()
+    for key, times in phases.items():
+        times = times[np.isfinite(times)]
+
+        summary[key] = ItemAttribute()
+        summary[key].n = len(times)
+        summary[key].total = float(np.sum(times))
+        summary[key].mean = float(np.mean(times)) if len(times) > 0 else np.nan
+        for p in percentiles:
+            summary[key]['p{:g}'.format(p)] = float(np.percentile(times, p)) if len(times) > 0 else np.nan
+
+    return summary
+
+
+def format_timing_summary(summary):
+    '''
+    Formats a summary from `timing_summary` as a table with one row per phase and scan level, times in ms
+
+    Parameters
+    ----------
+    summary : ItemAttribute
+        Summary returned by `timing_summary`
+
+    Returns
+    -------
+    str
+    '''
+    columns = list(next(iter(summary.values())).keys())
+    lines = ['{:<12}'.format('phase') + ''.join('{:>12}'.format(c if c == 'n' else c + ' (ms)') for c in columns)]
+    for key, row in summary.items():
+        cells = []
+        for c in columns:
+            if c == 'n':
+                cells.append('{:>12d}'.format(row[c]))
+            else:
+                cells.append('{:>12.3f}'.format(row[c] * 1e3))
+        lines.append('{:<12}'.format(key) + ''.join(cells))
+    return '\n'.join(lines)
@@ -1,5 +1,7 @@
 from ..general.set_difference import set_difference
 from ..general.first_string import first_string
+from ..general.fill_value import fill_value
+from ..measurement.progress import Progress
 import numpy as np
 
 
@@ -137,14 +139,20 @@ class PlotGenerator(object):
             else:
                 self.data = self.analysis_function(*self.analysis_args)
 
-        self.data = np.ma.masked_where(np.isnan(self.data), self.data)
-
+        # slice before converting to an array, so out of core data only reads the plotted slice from disk
         if (self.d == 2) and (self.data.ndim > 2):
             if self.index3D is None:
                 self.index3D = 0
             self.data_name = self.data_name + '[{}/{}]'.format(self.index3D, self.data.shape[2])
             self.data = self.data[:, :, self.index3D]
 
+        self.data = np.asarray(self.data)
+        # unmeasured points hold nan, or the fill value of integer types
+        if self.data.dtype.kind in 'iu':
+            self.data = np.ma.masked_where(self.data == fill_value(self.data.dtype), self.data)
+        else:
+            self.data = np.ma.masked_where(np.isnan(self.data), self.data)
+
     def get_title(self):
         '''
         Generates the title of the plot
@@ -152,6 +160,8 @@ class PlotGenerator(object):
 
         if not self.expt.runinfo.running:
             return '{}, {}'.format(self.data_name, self.expt.runinfo.file_name)
+        elif isinstance(getattr(self.expt, 'progress', None), Progress):
+            return '{}, {}, {}'.format(self.expt.progress, self.data_name, self.expt.runinfo.file_name)
         elif self.expt.runinfo.ndim == 4:
             return '{}/{}, {}, {}'.format(self.expt.runinfo.scan3.i,
                                           self.expt.runinfo.scan3.n,
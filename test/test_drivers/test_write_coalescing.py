@@ -0,0 +1,128 @@
+'''
+Pytest functions to test write coalescing in InstrumentDriver
+'''
+
+import pyscan as ps
+import pytest
+
+
+class CountingVoltage(ps.TestVoltage):
+    '''
+    TestVoltage that records the strings written to the instrument
+    '''
+
+    __test__ = False
+
+    def __init__(self):
+        super().__init__()
+        self.written = []
+
+    def write(self, string):
+        self.written.append(string)
+        return super().write(string)
+
+
+def measure_voltage(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.v1.voltage
+    return d
+
+
+def test_coalescing_off_by_default():
+    v1 = CountingVoltage()
+    v1.voltage = 0
+    v1.voltage = 0
+    assert v1.written == ['VOLT 0', 'VOLT 0']
+    assert v1.n_skipped_writes == 0
+
+
+def test_coalescing_driver():
+    v1 = CountingVoltage()
+    v1.coalesce_writes = True
+    v1.voltage = 0
+    v1.voltage = 1
+    v1.voltage = 1.0
+    v1.power = 1
+    v1.output_state = 'off'
+    v1.output_state = '0'
+    v1.output_state = 'on'
+
+    assert v1.written == ['VOLT 0', 'VOLT 1', 'POW 1', 'OUTP 0', 'OUTP 1']
+    assert v1.n_skipped_writes == 2
+
+
+def test_coalescing_only_written_values():
+    v1 = CountingVoltage()
+    v1.coalesce_writes = True
+
+    # the defaults set in __init__ and queried values were never written
+    assert v1.voltage == 0
+    v1.voltage = 0
+    v1._power = 10
+    v1.power = 10
+    assert v1.written == ['VOLT 0', 'POW 10']
+
+    # a query does not replace the last written value
+    v1._voltage = 5
+    v1.voltage = 0
+    assert v1.written == ['VOLT 0', 'POW 10']
+    assert v1.n_skipped_writes == 1
+
+
+def test_coalescing_tolerance():
+    v1 = CountingVoltage()
+    v1.coalesce_writes = True
+    v1.coalesce_tolerance = 1e-3
+    v1.voltage = 0
+    v1.voltage = 0.0005
+    v1.voltage = 0.002
+    assert v1.written == ['VOLT 0', 'VOLT 0.002']
+    assert v1.voltage == 0.002
+
+
+def test_coalescing_property():
+    v1 = CountingVoltage()
+    v1._power_settings['coalesce'] = True
+    v1.voltage = 0
+    v1.power = 1
+    v1.power = 1
+    assert v1.written == ['VOLT 0', 'POW 1']
+
+    v1.coalesce_writes = True
+    v1._voltage_settings['coalesce'] = False
+    v1._voltage_settings['coalesce_tolerance'] = 1
+    v1.voltage = 0
+    assert v1.written == ['VOLT 0', 'POW 1', 'VOLT 0']
+
+
+def test_coalescing_still_validates():
+    v1 = CountingVoltage()
+    v1.coalesce_writes = True
+    with pytest.raises(Exception):
+        v1.voltage = 11
+    with pytest.raises(Exception):
+        v1.power = 2
+
+
+def test_coalescing_experiment(tmp_path):
+    devices = ps.ItemAttribute()
+    devices.v1 = CountingVoltage()
+    devices.v1.coalesce_writes = True
+    devices.v2 = ps.TestVoltage()
+
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'v1': [0, 1, 1, 2]}, 'voltage')
+    runinfo.scan1 = ps.PropertyScan({'v2': [0, 1]}, 'voltage')
+    runinfo.measure_function = measure_voltage
+    runinfo.initial_pause = 0
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    # repeated values are skipped
+    assert devices.v1.written == ['VOLT 0', 'VOLT 1', 'VOLT 2', 'VOLT 0', 'VOLT 1', 'VOLT 2']
+    assert expt.skipped_writes == {'v1': 2, 'v2': 0}
+    assert ps.load_experiment(expt.get_save_name()).skipped_writes == {'v1': 2, 'v2': 0}
+
+    expt.run()
+    assert expt.skipped_writes == {'v1': 2, 'v2': 0}
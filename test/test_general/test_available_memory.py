@@ -0,0 +1,33 @@
+import os
+import pyscan as ps
+
+
+def no_psutil():
+    try:
+        import psutil  # noqa: F401
+        return False
+    except ImportError:
+        return True
+
+
+def test_available_memory():
+    memory = ps.available_memory()
+    assert (memory is None) or (isinstance(memory, int) and (memory > 0))
+
+
+def test_available_memory_meminfo(tmp_path):
+    meminfo = tmp_path / 'meminfo'
+    meminfo.write_text('MemTotal:       16000000 kB\nMemFree:          100000 kB\nMemAvailable:    8000000 kB\n')
+
+    if no_psutil():
+        # the page cache counted by MemAvailable is used, not just the free pages
+        assert ps.available_memory(str(meminfo)) == 8000000 * 1024
+
+
+def test_available_memory_unknown(monkeypatch, tmp_path):
+    def sysconf(name):
+        raise ValueError('unknown configuration name')
+
+    monkeypatch.setattr(os, 'sysconf', sysconf, raising=False)
+    if no_psutil():
+        assert ps.available_memory(str(tmp_path / 'meminfo')) is None
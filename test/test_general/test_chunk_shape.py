@@ -0,0 +1,15 @@
+import pyscan as ps
+import pytest
+
+
+@pytest.mark.parametrize("scan_dims, data_shape, itemsize, target_bytes, expected", [
+    ((10,), (), 8, 2**20, (10,)),
+    ((10, 20, 30), (), 8, 2**20, (10, 1, 1)),
+    ((10, 20), (1024,), 8, 2**20, (10, 1, 1024)),
+    ((1000, 20), (1024,), 8, 2**20, (125, 1, 1024)),
+    ((10, 20), (2048, 2048), 2, 2**20, (1, 1, 256, 2048)),
+    ((), (2048, 2048), 8, 2**20, (64, 2048)),
+    ((10,), (0,), 8, 2**20, (10, 1))])
+def test_chunk_shape(scan_dims, data_shape, itemsize, target_bytes, expected):
+    assert ps.chunk_shape(scan_dims, data_shape, itemsize, target_bytes) == expected, \
+        f"chunk_shape({scan_dims}, {data_shape}, {itemsize}, {target_bytes}) gave wrong output"
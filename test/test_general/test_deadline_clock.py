@@ -0,0 +1,57 @@
+import pyscan as ps
+import numpy as np
+from time import sleep
+
+
+def test_deadline_clock_start():
+    clock = ps.DeadlineClock()
+    clock.start(10)
+    assert 10 <= clock.now() < 10.1
+    assert clock.deadline is None
+
+
+def test_deadline_clock_wait_until():
+    clock = ps.DeadlineClock()
+    deadline = clock.now() + 0.02
+    late = clock.wait_until(deadline)
+
+    assert clock.now() >= deadline
+    # a generous ceiling, the scheduler can be slow on loaded machines
+    assert 0 <= late < 0.05
+    assert clock.deadline == deadline
+
+
+def test_deadline_clock_does_not_accumulate():
+    clock = ps.DeadlineClock()
+    for i in range(1, 11):
+        # work that takes half of each period
+        sleep(0.005)
+        clock.wait_until(i * 0.01)
+
+    # the work is absorbed by each wait, so 10 periods take 0.1 s rather than 0.15 s
+    assert 0.1 <= clock.now() < 0.14
+
+
+def test_deadline_clock_missed_deadline():
+    clock = ps.DeadlineClock()
+    sleep(0.01)
+    late = clock.wait_until(0.005)
+    assert late >= 0.005
+
+
+def test_deadline_clock_wait_zero():
+    clock = ps.DeadlineClock()
+    assert clock.wait(0) == 0
+    assert clock.deadline is None
+
+
+def test_deadline_clock_mark():
+    clock = ps.DeadlineClock()
+    timestamp, jitter = clock.mark()
+    assert np.isnan(jitter)
+
+    clock.wait(0.01)
+    timestamp, jitter = clock.mark()
+    assert timestamp >= 0.01
+    assert 0 <= jitter < 0.05
+    assert clock.deadline is None
@@ -0,0 +1,17 @@
+import pyscan as ps
+
+
+def test_delta_product():
+    points = list(ps.delta_product([range(2), range(2)]))
+    assert points == [((0, 0), (-1, -1)), ((1, 0), (1, 0)), ((0, 1), (-1, 1)), ((1, 1), (1, 0))]
+
+
+def test_delta_product_start():
+    points = list(ps.delta_product([range(2), range(3)], start=(1, 1)))
+    assert points == [((1, 1), (-1, -1)), ((0, 2), (-1, 1)), ((1, 2), (1, 0))]
+
+
+def test_delta_product_continuous_start():
+    iterator = ps.delta_product([range(2), range(1)], continuous=True, start=(1, 3))
+    points = [next(iterator) for _ in range(3)]
+    assert points == [((1, 3), (-1, -1)), ((0, 4), (-1, 1)), ((1, 4), (1, 0))]
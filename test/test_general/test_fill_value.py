@@ -0,0 +1,27 @@
+import pyscan as ps
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("dtype", ['float64', 'float32', 'complex128'])
+def test_fill_value_nan(dtype):
+    value = ps.fill_value(dtype)
+    assert np.isnan(value), f"fill_value({dtype}) is not nan"
+    assert value.dtype == np.dtype(dtype), f"fill_value({dtype}) has dtype {value.dtype}"
+
+
+@pytest.mark.parametrize("dtype,expected", [
+    ('int8', -128),
+    ('int64', np.iinfo('int64').min),
+    ('uint16', 65535),
+    ('uint8', 255)])
+def test_fill_value_integer(dtype, expected):
+    value = ps.fill_value(dtype)
+    assert value == expected, f"fill_value({dtype}) is not {expected}"
+    assert value.dtype == np.dtype(dtype), f"fill_value({dtype}) has dtype {value.dtype}"
+
+
+def test_fill_value_bool():
+    value = ps.fill_value('bool')
+    assert not value, "fill_value(bool) is not False"
+    assert value.dtype == np.dtype('bool'), f"fill_value(bool) has dtype {value.dtype}"
@@ -0,0 +1,35 @@
+import pyscan as ps
+import numpy as np
+
+
+def test_growable_array_append():
+    array = ps.GrowableArray(np.array([]), capacity=2)
+
+    for i in range(5):
+        view = array.append(i)
+
+    assert array.n == 5
+    assert array.capacity == 8
+    assert np.all(view == [0, 1, 2, 3, 4])
+    assert np.all(array.view == view)
+
+
+def test_growable_array_axis():
+    array = ps.GrowableArray(np.zeros((2, 1, 3)), axis=1, capacity=1)
+
+    array.append(1)
+    view = array.append(np.full((2, 3), 2))
+
+    assert view.shape == (2, 3, 3)
+    assert np.all(view[:, 1] == 1)
+    assert np.all(view[:, 2] == 2)
+    assert array.capacity == 4
+
+
+def test_growable_array_view_is_not_copied():
+    array = ps.GrowableArray(np.zeros(3), capacity=10)
+    view = array.view
+    view[0] = 5
+
+    assert array.view[0] == 5
+    assert array.dtype == np.dtype('float64')
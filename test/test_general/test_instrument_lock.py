@@ -0,0 +1,46 @@
+import gc
+import weakref
+import importlib
+import pyscan as ps
+
+
+def test_instrument_lock_shared_instrument():
+    mainframe = object()
+    port1 = ps.ItemAttribute()
+    port1.instrument = mainframe
+    port2 = ps.ItemAttribute()
+    port2.instrument = mainframe
+
+    assert ps.instrument_lock(port1) is ps.instrument_lock(port2)
+
+
+def test_instrument_lock_separate_devices():
+    v1 = ps.TestVoltage()
+    v2 = ps.TestVoltage()
+
+    assert ps.instrument_lock(v1) is not ps.instrument_lock(v2)
+    assert ps.instrument_lock(v1) is ps.instrument_lock(v1)
+
+
+class Session(object):
+    '''
+    Stands in for a pyvisa session
+    '''
+
+
+def test_instrument_lock_releases_instrument():
+    registry = importlib.import_module('pyscan.general.instrument_lock')
+    port = ps.ItemAttribute()
+    port.instrument = Session()
+    lock = ps.instrument_lock(port)
+    assert lock is ps.instrument_lock(port)
+
+    key = id(port.instrument)
+    reference = weakref.ref(port.instrument)
+    assert key in registry._locks
+    del port
+    gc.collect()
+
+    # the registry does not keep the session alive
+    assert reference() is None
+    assert key not in registry._locks
@@ -0,0 +1,131 @@
+import pyscan as ps
+import numpy as np
+import pytest
+
+
+def test_scan_schedule_matches_delta_product():
+    schedule = ps.ScanSchedule((2, 1, 3))
+    points = list(schedule)
+
+    assert len(schedule) == 6
+    assert points[:3] == [((0, 0, 0), (-1, -1, -1)), ((1, 0, 0), (1, 0, 0)), ((0, 0, 1), (-1, 0, 1))]
+    assert [indicies for indicies, deltas in points] == [(i, 0, j) for j in range(3) for i in range(2)]
+
+
+def test_scan_schedule_random_access():
+    schedule = ps.ScanSchedule((3, 4, 2))
+    points = list(schedule)
+
+    for k, (indicies, deltas) in enumerate(points):
+        assert schedule.point(k) == indicies
+        assert schedule.index(indicies) == k
+
+    with pytest.raises(AssertionError):
+        schedule.point(24)
+
+
+def test_scan_schedule_seek():
+    schedule = ps.ScanSchedule((3, 4), start=5)
+    assert next(schedule) == ((2, 1), (-1, -1))
+    assert next(schedule) == ((0, 2), (-1, 1))
+
+    schedule.seek(11)
+    assert list(schedule) == [((2, 3), (-1, -1))]
+
+
+def test_scan_schedule_endless():
+    schedule = ps.ScanSchedule((2, None))
+    assert schedule.n_points is None
+    with pytest.raises(TypeError):
+        len(schedule)
+
+    points = [next(schedule) for _ in range(2001)]
+    assert points[-1] == ((0, 1000), (-1, 1))
+    assert schedule.point(10 ** 9) == (0, 5 * 10 ** 8)
+
+
+def test_scan_schedule_chunk():
+    schedule = ps.ScanSchedule((3, 1, 4))
+    points = list(schedule)
+
+    for k in [0, 1, 5, 10]:
+        indicies, deltas = schedule.chunk(k, 4)
+        assert indicies.shape == deltas.shape == (min(4, 12 - k), 3)
+        assert [tuple(i) for i in indicies] == [p[0] for p in points[k:k + 4]]
+        assert [tuple(d) for d in deltas] == [p[1] for p in points[k:k + 4]]
+
+    indicies, deltas = ps.ScanSchedule((2, None)).chunk(6, 3)
+    assert np.all(indicies == [[0, 3], [1, 3], [0, 4]])
+
+
+def test_scan_schedule_snake():
+    schedule = ps.ScanSchedule((3, 2, 2), snake=(True, True, False))
+    points = list(schedule)
+
+    assert [indicies for indicies, deltas in points[:7]] == [
+        (0, 0, 0), (1, 0, 0), (2, 0, 0), (2, 1, 0), (1, 1, 0), (0, 1, 0), (0, 1, 1)]
+    # turning around leaves the serpentine loops unchanged
+    assert points[3][1] == (0, 1, 0)
+    assert points[6][1] == (0, 0, 1)
+    assert points[4][1] == (-1, 0, 0)
+
+    for k, (indicies, deltas) in enumerate(points):
+        assert schedule.point(k) == indicies
+        assert schedule.index(indicies) == k
+
+    indicies, deltas = schedule.chunk(2, 5)
+    assert [tuple(i) for i in indicies] == [p[0] for p in points[2:7]]
+    assert [tuple(d) for d in deltas] == [p[1] for p in points[2:7]]
+
+
+def test_scan_schedule_skip():
+    schedule = ps.ScanSchedule((4, 3))
+    next(schedule)
+    next(schedule)
+    schedule.skip(0)
+
+    assert schedule.k == 4
+    assert next(schedule) == ((0, 1), (-1, 1))
+    next(schedule)
+    next(schedule)
+    next(schedule)
+    schedule.skip(0)
+    # skipping at the end of a pass changes nothing
+    assert next(schedule) == ((0, 2), (-1, 1))
+    schedule.skip(0)
+    assert list(schedule) == []
+
+
+def test_scan_schedule_skip_snake():
+    schedule = ps.ScanSchedule((3, 2, 2), snake=(True, False, False))
+    next(schedule)
+    schedule.skip(0)
+    # the reversed pass starts from the end
+    assert next(schedule) == ((2, 1, 0), (0, 1, 0))
+    schedule.skip(0)
+    assert next(schedule) == ((0, 0, 1), (0, -1, 1))
+    assert schedule.k == 7
+
+
+def test_scan_schedule_first_missing():
+    schedule = ps.ScanSchedule((3, 2), snake=(True, False))
+    done = np.zeros((3, 2), dtype=bool)
+    assert schedule.first_missing(done) == 0
+
+    # the second line runs backwards, (1, 1) is the fifth point
+    for k in [0, 1, 2, 3, 5]:
+        done[schedule.point(k)] = True
+    assert schedule.first_missing(done) == 4
+    assert schedule.first_missing(done, block=2) == 4
+
+    done[:] = True
+    assert schedule.first_missing(done) == 6
+
+
+def test_scan_schedule_first_missing_endless():
+    schedule = ps.ScanSchedule((2, None))
+    done = np.ones((2, 3), dtype=bool)
+    assert schedule.first_missing(done) == 6
+
+    done[1, 1] = False
+    assert schedule.first_missing(done) == 3
@@ -310,3 +310,50 @@ def test_continuous_reallocate(c_runinfo, devices):
         assert x3.shape == (2, 2, 2)
         assert np.allclose(x3[0], [[0, 0], [0, 0]])
         assert np.allclose(x3[1], [[1, 1], [1, 1]])
+
+
+def test_preallocate_chunks(runinfo, devices):
+    runinfo.chunks = {'x3': (1, 1, 2)}
+    expt = ps.Experiment(runinfo, devices)
+    expt.check_runinfo()
+    data = expt.runinfo.measure_function(expt)
+    expt.preallocate(data)
+
+    with h5py.File('./backup/{}'.format(expt.runinfo.file_name + '.hdf5'), 'r') as f:
+        assert f['x1'].chunks == (2,)
+        assert f['x2'].chunks == (2, 2)
+        assert f['x3'].chunks == (1, 1, 2)
+
+
+def test_continuous_preallocate_chunks(c_runinfo, devices):
+    expt = ps.Experiment(c_runinfo, devices)
+    expt.check_runinfo()
+    data = expt.runinfo.measure_function(expt)
+    expt.runinfo.scans[-1].iterate(expt, 0, -1)
+    expt.preallocate(data)
+
+    with h5py.File('./backup/{}'.format(expt.runinfo.file_name + '.hdf5'), 'r') as f:
+        assert f['x1'].chunks == (10,)
+        assert f['x3'].chunks == (10, 2, 2)
+
+
+def test_preallocate_storage_options(runinfo, devices):
+    runinfo.storage_options = {
+        'default': {'compression': 'lzf'},
+        'x2': {'compression': 'gzip', 'shuffle': False, 'chunk_cache': 2**22},
+        'x3': {'compression': None}}
+    expt = ps.Experiment(runinfo, devices)
+    expt.check_runinfo()
+    data = expt.runinfo.measure_function(expt)
+    expt.preallocate(data)
+
+    assert expt.get_storage_options('x2') == {
+        'compression': 'gzip', 'shuffle': False, 'compression_opts': 1, 'rdcc_nbytes': 2**22}
+
+    with h5py.File('./backup/{}'.format(expt.runinfo.file_name + '.hdf5'), 'r') as f:
+        assert f['x1'].compression == 'lzf'
+        assert f['x1'].shuffle
+        assert f['x2'].compression == 'gzip'
+        assert f['x2'].compression_opts == 1
+        assert not f['x2'].shuffle
+        assert f['x3'].compression is None
@@ -0,0 +1,90 @@
+import pyscan as ps
+import pytest
+import h5py
+import numpy as np
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    devices.v2 = ps.TestVoltage()
+    return devices
+
+
+def measure_up_to_3D(expt):
+    d = ps.ItemAttribute()
+
+    d.x1 = expt.runinfo.scan0.i + 10 * expt.runinfo.scan1.i
+    d.x2 = [d.x1 for _ in range(2)]
+    d.x3 = [[d.x1, d.x1] for _ in range(2)]
+
+    return d
+
+
+def get_runinfo(outer_scan):
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_up_to_3D
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.2)}, 'voltage', dt=0)
+    runinfo.scan1 = outer_scan
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+@pytest.mark.parametrize("outer_scan", [
+    lambda: ps.PropertyScan({'v2': ps.drange(0, 0.1, 0.1)}, 'voltage', dt=0),
+    lambda: ps.AverageScan(3),
+    lambda: ps.ContinuousScan(n_max=3)])
+def test_out_of_core_matches_memory(devices, tmp_path, outer_scan):
+    expt = ps.Experiment(get_runinfo(outer_scan()), devices, data_dir=tmp_path)
+    expt.run()
+
+    runinfo = get_runinfo(outer_scan())
+    runinfo.out_of_core = True
+    ooc_expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    ooc_expt.run()
+
+    for key in ['x1', 'x2', 'x3']:
+        assert isinstance(ooc_expt[key], ps.DatasetView)
+        assert ooc_expt[key].shape == expt[key].shape
+        assert np.allclose(np.asarray(ooc_expt[key]), expt[key], equal_nan=True)
+
+    loaded = ps.load_experiment(ooc_expt.get_save_name())
+    assert np.allclose(loaded.x3, expt.x3, equal_nan=True)
+
+
+def test_dataset_view_slices(devices, tmp_path):
+    runinfo = get_runinfo(ps.PropertyScan({'v2': ps.drange(0, 0.1, 0.1)}, 'voltage', dt=0))
+    runinfo.out_of_core = True
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert len(expt.x3) == 3
+    assert expt.x3.ndim == 4
+    assert expt.x3.dtype == np.dtype('float64')
+    assert np.allclose(expt.x3[:, 1, 0, 0], [10, 11, 12])
+
+    expt.x1[0, 0] = -1
+    assert expt.x1[0, 0] == -1
+
+
+def test_dataset_view_reads_read_only(devices, tmp_path, monkeypatch):
+    runinfo = get_runinfo(ps.PropertyScan({'v2': ps.drange(0, 0.1, 0.1)}, 'voltage', dt=0))
+    runinfo.out_of_core = True
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    modes = []
+    h5py_file = h5py.File
+
+    def File(name, mode='r', **kwargs):
+        modes.append(mode)
+        return h5py_file(name, mode, **kwargs)
+
+    monkeypatch.setattr(h5py, 'File', File)
+
+    # after the run, reads do not open the save file for writing
+    assert expt.x1.shape == (3, 2)
+    assert np.allclose(expt.x1[:, 1], [10, 11, 12])
+    assert np.allclose(np.asarray(expt.x2)[:, 0, 0], [0, 1, 2])
+    assert set(modes) == {'r'}
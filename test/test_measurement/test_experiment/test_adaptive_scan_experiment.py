@@ -0,0 +1,82 @@
+import pyscan as ps
+import pytest
+import numpy as np
+
+
+def peak(v, center):
+    return 1 / (1 + ((v - center) / 0.02) ** 2)
+
+
+def measure_peak(expt):
+    d = ps.ItemAttribute()
+    d.x1 = peak(expt.devices.v1.voltage, expt.devices.v2.voltage)
+    d.x2 = [d.x1, 2 * d.x1]
+    return d
+
+
+def measure_crash(expt):
+    if expt.runinfo.indicies == (12, 1):
+        raise RuntimeError('instrument timeout')
+    return measure_peak(expt)
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    devices.v2 = ps.TestVoltage()
+    return devices
+
+
+def make_runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_peak
+    runinfo.scan0 = ps.AdaptiveScan({'v1': (0, 1)}, 'voltage', n_points=30, measured='x1')
+    runinfo.scan1 = ps.PropertyScan({'v2': [0.3, 0.6]}, 'voltage')
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+def test_adaptive_scan_experiment(devices, tmp_path):
+    runinfo = make_runinfo()
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert expt.v1_voltage.shape == (30, 2)
+    assert expt.x1.shape == (30, 2)
+    assert expt.x2.shape == (30, 2, 2)
+    assert np.allclose(expt.x1, peak(expt.v1_voltage, np.array([0.3, 0.6])))
+
+    # each pass refines around its own peak
+    for j, center in enumerate([0.3, 0.6]):
+        values = expt.v1_voltage[:, j]
+        assert len(np.unique(values)) == 30
+        assert np.all((values >= 0) & (values <= 1))
+        assert np.sum(np.abs(values - center) < 0.1) > 15
+
+    loaded = ps.load_experiment(expt.get_save_name())
+    assert sorted(loaded.runinfo.measured) == ['x1', 'x2']
+    assert np.allclose(loaded.v1_voltage, expt.v1_voltage)
+    assert np.allclose(loaded.x1, expt.x1)
+
+    grid, data = runinfo.scan0.grid(loaded, 'x1', 101)
+    assert data.shape == (101, 2)
+    assert np.allclose(grid, np.linspace(0, 1, 101))
+    assert np.abs(data[:, 0] - peak(grid, 0.3)).max() < 0.05
+
+
+def test_adaptive_scan_resume(devices, tmp_path):
+    expected = ps.Experiment(make_runinfo(), devices, data_dir=tmp_path)
+    expected.run()
+
+    runinfo = make_runinfo()
+    runinfo.measure_function = measure_crash
+    crashed = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    with pytest.raises(RuntimeError):
+        crashed.run()
+
+    resumed = ps.Experiment(make_runinfo(), devices, data_dir=tmp_path)
+    resumed.resume(crashed.get_save_name())
+
+    assert np.allclose(resumed.v1_voltage, expected.v1_voltage)
+    assert np.allclose(resumed.x1, expected.x1)
@@ -0,0 +1,45 @@
+import pyscan as ps
+import pytest
+import numpy as np
+import h5py
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_up_to_3D
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.1)}, 'voltage', dt=0)
+    runinfo.scan1 = ps.AverageScan(4)
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    return devices
+
+
+def measure_up_to_3D(expt):
+    d = ps.ItemAttribute()
+
+    d.x1 = expt.runinfo.scan0.i + expt.runinfo.scan1.i
+    d.x2 = [d.x1 for _ in range(2)]
+    d.x3 = [[d.x1, d.x1] for _ in range(2)]
+
+    return d
+
+
+def test_experiment_post_measure_average(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    # mean of [0, 1, 2, 3] and [1, 2, 3, 4]
+    assert np.allclose(expt.x1, [1.5, 2.5])
+    assert np.allclose(expt.x2, [[1.5, 1.5], [2.5, 2.5]])
+    assert np.allclose(expt.x3[1], np.full((2, 2), 2.5))
+
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert np.allclose(f['x1'][:], [1.5, 2.5])
+        assert np.allclose(f['x3'][:], expt.x3)
@@ -0,0 +1,51 @@
+import pyscan as ps
+import pytest
+import numpy as np
+import h5py
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_up_to_3D
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.1)}, 'voltage', dt=0)
+    runinfo.scan1 = ps.ContinuousScan(n_max=3)
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    return devices
+
+
+def measure_up_to_3D(expt):
+    d = ps.ItemAttribute()
+
+    d.x1 = expt.runinfo.scan0.i + 10 * expt.runinfo.scan1.i
+    d.x2 = [d.x1 for _ in range(2)]
+    d.x3 = [[d.x1, d.x1] for _ in range(2)]
+
+    return d
+
+
+def test_experiment_post_measure_2D(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    # the experiment stops after the first point of the last continuous iteration
+    x1 = np.array([[0, 10, 20], [1, 11, np.nan]])
+
+    assert np.allclose(expt.iteration, [0, 1, 2])
+    assert np.allclose(expt.x1, x1, equal_nan=True)
+    assert expt.x2.shape == (2, 3, 2)
+    assert np.allclose(expt.x2[:, :, 1], x1, equal_nan=True)
+    assert expt.x3.shape == (2, 3, 2, 2)
+    assert np.allclose(expt.x3[:, :, 1, 0], x1, equal_nan=True)
+
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert f['iteration'].shape == (3,)
+        assert np.allclose(f['x1'][:], x1, equal_nan=True)
+        assert f['x3'].shape == (2, 3, 2, 2)
@@ -0,0 +1,108 @@
+import pyscan as ps
+import pytest
+import numpy as np
+from time import sleep
+
+
+def measure_slow(expt):
+    # measuring and saving take a large part of the sample period
+    sleep(0.01)
+    d = ps.ItemAttribute()
+    d.x1 = expt.runinfo.scan0.i
+    return d
+
+
+def measure_voltage(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.v1.voltage
+    return d
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    return devices
+
+
+def test_continuous_scan_fixed_rate(devices, tmp_path):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.ContinuousScan(n_max=11, dt=0.02)
+    runinfo.measure_function = measure_slow
+    runinfo.initial_pause = 0
+    runinfo.save_timing = True
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    loaded = ps.load_experiment(expt.get_save_name())
+    timestamp = loaded.timing.timestamp
+    jitter = loaded.timing.jitter
+
+    assert timestamp.shape == (11,)
+    # the period is dt, not dt plus the time to measure, so the lateness of single samples does not
+    # accumulate: 9 periods take 0.18 s rather than 0.27 s
+    assert 0.15 < timestamp[9] - timestamp[0] < 0.23
+    assert np.all((jitter[:10] >= 0) & (jitter[:10] < 0.05))
+    assert loaded.timing.start_time == expt.start_time
+
+
+def test_continuous_scan_overrun(devices, tmp_path):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.ContinuousScan(n_max=6, dt=0.004)
+    runinfo.measure_function = measure_slow
+    runinfo.initial_pause = 0
+    runinfo.save_timing = True
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    timestamp = ps.load_experiment(expt.get_save_name()).timing.timestamp
+    # missed periods are dropped instead of run back to back
+    assert np.all(np.diff(timestamp[:5]) > 0.01)
+
+
+def test_property_scan_timing(devices, tmp_path):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage', dt=0.005)
+    runinfo.scan1 = ps.RepeatScan(2)
+    runinfo.measure_function = measure_voltage
+    runinfo.initial_pause = 0
+    runinfo.save_timing = True
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    timing = ps.load_experiment(expt.get_save_name()).timing
+    assert timing.timestamp.shape == (4, 2)
+    assert np.all(np.diff(timing.timestamp.T.flatten()) >= 0.005)
+    assert np.all((timing.jitter >= 0) & (timing.jitter < 0.05))
+
+
+def test_no_timing(devices, tmp_path):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage')
+    runinfo.measure_function = measure_voltage
+    runinfo.initial_pause = 0
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    # timing is only saved when it is asked for
+    loaded = ps.load_experiment(expt.get_save_name())
+    assert 'timing' not in loaded.keys()
+
+
+def test_jitter_nan_without_dt(devices, tmp_path):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage')
+    runinfo.measure_function = measure_voltage
+    runinfo.initial_pause = 0
+    runinfo.save_timing = True
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    timing = ps.load_experiment(expt.get_save_name()).timing
+    assert np.all(np.diff(timing.timestamp) > 0)
+    assert np.all(np.isnan(timing.jitter))
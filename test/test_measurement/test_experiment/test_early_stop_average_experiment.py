@@ -0,0 +1,108 @@
+import pyscan as ps
+import pytest
+import numpy as np
+
+
+VOLTAGES = [0, 0.1, 0.2, 0.4]
+N_MAX = 8
+TARGET = 0.05
+NOISE = np.random.default_rng(0).normal(size=(N_MAX, len(VOLTAGES)))
+
+
+def measure_noisy(expt):
+    # the noise grows with the voltage, so higher voltages need more repeats
+    d = ps.ItemAttribute()
+    i, j = expt.runinfo.scan0.i, expt.runinfo.scan1.i
+    d.x1 = VOLTAGES[j] + VOLTAGES[j] * NOISE[i, j]
+    d.x2 = [d.x1, 2 * d.x1]
+    return d
+
+
+def measure_crash(expt):
+    if expt.runinfo.indicies == (3, 2):
+        raise RuntimeError('instrument timeout')
+    return measure_noisy(expt)
+
+
+def expected_counts():
+    counts, means, stderrs = [], [], []
+    for j, v in enumerate(VOLTAGES):
+        samples = v + v * NOISE[:, j]
+        for n in range(2, N_MAX + 1):
+            stderr = np.std(samples[:n], ddof=1) / np.sqrt(n)
+            if stderr <= TARGET:
+                break
+        counts.append(n)
+        means.append(np.mean(samples[:n]))
+        stderrs.append(stderr)
+    return np.array(counts), np.array(means), np.array(stderrs)
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    return devices
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.AverageScan(N_MAX, target_stderr=TARGET, measured='x1')
+    runinfo.scan1 = ps.PropertyScan({'v1': VOLTAGES}, 'voltage')
+    runinfo.measure_function = measure_noisy
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+@pytest.mark.parametrize('option', [None, 'pipeline', 'async_save'])
+def test_early_stop_average(runinfo, devices, tmp_path, option):
+    counts, means, stderrs = expected_counts()
+    assert len(set(counts)) > 1, 'the test noise should need different numbers of repeats'
+
+    runinfo.save_timing = True
+    if option is not None:
+        runinfo[option] = True
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert np.all(expt.convergence.count == counts)
+    assert np.allclose(expt.convergence.stderr, stderrs)
+    assert np.allclose(expt.x1, means)
+    assert np.allclose(expt.x2, np.stack([means, 2 * means], axis=1))
+
+    loaded = ps.load_experiment(expt.get_save_name())
+    assert np.all(loaded.convergence.count == counts)
+    assert np.allclose(loaded.convergence.stderr, stderrs)
+    assert np.allclose(loaded.x1, means)
+
+    # skipped repeats are never measured
+    timestamp = loaded.timing.timestamp
+    assert np.sum(np.isfinite(timestamp)) == np.sum(counts)
+
+
+def test_early_stop_average_resume(runinfo, devices, tmp_path):
+    counts, means, stderrs = expected_counts()
+    assert counts[2] > 3, 'the crash should interrupt the averaging of a point'
+
+    runinfo.measure_function = measure_crash
+    crashed = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    with pytest.raises(RuntimeError):
+        crashed.run()
+
+    runinfo.measure_function = measure_noisy
+    resumed = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    resumed.resume(crashed.get_save_name())
+
+    assert np.all(resumed.convergence.count == counts)
+    assert np.allclose(resumed.convergence.stderr, stderrs)
+    assert np.allclose(resumed.x1, means)
+
+
+def test_early_stop_average_scan0_only(runinfo, devices, tmp_path):
+    runinfo.scan0 = ps.PropertyScan({'v1': VOLTAGES}, 'voltage')
+    runinfo.scan1 = ps.AverageScan(N_MAX, target_stderr=TARGET, measured='x1')
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    with pytest.raises(AssertionError):
+        expt.run()
@@ -0,0 +1,146 @@
+import pyscan as ps
+import pytest
+import numpy as np
+from time import sleep
+import pyscan.measurement.experiment as experiment
+
+
+def measure_frame(expt):
+    sleep(0.01)
+    d = ps.ItemAttribute()
+    d.x1 = 1.0
+    d.frame = np.zeros((32, 32), dtype='uint16')
+    return d
+
+
+def reduce_frame(data):
+    d = ps.ItemAttribute()
+    d.x1 = data.x1
+    d.total = float(np.sum(data.frame))
+    return d
+
+
+def measure_fail(expt):
+    raise RuntimeError('measure_function should not be called')
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    devices.v2 = ps.TestVoltage()
+    return devices
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.9)}, 'voltage', dt=0.01)
+    runinfo.scan1 = ps.PropertyScan({'v2': ps.drange(0, 0.1, 0.3)}, 'voltage', dt=0.5)
+    runinfo.measure_function = measure_frame
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+def test_estimate(runinfo, devices, tmp_path):
+    runinfo.save_timing = True
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    estimate = expt.estimate(n_trials=2)
+
+    assert estimate.n_points == 40
+    assert np.isclose(estimate.wait_time, 40 * 0.01 + 4 * 0.5)
+    assert 0.01 <= estimate.point_time < 0.02
+    assert estimate.save_time > 0
+    assert np.isclose(estimate.wall_time, estimate.wait_time + 40 * (estimate.point_time + estimate.save_time))
+
+    data_bytes = 40 * 8 + 40 * 32 * 32 * 2
+    timing_bytes = 40 * (3 * 8 + 5 * 4)
+    assert estimate.memory == data_bytes + timing_bytes
+    # scan values, checkpoint and timing are saved with the data
+    assert estimate.disk == data_bytes + (10 + 4) * 8 + 40 + timing_bytes
+    assert (estimate.available_memory is None) or (estimate.available_memory > 0)
+
+    # nothing is saved or set by the estimate
+    assert not (tmp_path / '{}.hdf5'.format(expt.runinfo.file_name)).exists()
+    assert devices.v1.voltage == 0
+
+
+def test_estimate_wall_time_of_run(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    estimate = expt.estimate()
+
+    start = experiment.perf_counter()
+    expt.run()
+    assert experiment.perf_counter() - start == pytest.approx(estimate.wall_time, rel=0.3)
+
+
+def test_estimate_point_time(runinfo, devices, tmp_path):
+    runinfo.measure_function = measure_fail
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    estimate = expt.estimate(point_time=1, data=measure_frame(expt))
+
+    assert estimate.point_time == 1
+    assert estimate.wall_time > 40
+
+
+def test_estimate_scans(runinfo, devices, tmp_path):
+    runinfo.checkpoint = False
+    runinfo.pipeline = True
+    runinfo.scan0.snake = True
+    runinfo.scan2 = ps.AverageScan(3, dt=0.1)
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    estimate = expt.estimate(point_time=0.01, data=measure_frame(expt))
+
+    assert estimate.n_points == 120
+    # the serpentine scan stays put when it turns around
+    assert np.isclose(estimate.wait_time, (120 - 11) * 0.01 + 12 * 0.5 + 3 * 0.1)
+    assert np.isclose(estimate.wall_time, estimate.wait_time + 120 * max(0.01, estimate.save_time))
+    # repeats are averaged in place
+    assert estimate.memory == 40 * 8 + 40 * 32 * 32 * 8
+
+
+def test_estimate_reduce_function(runinfo, devices, tmp_path):
+    runinfo.reduce_function = reduce_frame
+    runinfo.reduce_workers = 2
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    estimate = expt.estimate(point_time=0.01, data=measure_frame(expt))
+
+    # only the reduced data is saved
+    assert estimate.memory == 40 * 8 * 2
+    assert estimate.reduce_time > 0
+    assert np.isclose(estimate.wall_time, estimate.wait_time + 40 * max(0.01 + estimate.save_time,
+                                                                       estimate.reduce_time / 2))
+
+
+def test_estimate_continuous(runinfo, devices, tmp_path):
+    runinfo.scan1 = ps.ContinuousScan(n_max=3)
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    estimate = expt.estimate(point_time=0, data=measure_frame(expt))
+    assert estimate.n_points == 21
+
+    runinfo.scan1.n_max = None
+    with pytest.raises(AssertionError):
+        expt.estimate()
+
+
+def test_estimate_storage_options(runinfo, devices, tmp_path):
+    runinfo.storage_options = {'frame': {'compression': 'gzip'}}
+    runinfo.out_of_core = True
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    estimate = expt.estimate(point_time=0, data=measure_frame(expt))
+
+    assert estimate.memory == 0
+    # a frame of zeros compresses well
+    assert estimate.disk < 40 * 32 * 32 * 2 / 10
+
+
+def test_estimate_warns_memory(runinfo, devices, tmp_path, monkeypatch):
+    monkeypatch.setattr(experiment, 'available_memory', lambda: 1000)
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    with pytest.warns(RuntimeWarning, match='out_of_core'):
+        estimate = expt.estimate(point_time=0, data=measure_frame(expt))
+    assert estimate.available_memory == 1000
@@ -0,0 +1,144 @@
+import pyscan as ps
+import pytest
+import numpy as np
+
+
+def measure_point(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.v1.voltage
+    return d
+
+
+def measure_error(expt):
+    if expt.runinfo.indicies == (1, 1):
+        raise RuntimeError('instrument timeout')
+    return measure_point(expt)
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    devices.v2 = ps.TestVoltage()
+    return devices
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.2)}, 'voltage')
+    runinfo.scan1 = ps.PropertyScan({'v2': ps.drange(0, 0.1, 0.1)}, 'voltage')
+    runinfo.measure_function = measure_point
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+def add_recording_hooks(expt):
+    events = []
+    expt.add_hook('before_iterate', lambda expt, indicies, deltas: events.append(('before_iterate', indicies)))
+    expt.add_hook('after_measure', lambda expt, data: events.append(('after_measure', data.x1)))
+    expt.add_hook('after_save', lambda expt, data, state: events.append(('after_save', state.indicies)))
+    expt.add_hook('on_line_complete', lambda expt, state: events.append(('on_line_complete', state.indicies)))
+    expt.add_hook('on_stop', lambda expt: events.append(('on_stop',)))
+    return events
+
+
+@pytest.mark.parametrize('pipeline', [False, True])
+def test_hooks_called_in_order(runinfo, devices, tmp_path, pipeline):
+    runinfo.pipeline = pipeline
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    events = add_recording_hooks(expt)
+    expt.run()
+
+    expected = []
+    for j in range(2):
+        for i in range(3):
+            expected += [('before_iterate', (i, j)), ('after_measure', i / 10), ('after_save', (i, j))]
+        expected.append(('on_line_complete', (2, j)))
+    expected.append(('on_stop',))
+
+    if pipeline:
+        # points are saved while the next point is set and measured
+        assert sorted(map(str, events)) == sorted(map(str, expected))
+        assert events[-1] == ('on_stop',)
+    else:
+        assert np.all([e == f for e, f in zip(events, expected)]) and len(events) == len(expected)
+
+
+def test_line_complete_snake(runinfo, devices, tmp_path):
+    runinfo.scan0.snake = True
+    runinfo.scan1 = ps.PropertyScan({'v2': ps.drange(0, 0.1, 0.2)}, 'voltage')
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    lines = []
+    expt.add_hook('on_line_complete', lambda expt, state: lines.append(state.indicies))
+    expt.run()
+
+    # the reversed line ends at index 0
+    assert lines == [(2, 0), (0, 1), (2, 2)]
+
+
+def measure_converging(expt):
+    # repeats of the first point agree, so it converges after two of its four repeats
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.v2.voltage + (expt.runinfo.scan0.i % 2) * expt.devices.v2.voltage
+    return d
+
+
+def test_line_complete_early_stop(runinfo, devices, tmp_path):
+    runinfo.measure_function = measure_converging
+    runinfo.scan0 = ps.AverageScan(4, target_stderr=0.01, measured='x1')
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    lines = []
+    expt.add_hook('on_line_complete', lambda expt, state: lines.append((state.indicies, state.average_count)))
+    expt.run()
+
+    assert lines == [((1, 0), 2), ((3, 1), 4)]
+
+
+def test_hook_stops_run(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+
+    def stop_above(expt, data):
+        if data.x1 >= 0.1:
+            expt.stop()
+
+    expt.add_hook('after_measure', stop_above)
+    expt.run()
+
+    assert not expt.runinfo.running
+    assert np.array_equal(expt.x1[:, 0], [0, 0.1, np.nan], equal_nan=True)
+    assert np.all(np.isnan(expt.x1[:, 1]))
+
+
+def test_on_stop_after_exception(runinfo, devices, tmp_path):
+    runinfo.measure_function = measure_error
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    events = add_recording_hooks(expt)
+
+    with pytest.raises(RuntimeError):
+        expt.run()
+
+    assert events[-1] == ('on_stop',)
+    assert not expt.writer.is_open
+
+
+def test_remove_hook(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    events = []
+    hook = expt.add_hook('after_measure', lambda expt, data: events.append(data.x1))
+    expt.remove_hook('after_measure', hook)
+    expt.run()
+
+    assert events == []
+    assert expt.hooks['after_measure'] == []
+
+
+def test_hook_errors(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+
+    with pytest.raises(AssertionError):
+        expt.add_hook('before_measure', lambda expt: None)
+    with pytest.raises(AssertionError):
+        expt.add_hook('on_stop', None)
+    with pytest.raises(AssertionError):
+        expt.remove_hook('on_stop', lambda expt: None)
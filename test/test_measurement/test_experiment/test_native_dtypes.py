@@ -0,0 +1,113 @@
+import pyscan as ps
+import numpy as np
+import pytest
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    return devices
+
+
+def measure_native_types(expt):
+    d = ps.ItemAttribute()
+
+    i = expt.runinfo.scan0.i
+    d.frame = np.full((2, 3), i, dtype='uint16')
+    d.counts = np.int64(i)
+    d.lockin = complex(i, -i)
+    d.x1 = i
+
+    return d
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_native_types
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.2)}, 'voltage', dt=0)
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+@pytest.mark.parametrize("key,dtype", [
+    ('frame', 'uint16'),
+    ('counts', 'int64'),
+    ('lockin', 'complex128'),
+    ('x1', 'float64'),
+    ('v1_voltage', 'float64')])
+def test_native_dtypes(runinfo, devices, tmp_path, key, dtype):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert expt[key].dtype == np.dtype(dtype), f'{key} has dtype {expt[key].dtype}, not {dtype}'
+
+    loaded = ps.load_experiment(expt.get_save_name())
+    assert loaded[key].dtype == np.dtype(dtype), f'loaded {key} has dtype {loaded[key].dtype}, not {dtype}'
+    assert np.all(loaded[key] == expt[key])
+
+
+def test_native_dtype_values(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert np.all(expt.frame[2] == 2)
+    assert np.allclose(expt.lockin, [0, 1 - 1j, 2 - 2j])
+
+
+def test_dtype_override(runinfo, devices, tmp_path):
+    runinfo.dtypes = {'x1': 'int32'}
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert expt.x1.dtype == np.dtype('int32')
+    assert np.all(expt.x1 == [0, 1, 2])
+
+
+def test_integer_unmeasured_points(runinfo, devices, tmp_path):
+    runinfo.dtypes = {'x1': 'int32'}
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    # stop after the first two points
+    expt.add_hook('after_save', lambda expt, data, state: expt.stop() if state.indicies == (1,) else None)
+    expt.run()
+
+    # unmeasured integer points are not mistaken for measured zeros
+    assert np.all(expt.x1 == [0, 1, np.iinfo('int32').min])
+    assert np.all(expt.frame[2] == 65535)
+    loaded = ps.load_experiment(expt.get_save_name())
+    assert np.all(loaded.counts == [0, 1, np.iinfo('int64').min])
+
+
+def test_integer_unmeasured_points_plot(runinfo, devices, tmp_path):
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage', dt=0)
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.add_hook('after_save', lambda expt, data, state: expt.stop() if state.indicies == (1,) else None)
+    expt.run()
+
+    # plots of a partial integer run do not autoscale to the fill value
+    plot = ps.PlotGenerator(expt, 1, data_name='counts')
+    assert np.all(plot.data.mask == [False, False, True, True])
+    assert plot.data.max() == 1
+    plot = ps.PlotGenerator(expt, 2, data_name='frame')
+    assert plot.data.max() == 1
+
+
+def test_average_integer_override(runinfo, devices, tmp_path):
+    runinfo.scan1 = ps.AverageScan(2)
+    runinfo.dtypes = {'counts': 'int64'}
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+
+    with pytest.raises(AssertionError, match='counts'):
+        expt.run()
+
+
+def test_average_integer_dtypes(runinfo, devices, tmp_path):
+    runinfo.scan1 = ps.AverageScan(2)
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert expt.counts.dtype == np.dtype('float64')
+    assert expt.frame.dtype == np.dtype('float64')
+    assert expt.lockin.dtype == np.dtype('complex128')
+    assert np.allclose(expt.lockin, [0, 1 - 1j, 2 - 2j])
@@ -0,0 +1,125 @@
+import pyscan as ps
+import pytest
+import numpy as np
+from time import sleep
+
+
+def measure_slow(expt):
+    sleep(0.005)
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.v1.voltage
+    d.x2 = [expt.devices.v2.voltage, 0]
+    return d
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    devices.v2 = ps.TestVoltage()
+    return devices
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage', dt=0.002)
+    runinfo.scan1 = ps.PropertyScan({'v2': ps.drange(0, 0.1, 0.2)}, 'voltage', dt=0.01)
+    runinfo.measure_function = measure_slow
+    runinfo.initial_pause = 0
+    runinfo.save_timing = True
+    return runinfo
+
+
+@pytest.mark.parametrize('option', [None, 'pipeline', 'async_save', 'out_of_core'])
+def test_phase_timing(runinfo, devices, tmp_path, option):
+    if option is not None:
+        runinfo[option] = True
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    timing = expt.timing
+    iterate = np.asarray(timing.iterate)
+    assert iterate.shape == (4, 3, 2)
+    assert timing.iterate.dtype == np.float32
+
+    # scan0 moves at every point, scan1 only at the start of each line
+    assert np.all(iterate[..., 0] >= 0.002)
+    assert np.all(iterate[0, :, 1] >= 0.01)
+    assert np.all(np.isnan(iterate[1:, :, 1]))
+
+    assert np.all(np.asarray(timing.measure) >= 0.005)
+    assert np.all(np.isnan(timing.average))
+    # the save time of the last point is written when the run ends
+    assert np.all(np.isfinite(timing.save))
+
+    loaded = ps.load_experiment(expt.get_save_name())
+    for key in ['iterate', 'measure', 'average', 'save']:
+        assert np.array_equal(loaded.timing[key], np.asarray(timing[key]), equal_nan=True), key
+
+
+def test_phase_timing_average(runinfo, devices, tmp_path):
+    runinfo.scan2 = ps.AverageScan(2)
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert expt.timing.average.shape == (4, 3, 2)
+    assert np.all(np.isfinite(expt.timing.average))
+    assert expt.timing.iterate.shape == (4, 3, 2, 3)
+
+
+def test_phase_timing_continuous(runinfo, devices, tmp_path):
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.2)}, 'voltage')
+    runinfo.scan1 = ps.ContinuousScan(n_max=3)
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert expt.timing.iterate.shape == (3, 3, 2)
+    assert expt.timing.save.shape == (3, 3)
+    # the run stops at the first point of the last iteration
+    measured = np.isfinite(expt.timing.measure)
+    assert np.sum(measured) == 7
+    assert np.array_equal(np.isfinite(expt.timing.save), measured)
+
+
+def test_timing_summary(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    summary = ps.timing_summary(expt, percentiles=(50, 95))
+    assert list(summary.keys()) == ['iterate', 'measure', 'average', 'save', 'settle_time', 'scan0', 'scan1']
+    assert list(summary.measure.keys()) == ['n', 'total', 'mean', 'p50', 'p95']
+
+    assert summary.measure.n == 12
+    assert summary.measure.p50 >= 0.005
+    assert np.isclose(summary.measure.total, np.sum(expt.timing.measure))
+    assert summary.scan0.n == 12
+    assert summary.scan1.n == 3
+    assert summary.scan1.p50 >= 0.01
+    assert np.isclose(summary.iterate.total, summary.scan0.total + summary.scan1.total)
+    assert summary.average.n == 0
+    assert np.isnan(summary.average.mean)
+
+    # loaded experiments are summarized the same way
+    loaded = ps.load_experiment(expt.get_save_name())
+    loaded_summary = ps.timing_summary(loaded, percentiles=(50, 95))
+    for key in summary.keys():
+        assert loaded_summary[key].n == summary[key].n
+        assert np.isclose(loaded_summary[key].total, summary[key].total)
+
+    report = ps.format_timing_summary(summary).splitlines()
+    assert len(report) == 8
+    assert report[0].split() == ['phase', 'n', 'total', '(ms)', 'mean', '(ms)', 'p50', '(ms)', 'p95', '(ms)']
+    assert report[2].split()[:2] == ['measure', '12']
+
+
+def test_no_phase_timing(runinfo, devices, tmp_path):
+    runinfo.save_timing = False
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert expt.timing is None
+    with pytest.raises(AssertionError):
+        ps.timing_summary(expt)
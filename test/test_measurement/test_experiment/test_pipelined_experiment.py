@@ -0,0 +1,181 @@
+import pyscan as ps
+import copy
+import pytest
+import numpy as np
+
+
+def record(value):
+    pass
+
+
+def measure_point(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.v1.voltage + 10 * expt.devices.v2.voltage + expt.runinfo.scans[-1].i
+    d.x2 = [d.x1, 2 * d.x1]
+    d.x3 = np.outer([1, 2], [d.x1, 3 * d.x1, 5])
+    return d
+
+
+def measure_previous(expt):
+    # the previous point of scan0 is saved before the next point is measured
+    d = ps.ItemAttribute()
+    i = expt.runinfo.scan0.i
+    d.x1 = expt.devices.v1.voltage
+    if i == 0:
+        d.previous = np.nan
+    else:
+        d.previous = expt.x1[i - 1]
+    return d
+
+
+def measure_bad_shape(expt):
+    d = ps.ItemAttribute()
+    d.x1 = [expt.devices.v1.voltage] * (expt.runinfo.scan0.i + 1)
+    return d
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    devices.v2 = ps.TestVoltage()
+    return devices
+
+
+def scans_1D():
+    return {'scan0': ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.5)}, 'voltage')}
+
+
+def scans_2D():
+    return {'scan0': ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage'),
+            'scan1': ps.PropertyScan({'v2': ps.drange(0, 0.2, 0.4)}, 'voltage')}
+
+
+def scans_3D():
+    return {'scan0': ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.2)}, 'voltage', dt=0.001),
+            'scan1': ps.FunctionScan(record, [0, 1]),
+            'scan2': ps.PropertyScan({'v2': ps.drange(0, 0.2, 0.4)}, 'voltage')}
+
+
+def scans_average():
+    return {'scan0': ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage'),
+            'scan1': ps.AverageScan(3)}
+
+
+def scans_average_inner():
+    return {'scan0': ps.AverageScan(2),
+            'scan1': ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage')}
+
+
+def scans_repeat():
+    return {'scan0': ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage'),
+            'scan1': ps.RepeatScan(3)}
+
+
+def scans_continuous():
+    return {'scan0': ps.ContinuousScan(n_max=5)}
+
+
+def scans_continuous_2D():
+    return {'scan0': ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.2)}, 'voltage'),
+            'scan1': ps.ContinuousScan(n_max=3)}
+
+
+def scans_snake():
+    return {'scan0': ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage', snake=True),
+            'scan1': ps.PropertyScan({'v2': ps.drange(0, 0.2, 0.4)}, 'voltage')}
+
+
+SCANS = [scans_1D, scans_2D, scans_3D, scans_average, scans_average_inner, scans_repeat, scans_continuous,
+         scans_continuous_2D, scans_snake]
+
+OPTIONS = [{}, {'async_save': True}, {'out_of_core': True}, {'swmr': True}, {'flush_interval': None}]
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_point
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+def run(runinfo, devices, data_dir, scans, pipeline):
+    # each run gets its own copy of the runinfo, so that a run with and a run without the pipeline can be compared
+    devices.v1.voltage = 0
+    devices.v2.voltage = 0
+
+    runinfo = copy.deepcopy(runinfo)
+    for key, scan in scans().items():
+        runinfo[key] = scan
+    runinfo.pipeline = pipeline
+
+    expt = ps.Experiment(runinfo, devices, data_dir=data_dir)
+    expt.run()
+    return expt
+
+
+def assert_same_data(expt, expected):
+    assert sorted(expt.runinfo.measured) == sorted(expected.runinfo.measured)
+    for name in expected.runinfo.measured:
+        assert np.array_equal(np.asarray(expt[name]), np.asarray(expected[name]), equal_nan=True), name
+
+    loaded = ps.load_experiment(expt.get_save_name())
+    loaded_expected = ps.load_experiment(expected.get_save_name())
+    for name in loaded_expected.keys():
+        if name in ['runinfo', 'devices', 'timing', 'skipped_writes', 'progress']:
+            continue
+        assert np.array_equal(loaded[name], loaded_expected[name], equal_nan=True), name
+
+
+@pytest.mark.parametrize('scans', SCANS)
+def test_pipeline_same_data(runinfo, devices, tmp_path, scans):
+    expected = run(runinfo, devices, tmp_path, scans, False)
+    expt = run(runinfo, devices, tmp_path, scans, True)
+
+    assert_same_data(expt, expected)
+    assert expt.runinfo.complete is True
+
+
+@pytest.mark.parametrize('options', OPTIONS)
+def test_pipeline_same_data_options(runinfo, devices, tmp_path, options):
+    for key, value in options.items():
+        runinfo[key] = value
+    expected = run(runinfo, devices, tmp_path, scans_2D, False)
+    expt = run(runinfo, devices, tmp_path, scans_2D, True)
+
+    assert_same_data(expt, expected)
+
+
+def test_pipeline_saved_before_measure(runinfo, devices, tmp_path):
+    runinfo.measure_function = measure_previous
+    expt = run(runinfo, devices, tmp_path, scans_1D, True)
+    assert np.allclose(expt.previous[1:], expt.x1[:-1])
+
+
+def test_pipeline_resume(runinfo, devices, tmp_path):
+    expected = run(runinfo, devices, tmp_path, scans_2D, False)
+
+    expt = run(runinfo, devices, tmp_path, scans_2D, True)
+    with ps.RunWriter(expt.get_save_name()) as f:
+        completed = f['checkpoint/completed'][()]
+        completed[:, 2:] = False
+        f['checkpoint/completed'][()] = completed
+
+    resumed = ps.Experiment(expt.runinfo, devices, data_dir=tmp_path)
+    resumed.resume(expt.get_save_name())
+    assert_same_data(resumed, expected)
+
+
+def test_pipeline_save_error(runinfo, devices, tmp_path):
+    runinfo.measure_function = measure_bad_shape
+    with pytest.raises(Exception):
+        run(runinfo, devices, tmp_path, scans_1D, True)
+
+
+def test_pipeline_adaptive_scan(runinfo, devices, tmp_path):
+    def adaptive_scans():
+        return {'scan0': ps.AdaptiveScan({'v1': (0, 1)}, 'voltage', n_points=5, measured='x1')}
+
+    with pytest.raises(AssertionError):
+        run(runinfo, devices, tmp_path, adaptive_scans, True)
@@ -0,0 +1,130 @@
+import pyscan as ps
+import pytest
+import h5py
+import numpy as np
+from time import sleep
+
+
+def measure_point(expt):
+    sleep(0.002)
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.v1.voltage
+    return d
+
+
+def measure_crash(expt):
+    if expt.runinfo.indicies == (1, 1):
+        raise RuntimeError('instrument timeout')
+    return measure_point(expt)
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    devices.v2 = ps.TestVoltage()
+    return devices
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage')
+    runinfo.scan1 = ps.PropertyScan({'v2': ps.drange(0, 0.1, 0.2)}, 'voltage')
+    runinfo.measure_function = measure_point
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+@pytest.mark.parametrize('option', [None, 'pipeline', 'async_save'])
+def test_progress(runinfo, devices, tmp_path, option):
+    if option is not None:
+        runinfo[option] = True
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+
+    completed = []
+    expt.add_hook('after_measure', lambda expt, data: completed.append(expt.progress.snapshot().n_completed))
+    expt.run()
+
+    # the progress is read before each point is counted
+    assert completed == list(range(12))
+
+    state = expt.progress.snapshot()
+    assert state.n_completed == 12
+    assert state.n_points == 12
+    assert state.eta == 0
+    assert 50 < state.rate < 500
+    assert state.phase_time.measure >= 12 * 0.002
+    assert state.phase_time.save > 0
+    assert state.phase_time.average == 0
+
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert list(f.attrs['progress_fields']) == list(ps.Progress.FIELDS)
+        assert np.array_equal(f.attrs['progress'][:2], [12, 12])
+
+    loaded = ps.load_experiment(expt.get_save_name())
+    assert loaded.progress.n_completed == 12
+    assert loaded.progress.eta == 0
+    assert np.isclose(loaded.progress.measure, state.phase_time.measure)
+
+
+def test_progress_average(runinfo, devices, tmp_path):
+    runinfo.scan2 = ps.AverageScan(2)
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    state = expt.progress.snapshot()
+    assert state.n_completed == 24
+    assert state.phase_time.average > 0
+
+
+def test_progress_followed(runinfo, devices, tmp_path):
+    runinfo.swmr = True
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+
+    followed = []
+
+    def follow(expt, state):
+        if state.indicies == (3, 0):
+            followed.append(ps.load_experiment(expt.get_save_name(), follow=True))
+        elif len(followed) > 0:
+            followed[0].refresh()
+            followed.append(followed[0].progress.n_completed)
+
+    expt.add_hook('on_line_complete', follow)
+    expt.run()
+    followed[0].close()
+
+    # polled from the file by a reader while the run continues
+    assert followed[1:] == [8, 12]
+
+
+def test_progress_resume(runinfo, devices, tmp_path):
+    runinfo.measure_function = measure_crash
+    crashed = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    with pytest.raises(RuntimeError):
+        crashed.run()
+    assert crashed.progress.snapshot().n_completed == 5
+    assert not crashed.progress.running
+
+    runinfo.measure_function = measure_point
+    resumed = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    counts = []
+    resumed.add_hook('before_iterate', lambda expt, indicies, deltas: counts.append(expt.progress.n_completed))
+    resumed.resume(crashed.get_save_name())
+
+    assert counts[0] == 5
+    assert resumed.progress.snapshot().n_completed == 12
+
+
+def test_progress_title(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+
+    titles = []
+    expt.add_hook('after_save', lambda expt, data, state: titles.append(
+        ps.PlotGenerator(expt, 1, data_name='x1').get_title()))
+    expt.run()
+
+    assert titles[0].startswith('1/12 points, x1, ')
+    assert 'points/s, ETA' in titles[-1]
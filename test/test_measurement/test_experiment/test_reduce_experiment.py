@@ -0,0 +1,128 @@
+import pyscan as ps
+import pytest
+import h5py
+import numpy as np
+
+
+def acquire_frame(expt):
+    d = ps.ItemAttribute()
+    d.frame = np.full(256, expt.devices.v1.voltage) + np.arange(256) * expt.devices.v2.voltage
+    d.v1 = expt.devices.v1.voltage
+    return d
+
+
+def reduce_frame(data):
+    d = ps.ItemAttribute()
+    d.total = np.sum(data.frame)
+    d.spectrum = np.abs(np.fft.rfft(data.frame))[:8]
+    d.v1 = data.v1
+    return d
+
+
+def measure_frame(expt):
+    return reduce_frame(acquire_frame(expt))
+
+
+def reduce_crash(data):
+    if data.v1 > 0.15:
+        raise RuntimeError('fit failed')
+    return reduce_frame(data)
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    devices.v2 = ps.TestVoltage()
+    return devices
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage')
+    runinfo.scan1 = ps.PropertyScan({'v2': ps.drange(0, 0.1, 0.2)}, 'voltage')
+    runinfo.measure_function = acquire_frame
+    runinfo.reduce_function = reduce_frame
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+def run_unsplit(runinfo, devices, tmp_path):
+    # the same run with the reduce step in the measure function
+    runinfo.measure_function = measure_frame
+    runinfo.reduce_function = None
+    expected = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expected.run()
+    runinfo.measure_function = acquire_frame
+    runinfo.reduce_function = reduce_frame
+    return expected
+
+
+@pytest.mark.parametrize('options', [{}, {'async_save': True}, {'reduce_in_flight': 1, 'shared_memory_bytes': 0}])
+def test_reduce_experiment(runinfo, devices, tmp_path, options):
+    expected = run_unsplit(runinfo, devices, tmp_path)
+
+    runinfo.reduce_workers = 2
+    runinfo.shared_memory_bytes = 1024
+    for key, value in options.items():
+        runinfo[key] = value
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    saved = []
+    expt.add_hook('after_save', lambda expt, data, state: saved.append(state.indicies))
+    expt.run()
+
+    # every point is saved at its own indicies, in order
+    assert saved == [(i, j) for j in range(3) for i in range(4)]
+    assert sorted(expt.runinfo.measured) == ['spectrum', 'total', 'v1']
+    for name in ['total', 'spectrum', 'v1']:
+        assert np.allclose(expt[name], expected[name])
+
+    loaded = ps.load_experiment(expt.get_save_name())
+    for name in ['total', 'spectrum', 'v1']:
+        assert np.allclose(loaded[name], expected[name])
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert np.all(f['checkpoint/completed'][()])
+
+
+def test_reduce_experiment_average(runinfo, devices, tmp_path):
+    runinfo.scan1 = ps.AverageScan(3)
+    expected = run_unsplit(runinfo, devices, tmp_path)
+
+    runinfo.reduce_in_flight = 4
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    for name in ['total', 'spectrum', 'v1']:
+        assert np.allclose(expt[name], expected[name])
+
+
+def test_reduce_experiment_error(runinfo, devices, tmp_path):
+    runinfo.reduce_function = reduce_crash
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+
+    with pytest.raises(RuntimeError, match='fit failed'):
+        expt.run()
+
+    # the points reduced before the error are saved
+    assert np.allclose(expt.v1[:2, 0], [0, 0.1])
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert np.all(f['checkpoint/completed'][:2, 0])
+        assert not np.any(f['checkpoint/completed'][2:, 0])
+
+
+def test_reduce_runinfo_check(runinfo, devices, tmp_path):
+    runinfo.pipeline = True
+    with pytest.raises(AssertionError, match='pipeline'):
+        ps.Experiment(runinfo, devices, data_dir=tmp_path).run()
+    runinfo.pipeline = False
+
+    scan0 = runinfo.scan0
+    runinfo.scan0 = ps.AverageScan(10, target_stderr=0.1, measured='total')
+    with pytest.raises(AssertionError, match='reduce_function cannot be combined'):
+        ps.Experiment(runinfo, devices, data_dir=tmp_path).run()
+    runinfo.scan0 = scan0
+
+    runinfo.reduce_in_flight = 0
+    with pytest.raises(AssertionError, match='reduce_in_flight'):
+        ps.Experiment(runinfo, devices, data_dir=tmp_path).run()
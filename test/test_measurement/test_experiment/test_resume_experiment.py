@@ -0,0 +1,177 @@
+import pyscan as ps
+import pytest
+import h5py
+import numpy as np
+
+
+def measure_point(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.v1.voltage + 10 * expt.runinfo.scan1.i
+    d.x2 = [d.x1, 2 * d.x1]
+    return d
+
+
+def measure_crash(expt):
+    if expt.runinfo.indicies == expt.crash_indicies:
+        raise RuntimeError('instrument timeout')
+    return measure_point(expt)
+
+
+def measure_count(expt):
+    if 'n_measured' not in expt.keys():
+        expt.n_measured = 0
+    expt.n_measured += 1
+    return measure_point(expt)
+
+
+def make_runinfo(scan1):
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_point
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.2)}, 'voltage', dt=0)
+    runinfo.scan1 = scan1
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+def make_devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    return devices
+
+
+def crash_and_resume(make_scan1, crash_indicies, tmp_path, **options):
+    runinfo = make_runinfo(make_scan1())
+    for key, value in options.items():
+        runinfo[key] = value
+    expected = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path / 'expected')
+    expected.run()
+
+    runinfo = make_runinfo(make_scan1())
+    for key, value in options.items():
+        runinfo[key] = value
+    runinfo.measure_function = measure_crash
+    crashed = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path / 'crashed')
+    crashed.crash_indicies = crash_indicies
+    with pytest.raises(RuntimeError):
+        crashed.run()
+
+    runinfo = make_runinfo(make_scan1())
+    for key, value in options.items():
+        runinfo[key] = value
+    runinfo.measure_function = measure_count
+    resumed = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path / 'resumed')
+    resumed.resume(crashed.get_save_name())
+
+    return expected, resumed
+
+
+@pytest.mark.parametrize('out_of_core', [False, True])
+def test_resume_repeat_scan(tmp_path, out_of_core):
+    expected, resumed = crash_and_resume(lambda: ps.RepeatScan(3), (1, 1), tmp_path, out_of_core=out_of_core)
+
+    # (0, 0), (1, 0), (2, 0) and (0, 1) were saved before the crash
+    assert resumed.n_measured == 5
+    assert resumed.runinfo.measured == ['x1', 'x2']
+
+    loaded = ps.load_experiment(resumed.get_save_name())
+    assert np.allclose(loaded.x1, expected.x1)
+    assert np.allclose(loaded.x2, expected.x2)
+    assert np.allclose(np.asarray(resumed.x1), expected.x1)
+
+    with h5py.File(resumed.get_save_name(), 'r') as f:
+        assert f['checkpoint/completed'][()].all()
+
+
+def test_resume_average_scan(tmp_path):
+    expected, resumed = crash_and_resume(lambda: ps.AverageScan(3), (2, 1), tmp_path)
+
+    assert resumed.n_measured == 4
+    assert np.allclose(resumed.x1, expected.x1)
+    assert np.allclose(resumed.x2, expected.x2)
+
+    loaded = ps.load_experiment(resumed.get_save_name())
+    assert np.allclose(loaded.x1, expected.x1)
+
+
+@pytest.mark.parametrize('crash_indicies', [(1, 2), (0, 2)])
+def test_resume_continuous_scan(tmp_path, crash_indicies):
+    expected, resumed = crash_and_resume(lambda: ps.ContinuousScan(n_max=4), crash_indicies, tmp_path)
+
+    # the run stops after the first point of the n_max-th iteration
+    assert resumed.n_measured == 10 - (3 * crash_indicies[1] + crash_indicies[0])
+    assert np.allclose(resumed.iteration, [0, 1, 2, 3])
+    assert np.allclose(resumed.x1, expected.x1, equal_nan=True)
+
+    loaded = ps.load_experiment(resumed.get_save_name())
+    assert np.allclose(loaded.iteration, [0, 1, 2, 3])
+    assert np.allclose(loaded.x1, expected.x1, equal_nan=True)
+    assert np.allclose(loaded.x2, expected.x2, equal_nan=True)
+
+
+def test_resume_from_first_gap(tmp_path):
+    runinfo = make_runinfo(ps.RepeatScan(3))
+    expected = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path / 'expected')
+    expected.run()
+
+    runinfo = make_runinfo(ps.RepeatScan(3))
+    runinfo.measure_function = measure_crash
+    crashed = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path / 'crashed')
+    crashed.crash_indicies = (1, 1)
+    with pytest.raises(RuntimeError):
+        crashed.run()
+
+    # (1, 0) was lost but (2, 0) and (0, 1) were saved after it
+    with h5py.File(crashed.get_save_name(), 'r+') as f:
+        f['checkpoint/completed'][1, 0] = False
+
+    runinfo = make_runinfo(ps.RepeatScan(3))
+    runinfo.measure_function = measure_count
+    resumed = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path / 'resumed')
+    resumed.resume(crashed.get_save_name())
+
+    # the run continues from the gap instead of skipping it
+    assert resumed.n_measured == 8
+    loaded = ps.load_experiment(resumed.get_save_name())
+    assert np.allclose(loaded.x1, expected.x1)
+    with h5py.File(resumed.get_save_name(), 'r') as f:
+        assert f['checkpoint/completed'][()].all()
+
+
+def test_resume_completed_run(tmp_path):
+    runinfo = make_runinfo(ps.RepeatScan(2))
+    expt = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path)
+    expt.run()
+
+    runinfo = make_runinfo(ps.RepeatScan(2))
+    runinfo.measure_function = measure_count
+    resumed = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path)
+    resumed.resume(expt.get_save_name())
+
+    assert 'n_measured' not in resumed.keys()
+    assert resumed.runinfo.complete
+    assert np.allclose(resumed.x1, expt.x1)
+
+
+def test_resume_completed_continuous_run(tmp_path):
+    runinfo = make_runinfo(ps.ContinuousScan(n_max=3))
+    expt = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path)
+    expt.run()
+
+    runinfo = make_runinfo(ps.ContinuousScan(n_max=3))
+    runinfo.measure_function = measure_count
+    resumed = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path)
+    resumed.resume(expt.get_save_name())
+
+    assert 'n_measured' not in resumed.keys()
+    assert np.allclose(resumed.iteration, [0, 1, 2])
+    assert np.allclose(resumed.x1, expt.x1, equal_nan=True)
+
+
+def test_resume_mismatched_runinfo(tmp_path):
+    runinfo = make_runinfo(ps.RepeatScan(2))
+    expt = ps.Experiment(runinfo, make_devices(), data_dir=tmp_path)
+    expt.run()
+
+    resumed = ps.Experiment(make_runinfo(ps.RepeatScan(3)), make_devices(), data_dir=tmp_path)
+    with pytest.raises(AssertionError):
+        resumed.resume(expt.get_save_name())
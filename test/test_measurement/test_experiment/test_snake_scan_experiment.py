@@ -0,0 +1,114 @@
+import pyscan as ps
+import pytest
+import h5py
+import json
+import numpy as np
+
+
+def record(value):
+    pass
+
+
+def measure_point(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.v1.voltage + 10 * expt.runinfo.scan1.i
+    d.x2 = [d.x1, 2 * d.x1]
+    return d
+
+
+def measure_record(expt):
+    expt.voltages.append(expt.devices.v1.voltage)
+    return measure_point(expt)
+
+
+def measure_crash(expt):
+    # the fifth point of the serpentine order
+    if expt.runinfo.indicies == (1, 1):
+        raise RuntimeError('instrument timeout')
+    return measure_point(expt)
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    return devices
+
+
+def make_runinfo(snake):
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_point
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.2)}, 'voltage', snake=snake)
+    runinfo.scan1 = ps.FunctionScan(record, [0, 1, 2])
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+def test_snake_scan_saves_at_scan_indicies(devices, tmp_path):
+    expected = ps.Experiment(make_runinfo(False), devices, data_dir=tmp_path)
+    expected.run()
+
+    expt = ps.Experiment(make_runinfo(True), devices, data_dir=tmp_path)
+    expt.run()
+
+    assert np.allclose(expt.x1, expected.x1)
+    assert np.allclose(expt.x2, expected.x2)
+
+    loaded = ps.load_experiment(expt.get_save_name())
+    assert np.allclose(loaded.x1, expected.x1)
+    assert np.allclose(loaded.x2, expected.x2)
+
+    # the direction of the scan is recorded in the saved runinfo
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        runinfo = json.loads(f.attrs['runinfo'])
+        assert runinfo['scan0']['snake'] is True
+        assert runinfo['scan1']['snake'] is False
+
+
+def test_snake_scan_order(devices, tmp_path):
+    runinfo = make_runinfo(True)
+    runinfo.scan1 = ps.RepeatScan(3)
+    runinfo.measure_function = measure_record
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.voltages = []
+    expt.run()
+
+    # the second pass runs backwards without returning to the first value
+    assert np.allclose(expt.voltages, [0, 0.1, 0.2, 0.2, 0.1, 0, 0, 0.1, 0.2])
+    assert expt.plan.snake == (True, False)
+
+
+def test_snake_scan_end_of_line(devices, tmp_path):
+    runinfo = make_runinfo(True)
+    runinfo.flush_on_line = True
+    runinfo.flush_interval = None
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    ends = []
+    expt.add_hook('after_save', lambda expt, data, state: ends.append(state.end_of_line))
+    expt.run()
+
+    # each line ends at its last point in scan order, index 0 on the reversed line
+    order = [(0, 0), (1, 0), (2, 0), (2, 1), (1, 1), (0, 1), (0, 2), (1, 2), (2, 2)]
+    assert [index for index, end in zip(order, ends) if end] == [(2, 0), (0, 1), (2, 2)]
+    assert expt.writer.n_flushes == 3
+
+
+def test_snake_scan_resume(devices, tmp_path):
+    runinfo = make_runinfo(True)
+    runinfo.scan1 = ps.RepeatScan(3)
+    expected = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expected.run()
+
+    runinfo = make_runinfo(True)
+    runinfo.scan1 = ps.RepeatScan(3)
+    runinfo.measure_function = measure_crash
+    crashed = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    with pytest.raises(RuntimeError):
+        crashed.run()
+
+    runinfo = make_runinfo(True)
+    runinfo.scan1 = ps.RepeatScan(3)
+    resumed = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    resumed.resume(crashed.get_save_name())
+
+    assert np.allclose(resumed.x1, expected.x1)
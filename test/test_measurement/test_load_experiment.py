@@ -0,0 +1,87 @@
+import pyscan as ps
+import pytest
+import h5py
+import numpy as np
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    return devices
+
+
+def measure_point(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.runinfo.scan0.i + 10 * expt.runinfo.scan1.i
+    d.x2 = [d.x1, d.x1]
+    return d
+
+
+def measure_and_follow(expt):
+    # open a follower part way through the run and refresh it at every later point
+    if (expt.runinfo.scan0.i == 0) and (expt.runinfo.scan1.i == 1):
+        expt.follower = ps.load_experiment(expt.get_save_name(), follow=True)
+        expt.follower_points = [expt.follower.n_points]
+    elif 'follower' in expt.keys():
+        expt.follower.refresh()
+        expt.follower_points.append(expt.follower.n_points)
+    return measure_point(expt)
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_point
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.2)}, 'voltage', dt=0)
+    runinfo.scan1 = ps.RepeatScan(3)
+    runinfo.initial_pause = 0
+    runinfo.swmr = True
+    return runinfo
+
+
+def test_swmr_progress_attributes(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert f.attrs['n_points'] == 9
+        assert tuple(f.attrs['last_index']) == (2, 2)
+        assert f['x1'].shape == (3, 3)
+
+
+def test_start_swmr_requires_swmr_writer(tmp_path):
+    with ps.RunWriter(str(tmp_path / 'test.hdf5')) as writer:
+        with pytest.raises(AssertionError):
+            writer.start_swmr()
+
+
+def test_follow_completed_experiment(runinfo, devices, tmp_path):
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    follower = ps.load_experiment(expt.get_save_name(), follow=True)
+    assert isinstance(follower, ps.FollowedExperiment)
+    assert follower.n_points == 9
+    assert not follower.refresh()
+    assert np.allclose(follower.x1, expt.x1)
+    assert np.allclose(follower.x2, expt.x2)
+    follower.close()
+
+
+def test_follow_running_experiment(runinfo, devices, tmp_path):
+    runinfo.measure_function = measure_and_follow
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    follower = expt.follower
+    # each refresh sees the points saved before the current one
+    assert expt.follower_points == [3, 4, 5, 6, 7, 8]
+    assert not np.isnan(follower.x1.flatten()[:8]).any()
+    assert np.isnan(follower.x1[2, 2])
+
+    assert follower.refresh()
+    assert follower.n_points == 9
+    assert np.allclose(follower.x1, expt.x1)
+    assert np.allclose(follower.x2, expt.x2)
+    follower.close()
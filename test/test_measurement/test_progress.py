@@ -0,0 +1,83 @@
+import pyscan as ps
+import numpy as np
+from time import sleep
+from threading import Thread
+
+
+def test_progress_init():
+    progress = ps.Progress()
+    state = progress.snapshot()
+
+    assert not progress.running
+    assert state.n_completed == 0
+    assert state.n_points is None
+    assert np.isnan(state.rate)
+    assert np.isnan(state.eta)
+    assert dict(state.phase_time) == {'iterate': 0, 'measure': 0, 'average': 0, 'save': 0}
+    assert str(progress) == '0 points'
+
+
+def test_progress_rate_and_eta():
+    progress = ps.Progress(window=3)
+    progress.start(n_points=20, n_completed=10)
+    assert progress.running
+
+    for k in range(11, 16):
+        sleep(0.01)
+        progress.point_completed(k, iterate_time=0.001, measure_time=0.002)
+    progress.add_time('save', 0.5)
+
+    state = progress.snapshot()
+    assert state.n_completed == 15
+    assert state.fraction == 0.75
+    # the moving average only covers the last 3 points
+    assert 60 < state.rate < 110
+    assert np.isclose(state.eta, 5 / state.rate)
+    assert np.isclose(state.phase_time.iterate, 0.005)
+    assert np.isclose(state.phase_time.measure, 0.01)
+    assert state.phase_time.save == 0.5
+    assert str(progress).startswith('15/20 points, ')
+    assert 'points/s, ETA 0:00:00' in str(progress)
+
+    array = progress.to_array()
+    assert array.dtype == np.float64
+    assert len(array) == len(ps.Progress.FIELDS)
+    assert array[0] == 15
+    assert array[1] == 20
+
+
+def test_progress_stop():
+    progress = ps.Progress()
+    progress.start(n_points=2)
+    progress.point_completed(1)
+    progress.point_completed(2)
+    progress.stop()
+
+    elapsed = progress.snapshot().elapsed
+    sleep(0.01)
+    assert progress.snapshot().elapsed == elapsed
+    assert progress.snapshot().eta == 0
+    assert not progress.running
+
+
+def test_progress_threads():
+    progress = ps.Progress()
+    progress.start(n_points=None)
+    snapshots = []
+
+    def read():
+        while progress.running:
+            snapshots.append(progress.snapshot())
+
+    reader = Thread(target=read)
+    reader.start()
+    for k in range(1, 2001):
+        progress.point_completed(k, 1, 1)
+    progress.stop()
+    reader.join()
+
+    assert len(snapshots) > 0
+    # every snapshot is consistent
+    for state in snapshots:
+        assert state.phase_time.iterate == state.n_completed
+        assert state.phase_time.measure == state.n_completed
@@ -0,0 +1,137 @@
+import pyscan as ps
+import pytest
+import numpy as np
+from time import sleep
+from multiprocessing import shared_memory
+
+
+def reduce_sum(data):
+    d = ps.ItemAttribute()
+    d.total = float(np.sum(data.frame))
+    d.label = data.label
+    return d
+
+
+def reduce_identity(data):
+    d = ps.ItemAttribute()
+    d.frame = data.frame
+    return d
+
+
+def reduce_slow_first(data):
+    # the first point finishes last, results must still come back in order
+    if data.i == 0:
+        sleep(0.2)
+    d = ps.ItemAttribute()
+    d.i = data.i
+    return d
+
+
+def reduce_crash(data):
+    raise ValueError('bad frame')
+
+
+def make_data(i, n=64):
+    d = ps.ItemAttribute()
+    d.frame = np.full((n, n), i, dtype='float64')
+    d.label = 'frame{}'.format(i)
+    d.i = i
+    return d
+
+
+def test_reduce_pool_results():
+    with ps.ReducePool(reduce_sum, max_workers=2, shared_bytes=1024) as pool:
+        for i in range(5):
+            pool.submit(make_data(i), state=i)
+        results = pool.completed(wait=True)
+
+    assert [state for data, state in results] == list(range(5))
+    for data, state in results:
+        assert isinstance(data, ps.ItemAttribute)
+        assert data.total == state * 64 * 64
+        assert data.label == 'frame{}'.format(state)
+
+
+def test_reduce_pool_spawn():
+    with ps.ReducePool(reduce_sum, max_workers=1, shared_bytes=1024, start_method='spawn') as pool:
+        pool.submit(make_data(2), state=2)
+        data, state = pool.completed(wait=True)[0]
+    assert data.total == 2 * 64 * 64
+
+
+def test_reduce_pool_order():
+    with ps.ReducePool(reduce_slow_first, max_workers=2, max_in_flight=10) as pool:
+        for i in range(4):
+            pool.submit(make_data(i), state=i)
+        # the later points are done but wait for the first one
+        sleep(0.05)
+        assert pool.completed() == []
+        results = pool.completed(wait=True)
+
+    assert [data.i for data, state in results] == [0, 1, 2, 3]
+    assert [state for data, state in results] == [0, 1, 2, 3]
+
+
+def test_reduce_pool_max_in_flight():
+    with ps.ReducePool(reduce_slow_first, max_workers=2, max_in_flight=2) as pool:
+        pool.submit(make_data(0), state=0)
+        assert pool.completed() == []
+        assert len(pool.in_flight) == 1
+
+        # the limit is reached, so the oldest point is waited for
+        pool.submit(make_data(1), state=1)
+        results = pool.completed()
+        assert [state for data, state in results][0] == 0
+        assert len(pool.in_flight) <= 1
+        pool.completed(wait=True)
+        assert len(pool.in_flight) == 0
+
+
+def test_reduce_pool_shared_memory():
+    pool = ps.ReducePool(reduce_identity, max_workers=1, shared_bytes=1024)
+    try:
+        pool.submit(make_data(1), state=1)
+        future, state, blocks = pool.in_flight[0]
+        assert len(blocks) == 1
+        name = blocks[0][1].name
+        data, state = pool.completed(wait=True)[0]
+
+        # arrays that are views of the shared memory are copied before the block is reused
+        assert np.all(data.frame == 1)
+        assert pool.free_blocks[64 * 64 * 8][0].name == name
+
+        pool.submit(make_data(2), state=2)
+        assert pool.in_flight[0][2][0][1].name == name
+        data2, state = pool.completed(wait=True)[0]
+        assert np.all(data.frame == 1)
+        assert np.all(data2.frame == 2)
+
+        # small arrays are pickled
+        pool.submit(make_data(3, n=4), state=3)
+        assert pool.in_flight[0][2] == []
+        data, state = pool.completed(wait=True)[0]
+        assert np.all(data.frame == 3)
+    finally:
+        pool.close()
+
+    assert pool.free_blocks == {}
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_reduce_pool_error():
+    with ps.ReducePool(reduce_crash, max_workers=1, shared_bytes=1024) as pool:
+        pool.submit(make_data(0))
+        with pytest.raises(ValueError, match='bad frame'):
+            pool.completed(wait=True)
+
+    assert pool.free_blocks == {}
+
+
+def test_reduce_pool_assertions():
+    with pytest.raises(AssertionError):
+        ps.ReducePool(None)
+    with pytest.raises(AssertionError):
+        ps.ReducePool(reduce_sum, max_in_flight=0)
+    with pytest.raises(AssertionError):
+        ps.ReducePool(reduce_sum, start_method='fork')
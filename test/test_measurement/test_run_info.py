@@ -110,3 +110,15 @@ def test_low_continuous_scan():
 
     with pytest.raises(AssertionError):
         runinfo.check()
+
+
+@pytest.mark.parametrize("storage_options", [
+    {'x1': {'compression': 'bzip2'}},
+    {'default': {'level': 4}}])
+def test_bad_storage_options(storage_options):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.RepeatScan(2)
+    runinfo.storage_options = storage_options
+
+    with pytest.raises(AssertionError):
+        runinfo.check()
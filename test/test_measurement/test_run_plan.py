@@ -0,0 +1,61 @@
+import pyscan as ps
+import pytest
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    return devices
+
+
+def measure_point(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.runinfo.scan0.i
+    return d
+
+
+def test_run_plan(devices):
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_point
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.2)}, 'voltage', dt=0)
+    runinfo.scan1 = ps.AverageScan(2)
+    runinfo.scan2 = ps.ContinuousScan(n_max=5)
+
+    expt = ps.Experiment(runinfo, devices)
+    expt.check_runinfo()
+    plan = expt.plan
+
+    assert plan.scans == (runinfo.scan0, runinfo.scan1, runinfo.scan2)
+    assert plan.reversed_scans == (runinfo.scan2, runinfo.scan1, runinfo.scan0)
+    assert plan.iterators == (range(3), range(2), range(5))
+    assert plan.dims == (3, 2, 1)
+    assert plan.ndim == 3
+    assert plan.has_average_scan and plan.average_index == 1
+    assert plan.has_continuous_scan and plan.continuous_index == 2
+    assert plan.saved_axes == (0, 2)
+    assert plan.saved_dims == (3, 1)
+    assert plan.n_saved_dim == 2
+    assert plan.continuous_axis == 1
+
+    runinfo.scan0.i, runinfo.scan1.i, runinfo.scan2.i = 2, 1, 4
+    assert plan.indicies() == runinfo.indicies
+    assert plan.saved_indicies() == runinfo.average_indicies
+
+
+def test_run_plan_is_immutable(devices):
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_point
+    runinfo.scan0 = ps.RepeatScan(3)
+
+    expt = ps.Experiment(runinfo, devices)
+    expt.check_runinfo()
+
+    assert expt.plan.average_index == -1
+    assert expt.plan.continuous_axis == -1
+    assert expt.plan.saved_axes == (0,)
+
+    with pytest.raises(AttributeError):
+        expt.plan.dims = (4,)
+    with pytest.raises(AttributeError):
+        expt.plan.extra = 1
@@ -0,0 +1,219 @@
+import pyscan as ps
+import pytest
+import h5py
+import numpy as np
+from time import sleep
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    return devices
+
+
+def measure_point(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.runinfo.scan0.i
+    return d
+
+
+def measure_error(expt):
+    if expt.runinfo.scan0.i == 1:
+        raise RuntimeError('instrument timeout')
+    return measure_point(expt)
+
+
+def measure_stop(expt):
+    if expt.runinfo.scan0.i == 1:
+        expt.stop()
+    return measure_point(expt)
+
+
+@pytest.fixture()
+def runinfo():
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_point
+    runinfo.scan0 = ps.PropertyScan({'v1': ps.drange(0, 0.1, 0.3)}, 'voltage', dt=0)
+    runinfo.initial_pause = 0
+    return runinfo
+
+
+def test_run_writer_caches_datasets(tmp_path):
+    with ps.RunWriter(str(tmp_path / 'test.hdf5')) as writer:
+        dataset = writer.create_dataset('x', shape=(3,), dtype='float64')
+        assert writer['x'] is dataset
+        writer['x'][1] = 2.0
+        writer.point_saved()
+        assert writer.n_points == 1
+        assert writer.n_unflushed == 0
+
+    assert not writer.is_open
+    assert writer.datasets == {}
+
+    with h5py.File(str(tmp_path / 'test.hdf5'), 'r') as f:
+        assert f['x'][1] == 2.0
+
+
+def test_run_writer_flush_interval(tmp_path):
+    with ps.RunWriter(str(tmp_path / 'test.hdf5'), flush_interval=3) as writer:
+        for n in [1, 2, 0, 1]:
+            writer.point_saved()
+            assert writer.n_unflushed == n
+
+
+def test_run_writer_closed_after_run(runinfo, devices, tmp_path):
+    runinfo.flush_interval = 2
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert not expt.writer.is_open
+    assert expt.writer.n_points == 4
+
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert np.allclose(f['x1'][:], [0, 1, 2, 3])
+
+
+def test_run_writer_closed_after_exception(runinfo, devices, tmp_path):
+    runinfo.measure_function = measure_error
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+
+    with pytest.raises(RuntimeError):
+        expt.run()
+
+    assert not expt.writer.is_open
+
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert f['x1'][0] == 0
+        assert np.all(np.isnan(f['x1'][1:]))
+
+
+def test_async_run_writer_matches_sync(runinfo, devices, tmp_path):
+    runinfo.async_save = True
+    runinfo.save_queue_size = 1
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert isinstance(expt.writer, ps.AsyncRunWriter)
+    assert expt.writer.writer_thread is None
+    assert expt.writer.n_points == 4
+    assert np.allclose(expt.x1, [0, 1, 2, 3])
+
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert np.allclose(f['x1'][:], [0, 1, 2, 3])
+
+
+def test_async_run_writer_surfaces_errors(tmp_path):
+    writer = ps.AsyncRunWriter(str(tmp_path / 'test.hdf5'))
+    writer.open()
+    writer.create_dataset('x', shape=(3,), dtype='float64')
+    writer.write_point([('x', 0, 1.0)])
+    writer.write_point([('missing', 0, 1.0)])
+
+    with pytest.raises(KeyError):
+        writer.join()
+
+    # the error is only raised once, and the writer still closes cleanly
+    writer.close()
+    assert not writer.is_open
+
+
+def test_run_writer_resize_and_trim(tmp_path):
+    with ps.RunWriter(str(tmp_path / 'test.hdf5')) as writer:
+        writer.create_dataset('x', shape=(2, 1), maxshape=(None, None), dtype='float64')
+        for n in range(2, 6):
+            writer.resize('x', n, axis=1)
+        assert writer['x'].shape == (2, 8)
+        assert writer.lengths['x'] == (1, 5)
+
+    with h5py.File(str(tmp_path / 'test.hdf5'), 'r') as f:
+        assert f['x'].shape == (2, 5)
+
+
+@pytest.mark.parametrize('writer_class', [ps.RunWriter, ps.AsyncRunWriter])
+def test_run_writer_buffer_values(tmp_path, writer_class):
+    file_name = str(tmp_path / 'test.hdf5')
+    writer = writer_class(file_name, buffer_size=3)
+    writer.open()
+    writer.create_dataset('t', shape=(4, 2), fillvalue=np.nan, dtype='float64')
+    writer.create_dataset('v', shape=(4, 2, 2), fillvalue=np.nan, dtype='float64')
+
+    # scan0 runs backwards on the second line, as in a serpentine scan
+    for index in [(0, 0), (1, 0), (2, 0), (3, 0), (3, 1), (2, 1), (0, 1)]:
+        writer.buffer_values([('t', index, index[0] + 10 * index[1]), ('v', index, [index[0], index[1]])])
+
+    if writer_class is ps.RunWriter:
+        # values are written when buffer_size values are held and when the line changes
+        assert writer.buffers['t'] == ((1,), {3: 13, 2: 12, 0: 10})
+        assert np.array_equal(writer['t'][:, 0], [0, 1, 2, 3])
+        assert np.all(np.isnan(writer['t'][:, 1]))
+    writer.close()
+
+    with h5py.File(file_name, 'r') as f:
+        assert np.array_equal(f['t'][()], [[0, 10], [1, np.nan], [2, 12], [3, 13]], equal_nan=True)
+        assert np.array_equal(f['v'][:, 1], [[0, 1], [np.nan, np.nan], [2, 1], [3, 1]], equal_nan=True)
+
+
+def test_run_writer_buffer_on_flush(tmp_path):
+    file_name = str(tmp_path / 'test.hdf5')
+    with ps.RunWriter(file_name, flush_interval=2) as writer:
+        writer.create_dataset('done', shape=(4,), dtype='bool')
+        writer.buffer_values([('done', (0,), True)], on_flush=True)
+        writer.point_saved((0,))
+        assert not writer['done'][0]
+
+        # the values are written before the file is flushed
+        writer.buffer_values([('done', (1,), True)], on_flush=True)
+        writer.point_saved((1,))
+        assert writer.buffers == {}
+        assert np.array_equal(writer['done'][()], [True, True, False, False])
+
+
+def test_run_writer_flush_time(tmp_path):
+    with ps.RunWriter(str(tmp_path / 'test.hdf5'), flush_interval=None, flush_time=0.05) as writer:
+        writer.point_saved()
+        assert writer.n_unflushed == 1
+        sleep(0.06)
+        writer.point_saved()
+        assert writer.n_unflushed == 0
+        assert writer.n_flushes == 1
+
+
+def test_run_writer_flush_on_line(runinfo, devices, tmp_path):
+    runinfo.scan1 = ps.RepeatScan(3)
+    runinfo.flush_interval = None
+    runinfo.flush_on_line = True
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    # one flush at the end of each of the 3 lines of scan0
+    assert expt.writer.n_flushes == 3
+    assert expt.writer.n_points == 12
+
+
+def test_run_writer_flushes_on_exception(runinfo, devices, tmp_path):
+    runinfo.measure_function = measure_error
+    runinfo.flush_interval = None
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+
+    with pytest.raises(RuntimeError):
+        expt.run()
+
+    assert expt.writer.n_flushes == 1
+
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert f.attrs['n_points'] == 1
+        assert tuple(f.attrs['last_index']) == (0,)
+        assert f['x1'][0] == 0
+
+
+def test_run_writer_flushes_on_stop(runinfo, devices, tmp_path):
+    runinfo.measure_function = measure_stop
+    runinfo.flush_interval = None
+    runinfo.flush_time = 60
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    with h5py.File(expt.get_save_name(), 'r') as f:
+        assert f.attrs['n_points'] == 2
+        assert np.allclose(f['x1'][:2], [0, 1])
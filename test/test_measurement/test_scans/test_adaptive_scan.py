@@ -0,0 +1,117 @@
+import pyscan as ps
+import numpy as np
+import pytest
+
+
+def measure_point(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.v1.voltage
+    return d
+
+
+def step_loss(t, y):
+    # always split the interval that ends at the first point above 0.5
+    losses = np.zeros(len(t) - 1)
+    losses[np.argmax(t > 0.5) - 1] = 1
+    return losses
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.v1 = ps.TestVoltage()
+    devices.v2 = ps.TestVoltage()
+    return devices
+
+
+@pytest.fixture
+def adaptive_scan():
+    return ps.AdaptiveScan({'v1': (0, 2)}, 'voltage', n_points=10, measured='x1')
+
+
+@pytest.mark.parametrize('key,value', [
+    ('prop', 'voltage'),
+    ('bounds', {'v1': (0, 2)}),
+    ('device_names', ['v1']),
+    ('n', 10),
+    ('measured', 'x1'),
+    ('loss', 'curvature'),
+    ('n_initial', 5),
+    ('n_grid', 10),
+    ('dt', 0),
+    ('i', 0)
+])
+def test_adaptive_scan_init(adaptive_scan, key, value):
+    assert adaptive_scan[key] == value, f"Adaptive scan attribute {key} != {value}"
+
+
+def test_adaptive_scan_scan_dict(adaptive_scan):
+    assert list(adaptive_scan.scan_dict.keys()) == ['v1_voltage']
+    assert np.all(np.isnan(adaptive_scan.scan_dict['v1_voltage']))
+    assert adaptive_scan.iterator() == range(10)
+
+
+def test_adaptive_scan_refine_gradient():
+    adaptive_scan = ps.AdaptiveScan({'v1': (0, 1)}, 'voltage', n_points=10, measured='x1', loss='gradient')
+    t = np.array([0, 0.25, 0.5, 0.75, 1])
+    y = np.array([0, 0, 1, 0, 0])
+
+    # the steep intervals around the peak have the largest loss
+    assert adaptive_scan.refine(t, y) in [0.375, 0.625]
+
+    # unsorted values are sorted, and failed measurements are skipped
+    assert adaptive_scan.refine(t[::-1], np.array([0, 0, 1, np.nan, 0])[::-1]) == 0.75
+
+
+def test_adaptive_scan_refine_curvature():
+    scan = ps.AdaptiveScan({'v1': (0, 1)}, 'voltage', n_points=10, measured='x1', loss='curvature')
+    t = np.array([0, 0.25, 0.5, 0.75, 1])
+    y = np.array([0, 0.25, 0.5, 1.5, 2])
+
+    # the kink at 0.75 has the largest curvature
+    assert scan.refine(t, y) in [0.625, 0.875]
+
+
+def test_adaptive_scan_refine_callable():
+    scan = ps.AdaptiveScan({'v1': (0, 1)}, 'voltage', n_points=10, measured='x1', loss=step_loss)
+    assert scan.refine(np.array([0, 0.25, 0.5, 0.75, 1]), np.zeros(5)) == 0.625
+
+
+def test_adaptive_scan_iterate(devices):
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_point
+    runinfo.scan0 = ps.AdaptiveScan({'v1': (0, 2), 'v2': (1, 0)}, 'voltage', n_points=6, measured='x1',
+                                    n_initial=3)
+    expt = ps.Experiment(runinfo, devices)
+    expt.check_runinfo()
+
+    runinfo.scan0.iterate(expt, 0, -1)
+    assert expt.devices.v1.voltage == 0
+    assert expt.devices.v2.voltage == 1
+
+    runinfo.scan0.iterate(expt, 2, 1)
+    assert expt.devices.v1.voltage == 2
+    assert expt.devices.v2.voltage == 0
+    assert runinfo.scan0.scan_dict['v1_voltage'][2] == 2
+    assert runinfo.scan0.scan_dict['v2_voltage'][2] == 0
+
+
+@pytest.mark.parametrize('scan1', [ps.AverageScan(2), ps.ContinuousScan(n_max=2)])
+def test_adaptive_scan_bad_runinfo(devices, adaptive_scan, scan1):
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_point
+    runinfo.scan0 = adaptive_scan
+    runinfo.scan1 = scan1
+
+    with pytest.raises(AssertionError):
+        ps.Experiment(runinfo, devices).check_runinfo()
+
+
+def test_adaptive_scan_must_be_scan0(devices, adaptive_scan):
+    runinfo = ps.RunInfo()
+    runinfo.measure_function = measure_point
+    runinfo.scan0 = ps.PropertyScan({'v2': [0, 1]}, 'voltage')
+    runinfo.scan1 = adaptive_scan
+
+    with pytest.raises(AssertionError):
+        ps.Experiment(runinfo, devices).check_runinfo()
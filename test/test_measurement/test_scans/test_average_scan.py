@@ -73,3 +73,68 @@ def test_function_scan_iterate_one(runinfo, devices, average_scan):
 
     runinfo.scan0.iterate(expt, 1, 1)
     assert expt.runinfo.scan0.i == 1
+
+
+def test_average_scan_early_stop_init():
+    average_scan = ps.AverageScan(10, target_stderr=0.1, measured='x1')
+    assert average_scan.target_stderr == 0.1
+    assert average_scan.measured == 'x1'
+    assert average_scan.n_min == 2
+    assert average_scan.count == 0
+    assert not average_scan.converged
+
+    with pytest.raises(AssertionError):
+        ps.AverageScan(10, target_stderr=0.1)
+    with pytest.raises(AssertionError):
+        ps.AverageScan(10, target_stderr=0, measured='x1')
+    with pytest.raises(AssertionError):
+        ps.AverageScan(10, target_stderr=0.1, measured='x1', n_min=1)
+
+
+def test_average_scan_update():
+    values = np.random.default_rng(0).normal(size=6)
+    average_scan = ps.AverageScan(10, target_stderr=1e-9, measured='x1')
+    for i, value in enumerate(values):
+        average_scan.i = i
+        average_scan.update(value)
+
+        assert average_scan.count == i + 1
+        assert np.isclose(average_scan.mean, np.mean(values[:i + 1]))
+        if i > 0:
+            assert np.isclose(average_scan.stderr, np.std(values[:i + 1], ddof=1) / np.sqrt(i + 1))
+        else:
+            assert np.isnan(average_scan.stderr)
+
+    # a new point starts at the first repeat
+    average_scan.i = 0
+    average_scan.update(5)
+    assert average_scan.count == 1
+    assert average_scan.mean == 5
+
+
+def test_average_scan_update_converged():
+    average_scan = ps.AverageScan(10, target_stderr=0.5, measured='x1', n_min=3)
+    assert not average_scan.update(1)
+    average_scan.i = 1
+    assert not average_scan.update(1)
+    average_scan.i = 2
+    assert average_scan.update(1)
+
+
+def test_average_scan_update_array():
+    average_scan = ps.AverageScan(10, target_stderr=0.5, measured='x1')
+    average_scan.update([0, 0])
+    average_scan.i = 1
+    assert not average_scan.update([0, 2])
+    assert average_scan.stderr == 1
+
+
+def test_average_scan_restore():
+    values = [1, 2, 4, 8]
+    average_scan = ps.AverageScan(10, target_stderr=1e-9, measured='x1')
+    average_scan.restore(3, np.mean(values[:3]), np.std(values[:3], ddof=1) / np.sqrt(3))
+    average_scan.i = 3
+    average_scan.update(values[3])
+
+    assert np.isclose(average_scan.mean, np.mean(values))
+    assert np.isclose(average_scan.stderr, np.std(values, ddof=1) / np.sqrt(4))
@@ -1,6 +1,7 @@
 import pyscan as ps
 import numpy as np
 import pytest
+from time import sleep, perf_counter
 
 
 @pytest.fixture()
@@ -41,7 +42,9 @@ def property_scan():
     ('scan_dict', {'v1_voltage': np.array([0, 0.1])}),
     ('device_names', ['v1']),
     ('dt', 0),
-    ('i', 0)
+    ('i', 0),
+    ('settle', None),
+    ('concurrent', False)
 ])
 def test_property_scan_init(property_scan, key, value):
     if key == 'scan_dict':
@@ -76,3 +79,85 @@ def test_property_scan_iterate_one(runinfo, devices, property_scan):
     runinfo.scan0.iterate(expt, 1, 1)
     assert expt.devices.v1.voltage == 0.1
     assert expt.runinfo.scan0.i == 1
+
+
+class SlowSupply(ps.ItemAttribute):
+    '''
+    Supply that takes `latency` seconds to set, optionally sharing an instrument
+    '''
+
+    def __init__(self, latency, instrument=None):
+        self.latency = latency
+        self.instrument = instrument
+        self._voltage = 0
+        self.set_times = []
+
+    @property
+    def voltage(self):
+        return self._voltage
+
+    @voltage.setter
+    def voltage(self, value):
+        start = perf_counter()
+        sleep(self.latency)
+        if value < 0:
+            raise ValueError('voltage out of range')
+        self._voltage = value
+        self.set_times.append((start, perf_counter()))
+
+
+@pytest.fixture()
+def slow_devices():
+    devices = ps.ItemAttribute()
+    for dev in ['s1', 's2', 's3']:
+        devices[dev] = SlowSupply(0.02)
+    return devices
+
+
+def test_property_scan_concurrent(runinfo, slow_devices):
+    latency = 0.1
+    for dev in ['s1', 's2', 's3']:
+        slow_devices[dev].latency = latency
+    runinfo.scan0 = ps.PropertyScan({'s1': [0, 1], 's2': [0, 2], 's3': [0, 3]}, 'voltage', concurrent=True)
+    expt = ps.Experiment(runinfo, slow_devices)
+
+    start = perf_counter()
+    runinfo.scan0.iterate(expt, 1, 1)
+    elapsed = perf_counter() - start
+
+    assert [slow_devices[dev].voltage for dev in ['s1', 's2', 's3']] == [1, 2, 3]
+    # the three sets overlap, setting them one after another takes 3 * latency
+    assert elapsed < 2 * latency
+
+
+def test_property_scan_concurrent_shared_instrument(runinfo, slow_devices):
+    mainframe = object()
+    for dev in ['s1', 's2', 's3']:
+        slow_devices[dev].instrument = mainframe
+    runinfo.scan0 = ps.PropertyScan({'s1': [0, 1], 's2': [0, 2], 's3': [0, 3]}, 'voltage', concurrent=True)
+    expt = ps.Experiment(runinfo, slow_devices)
+
+    runinfo.scan0.iterate(expt, 1, 1)
+
+    # sets on one instrument never overlap
+    times = sorted(slow_devices[dev].set_times[0] for dev in ['s1', 's2', 's3'])
+    for (start0, stop0), (start1, stop1) in zip(times[:-1], times[1:]):
+        assert stop0 <= start1
+
+
+def test_property_scan_concurrent_error(runinfo, slow_devices):
+    runinfo.scan0 = ps.PropertyScan({'s1': [0, 1], 's2': [0, -1], 's3': [0, 3]}, 'voltage', concurrent=True)
+    expt = ps.Experiment(runinfo, slow_devices)
+
+    with pytest.raises(ValueError):
+        runinfo.scan0.iterate(expt, 1, 1)
+
+
+def test_property_scan_concurrent_experiment(runinfo, slow_devices, tmp_path):
+    runinfo.scan0 = ps.PropertyScan({'s1': [0, 1], 's2': [0, 2], 's3': [0, 3]}, 'voltage', concurrent=True)
+    runinfo.initial_pause = 0
+    expt = ps.Experiment(runinfo, slow_devices, data_dir=tmp_path)
+    expt.run()
+
+    assert np.all(expt.x1 == [0, 1])
+    assert expt.executor is None
@@ -0,0 +1,156 @@
+import pyscan as ps
+import pytest
+import numpy as np
+from time import perf_counter
+
+
+class LaggingSupply(ps.ItemAttribute):
+    '''
+    Supply whose output relaxes exponentially to the set voltage
+    '''
+
+    def __init__(self, tau):
+        self.tau = tau
+        self._voltage = 0
+        self._previous = 0
+        self._set_time = perf_counter()
+
+    @property
+    def voltage(self):
+        return self._voltage
+
+    @voltage.setter
+    def voltage(self, value):
+        self._previous = self.output
+        self._voltage = value
+        self._set_time = perf_counter()
+
+    @property
+    def output(self):
+        decay = np.exp(-(perf_counter() - self._set_time) / self.tau)
+        return self._voltage + (self._previous - self._voltage) * decay
+
+
+def read_output(expt):
+    return expt.devices.s1.output
+
+
+def read_constant(expt):
+    return 1.0
+
+
+def read_never_settled(expt):
+    return expt.runinfo.scan0.i + np.random.random()
+
+
+def measure_output(expt):
+    d = ps.ItemAttribute()
+    d.x1 = expt.devices.s1.output
+    return d
+
+
+@pytest.fixture()
+def devices():
+    devices = ps.ItemAttribute()
+    devices.s1 = LaggingSupply(0.01)
+    return devices
+
+
+@pytest.fixture()
+def expt(devices, tmp_path):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'s1': [0, 1]}, 'voltage')
+    return ps.Experiment(runinfo, devices, data_dir=tmp_path)
+
+
+@pytest.mark.parametrize('key,value', [
+    ('readback', 'output'),
+    ('tolerance', 0.01),
+    ('window', 0),
+    ('timeout', 60),
+    ('poll', 0.01),
+    ('n_timeouts', 0),
+])
+def test_settle_init(key, value):
+    settle = ps.Settle('output', 0.01)
+    assert settle[key] == value, f"Settle attribute {key} != {value}"
+
+
+def test_settle_init_errors():
+    with pytest.raises(AssertionError):
+        ps.Settle(1, 0.01)
+    with pytest.raises(AssertionError):
+        ps.Settle('output', -1)
+    with pytest.raises(AssertionError):
+        ps.Settle('output', 0.01, window=2, timeout=1)
+    with pytest.raises(AssertionError):
+        ps.FunctionScan(print, [0, 1], settle=ps.Settle('output', 0.01))
+
+
+@pytest.mark.parametrize('readback', ['output', read_output])
+def test_settle_wait_target(expt, readback):
+    settle = ps.Settle(readback, 0.01, poll=0.001)
+    expt.devices.s1.voltage = 1
+    elapsed = settle.wait(expt, ['s1'], [1])
+
+    # 0.01 of a unit step is reached after tau * ln(100), the ceiling leaves room for slow machines
+    assert 0.04 < elapsed < 0.15
+    assert abs(expt.devices.s1.output - 1) <= 0.01
+    assert expt.settle_time == elapsed
+
+
+def test_settle_wait_window(expt):
+    settle = ps.Settle('output', 0.01, window=0.05, poll=0.001)
+    expt.devices.s1.voltage = 1
+    elapsed = settle.wait(expt, ['s1'], [1])
+    assert 0.09 < elapsed < 0.2
+
+
+def test_settle_wait_stable(expt):
+    settle = ps.Settle(read_constant, 0.01, window=0.02, poll=0.001)
+    elapsed = settle.wait(expt, [])
+    assert 0.02 <= elapsed < 0.1
+
+
+def test_settle_wait_timeout(expt):
+    settle = ps.Settle(read_never_settled, 0.01, window=0.01, timeout=0.03, poll=0.001)
+    elapsed = settle.wait(expt, [])
+    assert 0.03 <= elapsed < 0.1
+    assert settle.n_timeouts == 1
+
+
+def test_settle_wait_keeps_deadline(expt):
+    expt.clock.wait(0.001)
+    deadline = expt.clock.deadline
+    ps.Settle('output', 0.01, poll=0.001).wait(expt, ['s1'], [0])
+    assert expt.clock.deadline == deadline
+
+
+def test_settle_experiment(devices, tmp_path):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'s1': [0, 1, 1.001, 0]}, 'voltage', settle=ps.Settle('output', 0.01, poll=0.001))
+    runinfo.scan1 = ps.RepeatScan(2)
+    runinfo.measure_function = measure_output
+    runinfo.initial_pause = 0
+    runinfo.save_timing = True
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    expt.run()
+
+    assert np.allclose(expt.x1.T, [[0, 1, 1.001, 0], [0, 1, 1.001, 0]], atol=0.01)
+
+    settle_time = ps.load_experiment(expt.get_save_name()).timing.settle_time
+    assert settle_time.shape == (4, 2)
+    # small steps settle at the first reading, unit steps take about tau * ln(100)
+    assert np.all(settle_time[[0, 2], :] < 0.005)
+    assert np.all((settle_time[[1, 3], :] > 0.04) & (settle_time[[1, 3], :] < 0.07))
+
+
+def test_settle_experiment_missing_readback(devices, tmp_path):
+    runinfo = ps.RunInfo()
+    runinfo.scan0 = ps.PropertyScan({'s1': [0, 1]}, 'voltage', settle=ps.Settle('current', 0.01))
+    runinfo.measure_function = measure_output
+
+    expt = ps.Experiment(runinfo, devices, data_dir=tmp_path)
+    with pytest.raises(AssertionError):
+        expt.run()